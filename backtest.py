@@ -0,0 +1,292 @@
+import sys
+from datetime import datetime
+import numpy as np
+import pandas as pd
+from option_chain_index import OptionChainIndex
+from snapshot_store import SnapshotReplay, ReplayDeribitConnector, ReplayPolymarketScanner
+from touch_replicator import TouchReplicator, poly_expiry_time
+
+NS_PER_DAY = 86400 * 10**9
+NS_PER_QUARTER_HOUR = 900 * 10**9
+
+def local_days(times_ns):
+    """Local calendar day (days since 1970-01-01) of POSIX ns times, as datetime.fromtimestamp dates them"""
+    # UTC offsets only change on quarter hours: one lookup per distinct quarter
+    quarters, inverse = np.unique(np.asarray(times_ns) // NS_PER_QUARTER_HOUR, return_inverse=True)
+    offsets = np.array([datetime.fromtimestamp(q * 900).astimezone().utcoffset().total_seconds() for q in quarters], dtype="int64")
+    return (np.asarray(times_ns) // 10**9 + offsets[inverse]) // 86400
+
+def runs(values):
+    """(start, end) of each run of equal consecutive values"""
+    if len(values) == 0:
+        return []
+    starts = np.flatnonzero(np.r_[True, values[1:] != values[:-1]])
+    return zip(starts, np.r_[starts[1:], len(values)])
+
+class TouchBacktester:
+    """
+    Historical backtest of the touch-vs-spread edge over recorded snapshots
+    (see snapshot_store.py).
+
+    Every market snapshot is priced as a live scan would have priced it:
+    TouchReplicator.market_input_arrays against the latest chain snapshot,
+    with the pricing clock at the snapshot time (bracketing expiries, exact
+    T, surface vols, calendar-blended spread_prob), then one Black-Scholes
+    batch per chunk of snapshots. Each chain snapshot is indexed straight
+    from the columnar store and its vol surface fitted once; all rows priced
+    off it, whatever their snapshot time, go through one array call (the
+    surface takes each row's times to expiry). No per-row Python work.
+
+    The STRATEGY_TOUCH.md policy is then simulated per market: on the first
+    snapshot with edge > edge_threshold, buy Poly NO and buy the debit spread.
+    On touch, NO shares pay 0 and the spread is sold back at Width/2.
+    Without a touch, NO pays $1 and the spread expires, losing the debit. The spread
+    P&L is that of the far (covering) expiry's spread. Only touch markets
+    are backtested: the policy stops out on touch, which has no counterpart
+    for markets settling above/below a strike on a date.
+    """
+
+    def __init__(self, replay, risk_free_rate=0.04, edge_threshold=0.10, chunk_snapshots=512):
+        self.replay = replay if isinstance(replay, SnapshotReplay) else SnapshotReplay(replay)
+        self.risk_free_rate = risk_free_rate
+        self.edge_threshold = edge_threshold
+        self.chunk_snapshots = chunk_snapshots # Market snapshots per Black-Scholes batch
+
+        self.now_ns = 0
+        self.replicator = TouchReplicator(
+            deribit=ReplayDeribitConnector(self.replay),
+            poly_scanner=ReplayPolymarketScanner(self.replay),
+            clock=lambda: datetime.fromtimestamp(self.now_ns / 1e9),
+        )
+        self.replicator.risk_free_rate = risk_free_rate
+        self.asset = self.replicator.currencies[0]
+        self.chain = self.replay.chain(self.asset)
+        self._chain_snapshot = None
+        self._static = None
+
+    def market_static(self):
+        """Strike, expiry and end time per distinct (question, endDate) pair, parsed once"""
+        if self._static is not None:
+            return self._static
+
+        mk = self.replay.markets
+        pairs = (mk.codes["question"].astype("int64") << 32) | (mk.codes["endDate"].astype("int64") & 0xFFFFFFFF)
+        unique_pairs = np.unique(pairs)
+
+        scanner = self.replicator.poly_scanner
+        static = {
+            "strike": np.full(len(unique_pairs), np.nan),
+            "expiry": np.full(len(unique_pairs), None, dtype=object),
+            "expiry_day": np.full(len(unique_pairs), np.nan),
+            "expiry_time": np.full(len(unique_pairs), np.nan),
+        }
+        for j, pair in enumerate(unique_pairs):
+            q_code, e_code = int(pair >> 32), int(pair & 0xFFFFFFFF)
+            if e_code == 0xFFFFFFFF: e_code = -1
+            market = {
+                "question": mk.vocab["question"][q_code] or "",
+                "endDate": mk.vocab["endDate"][e_code],
+            }
+            details = scanner.parse_market_details(market)
+            if not details or details.get("asset", self.asset) != self.asset or details.get("kind", "touch") != "touch": continue
+            static["strike"][j] = details["strike"]
+            static["expiry"][j] = details["expiry"]
+            static["expiry_day"][j] = np.datetime64(details["expiry"], "D").astype("int64")
+            static["expiry_time"][j] = poly_expiry_time(details)
+
+        self._static = (unique_pairs, static)
+        return self._static
+
+    def use_chain_snapshot(self, i):
+        """Point the replicator at chain snapshot i, indexed straight from the columnar store"""
+        if self._chain_snapshot == i:
+            return
+        ch = self.chain
+        rows = ch.rows(i)
+        codes = ch.string_codes(i)
+        expiry = ch.decode("expiry", codes["expiry"])
+        strike = np.asarray(ch.numeric["strike"][rows])
+        keep = np.flatnonzero((codes["expiry"] >= 0) & ~np.isnan(strike))
+        # (expiry, strike) order, stable like OptionChainIndex over a chain DataFrame
+        order = keep[np.lexsort((strike[keep], expiry[keep].astype(str)))]
+
+        columns = {col: np.array(ch.numeric[col][rows][order], dtype=float) for col in OptionChainIndex.NUMERIC_COLUMNS}
+        columns["instrument"] = ch.decode("instrument", codes["instrument"][order])
+        columns["type"] = ch.decode("type", codes["type"][order])
+        self.replicator.use_chain_index(self.asset, OptionChainIndex.from_columns(columns, expiry[order]))
+        self._chain_snapshot = i
+
+    def price_rows(self):
+        """Price every recorded market row. Returns a DataFrame, one row per priced (snapshot, market)."""
+        mk = self.replay.markets
+        parts = []
+        for lo in range(0, len(mk), self.chunk_snapshots):
+            part = self._price_chunk(lo, min(lo + self.chunk_snapshots, len(mk)))
+            if part is not None:
+                parts.append(part)
+        if not parts:
+            return pd.DataFrame()
+        return pd.DataFrame({col: np.concatenate([p[col] for p in parts]) for col in parts[0]})
+
+    def _price_chunk(self, m_lo, m_hi):
+        mk = self.replay.markets
+        unique_pairs, static = self.market_static()
+
+        # Every recorded row of the chunk's market snapshots, with its snapshot time and chain snapshot
+        _, starts, counts = mk.index[m_lo:m_hi].T
+        if counts.sum() == 0:
+            return None
+        offsets = np.cumsum(counts) - counts
+        rows = np.arange(counts.sum()) - np.repeat(offsets - starts, counts)
+        times = np.repeat(mk.timestamps[m_lo:m_hi], counts)
+        chains = np.searchsorted(self.chain.timestamps, times, side="right") - 1
+
+        pairs = (mk.codes["question"][rows].astype("int64") << 32) | (mk.codes["endDate"][rows].astype("int64") & 0xFFFFFFFF)
+        pos = np.searchsorted(unique_pairs, pairs)
+        # Parsed touch markets, not expired on the snapshot's (local) date, with a chain recorded by then
+        keep = np.flatnonzero(~np.isnan(static["strike"][pos]) & (chains >= 0))
+        keep = keep[static["expiry_day"][pos[keep]] >= local_days(times[keep])]
+        if len(keep) == 0:
+            return None
+
+        # One index, vol surface and array call per chain snapshot, each row at its own pricing time
+        columns = ("time", "market_code", "strike", "expiry_day", "spot", "poly_prob", "iv", "T",
+                   "spread_prob", "k_long", "k_short", "debit_usd")
+        out = {col: [] for col in columns}
+        for lo, hi in runs(chains[keep]):
+            sel = keep[lo:hi]
+            self.now_ns = int(self.chain.timestamps[chains[sel[0]]])
+            self.use_chain_snapshot(chains[sel[0]])
+            p = pos[sel]
+            a = self.replicator.market_input_arrays(
+                static["strike"][p], static["expiry"][p], self.asset, static["expiry_time"][p], now=times[sel] / 1e9
+            )
+            ok = a["ok"]
+            if not ok.any():
+                continue
+            priced, p = sel[ok], p[ok]
+            out["time"].append(times[priced])
+            out["market_code"].append(mk.codes["id"][rows[priced]])
+            out["strike"].append(static["strike"][p])
+            out["expiry_day"].append(static["expiry_day"][p])
+            out["poly_prob"].append(np.nan_to_num(np.asarray(mk.numeric["yes_price"][rows[priced]]), nan=0.0))
+            for col in ("spot", "iv", "T", "spread_prob"):
+                out[col].append(a[col][ok])
+            for col, key in (("k_long", "k_long"), ("k_short", "k_short"), ("debit_usd", "debit")):
+                out[col].append(a["far_spread"][key][ok])
+
+        if not out["time"]:
+            return None
+        out = {col: np.concatenate(values) for col, values in out.items()}
+
+        out["bs_prob"] = self.replicator.touch_pricer.one_touch_probability_batch(
+            out["spot"], out["strike"], out["T"], out["iv"], self.risk_free_rate
+        )
+        # Spread is the reference when it is available and non-zero (as in scan)
+        use_spread = np.isfinite(out["spread_prob"]) & (out["spread_prob"] != 0)
+        out["edge"] = out["poly_prob"] - np.where(use_spread, out["spread_prob"], out["bs_prob"])
+        return out
+
+    def simulate(self, priced):
+        """Apply the entry/stop-out policy to priced rows. Returns one row per trade."""
+        if priced.empty:
+            return pd.DataFrame()
+
+        order = np.lexsort((priced["time"].to_numpy(), priced["market_code"].to_numpy()))
+        p = {col: priced[col].to_numpy()[order] for col in priced.columns}
+
+        # Entry: first snapshot per market with edge above threshold
+        signal = np.flatnonzero(p["edge"] > self.edge_threshold)
+        entry_markets, first = np.unique(p["market_code"][signal], return_index=True)
+        entry = signal[first]
+        if len(entry) == 0:
+            return pd.DataFrame()
+
+        up = p["strike"][entry] > p["spot"][entry]
+        expiry_end = (p["expiry_day"][entry].astype("int64") + 1) * NS_PER_DAY
+
+        # Touch: first later row of the same market where spot crosses K before expiry
+        k = np.searchsorted(entry_markets, p["market_code"])
+        k = np.clip(k, 0, len(entry_markets) - 1)
+        tracked = entry_markets[k] == p["market_code"]
+        crossed = np.where(up[k], p["spot"] >= p["strike"], p["spot"] <= p["strike"])
+        touching = tracked & crossed & (p["time"] > p["time"][entry][k]) & (p["time"] < expiry_end[k])
+        hits = np.flatnonzero(touching)
+        hit_markets, hit_first = np.unique(p["market_code"][hits], return_index=True)
+        touch_time = np.full(len(entry), -1, dtype="int64")
+        touch_time[np.searchsorted(entry_markets, hit_markets)] = p["time"][hits[hit_first]]
+        touched = touch_time >= 0
+
+        last_seen = int(p["time"].max())
+        resolved = touched | (last_seen >= expiry_end)
+        resolved_time = np.where(touched, touch_time, expiry_end)
+
+        yes0 = p["poly_prob"][entry]
+        debit = p["debit_usd"][entry]
+        width = np.abs(p["k_short"][entry] - p["k_long"][entry]) # Put spreads buy the upper strike
+        has_spread = ~np.isnan(debit) & (debit > 0) & (width > 0)
+
+        no_pnl = np.where(touched, yes0 - 1.0, yes0) # per NO share bought at (1 - yes)
+        spread_pnl = np.where(has_spread, np.where(touched, width / 2 - debit, -debit), np.nan)
+
+        ids = self.replay.markets.vocab["id"][entry_markets]
+        return pd.DataFrame({
+            "market_id": ids,
+            "entry_time": pd.to_datetime(p["time"][entry]),
+            "strike": p["strike"][entry],
+            "direction": np.where(up, "up", "down"),
+            "spot": p["spot"][entry],
+            "poly_prob": yes0,
+            "bs_prob": p["bs_prob"][entry],
+            "spread_prob": p["spread_prob"][entry],
+            "edge": p["edge"][entry],
+            "touched": touched,
+            "resolved": resolved,
+            "resolved_time": pd.to_datetime(resolved_time),
+            "no_pnl": np.where(resolved, no_pnl, np.nan),
+            "spread_pnl_usd": np.where(resolved, spread_pnl, np.nan),
+        })
+
+    def pnl_series(self, trades):
+        """Cumulative P&L by resolution time (resolved trades only)"""
+        if trades.empty:
+            return pd.DataFrame(columns=["no_pnl", "spread_pnl_usd"])
+        done = trades[trades["resolved"]].sort_values("resolved_time")
+        series = done.set_index("resolved_time")[["no_pnl", "spread_pnl_usd"]].fillna(0.0)
+        return series.cumsum()
+
+    def statistics(self, trades):
+        if trades.empty:
+            return {"trades": 0}
+        done = trades[trades["resolved"]]
+        stats = {
+            "trades": int(len(trades)),
+            "resolved": int(len(done)),
+            "touch_rate": float(done["touched"].mean()) if len(done) else None,
+            "no_win_rate": float((done["no_pnl"] > 0).mean()) if len(done) else None,
+            "mean_edge": float(trades["edge"].mean()),
+            "mean_poly_prob": float(done["poly_prob"].mean()) if len(done) else None,
+            "mean_bs_prob": float(done["bs_prob"].mean()) if len(done) else None,
+            "mean_spread_prob": float(done["spread_prob"].mean()) if len(done) else None,
+            "no_pnl_total": float(done["no_pnl"].sum()),
+            "no_pnl_mean": float(done["no_pnl"].mean()) if len(done) else None,
+            "spread_pnl_usd_total": float(done["spread_pnl_usd"].sum()),
+        }
+        return stats
+
+    def run(self):
+        priced = self.price_rows()
+        trades = self.simulate(priced)
+        return {
+            "rows": priced,
+            "trades": trades,
+            "pnl": self.pnl_series(trades),
+            "stats": self.statistics(trades),
+        }
+
+if __name__ == "__main__":
+    root = sys.argv[1] if len(sys.argv) > 1 else "snapshots"
+    result = TouchBacktester(root).run()
+    print(f"Priced {len(result['rows'])} market snapshots")
+    for key, value in result["stats"].items():
+        print(f"  {key}: {value}")
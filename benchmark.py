@@ -0,0 +1,534 @@
+import re
+import sys
+import json
+import time
+import argparse
+import platform
+import subprocess
+import tracemalloc
+from datetime import datetime, timedelta
+import numpy as np
+import pandas as pd
+from deribit_connector import DeribitConnector
+from polymarket_touch_scanner import PolymarketTouchScanner
+from http_cache import ResponseCache
+from bs_models import BlackScholesModels, norm_cdf
+
+BENCH_NOW = datetime(2026, 1, 5, 12, 0) # Fixed pricing clock so synthetic expiries stay in the future
+
+def _bs_prices(S, K, T, sigma, is_call):
+    """Black-Scholes prices in underlying units (Deribit inverse quoting), r = 0"""
+    d1 = (np.log(S / K) + 0.5 * sigma**2 * T) / (sigma * np.sqrt(T))
+    d2 = d1 - sigma * np.sqrt(T)
+    N = norm_cdf
+    call = S * N(d1) - K * N(d2)
+    put = K * N(-d2) - S * N(-d1)
+    return np.where(is_call, call, put) / S
+
+def synthetic_summaries(n_instruments, currency="BTC", spot=100000.0, seed=0):
+    """
+    Deribit get_book_summary_by_currency-style rows for a synthetic chain:
+    weekly expiries, a call and a put per strike on a 40%-250% of spot grid,
+    prices from a smile (more vol in the wings) with a bid/ask around the mark.
+    """
+    rng = np.random.default_rng(seed)
+    n_expiries = min(16, max(1, n_instruments // 200))
+    per_expiry = max(1, n_instruments // (2 * n_expiries))
+    expiries = [BENCH_NOW + timedelta(days=4 + 7 * i) for i in range(n_expiries)]
+    grid = np.unique(np.round(spot * np.linspace(0.4, 2.5, per_expiry) / 100) * 100)
+
+    summaries = []
+    for expiry in expiries:
+        code = expiry.strftime("%d%b%y").upper()
+        T = (expiry - BENCH_NOW).days / 365.0
+        iv = 0.45 + 0.35 * np.log(grid / spot)**2 + rng.normal(0, 0.01, len(grid))
+        for opt_type in ("C", "P"):
+            mark = np.maximum(_bs_prices(spot, grid, T, iv, opt_type == "C"), 0.0001)
+            half_spread = np.maximum(0.0001, mark * rng.uniform(0.02, 0.10, len(grid)))
+            quoted = rng.random(len(grid)) > 0.1
+            for k, m, h, v, q in zip(grid, mark, half_spread, iv, quoted):
+                summaries.append({
+                    "instrument_name": f"{currency}-{code}-{int(k)}-{opt_type}",
+                    "mark_price": float(m),
+                    "bid_price": float(m - h) if q and m > h else None,
+                    "ask_price": float(m + h),
+                    "mark_iv": float(v * 100),
+                    "underlying_price": spot,
+                    "open_interest": float(rng.random() * 100),
+                    "volume_usd_24h": float(rng.random() * 1e5),
+                })
+    return summaries[:n_instruments]
+
+def synthetic_markets(n_markets, spot=100000.0, asset_name="Bitcoin", seed=0):
+    """Gamma /markets-style rows: touch questions at round strikes, expiring within ~3 months"""
+    rng = np.random.default_rng(seed)
+    markets = []
+    for i in range(n_markets):
+        strike = int(round(spot * rng.uniform(0.5, 2.0), -3))
+        end = BENCH_NOW + timedelta(days=int(rng.integers(1, 90)))
+        verb = "hit" if strike > spot else "reach"
+        yes = float(np.clip(spot / strike * 0.5 + rng.normal(0, 0.05), 0.001, 0.999))
+        markets.append({
+            "id": str(100000 + i),
+            "question": f"Will {asset_name} {verb} ${strike:,} by {end.strftime('%B')} {end.day}?",
+            "slug": f"will-{asset_name.lower()}-{verb}-{strike}-{i}",
+            "endDate": end.strftime("%Y-%m-%dT23:59:00Z"),
+            "updatedAt": BENCH_NOW.isoformat() + "Z",
+            "outcomePrices": json.dumps([f"{yes:.3f}", f"{1 - yes:.3f}"]),
+            "description": "",
+        })
+    return markets
+
+class FakeDeribitConnector:
+    """Serves synthetic summaries through the real DeribitConnector parser, no network"""
+
+    def __init__(self, summaries, currency="BTC"):
+        self.summaries = summaries
+        self.currency = currency
+        self.connector = DeribitConnector(currency, http=ResponseCache(None))
+
+    def get_option_chain_summary(self):
+        return self.connector.parse_summaries(self.summaries)
+
+class FakePolymarketScanner(PolymarketTouchScanner):
+    """Serves synthetic Gamma markets through the real filter and parser, no network"""
+
+    def __init__(self, markets, assets=("BTC",)):
+        super().__init__(assets=assets, http=ResponseCache(None))
+        self.markets = markets
+
+    def iter_polymarket_touch_markets(self):
+        return (m for m in self.markets if self.is_touch_market(m))
+
+class SimulatedPolymarketScanner(FakePolymarketScanner):
+    """FakePolymarketScanner whose Yes prices move on a simulated clock: price_at(market position, seconds)"""
+
+    max_markets, page_size = 3000, 500 # A discovery pass costs as many Gamma pages as the live scanner's
+
+    def __init__(self, markets, price_at, clock, assets=("BTC",)):
+        super().__init__(markets, assets)
+        self.price_at = price_at
+        self.clock = clock
+        self.positions = {m["id"]: i for i, m in enumerate(markets)}
+
+    def current(self, market):
+        yes = self.price_at(self.positions[market["id"]], self.clock.time())
+        return dict(market, outcomePrices=json.dumps([f"{yes:.3f}", f"{1 - yes:.3f}"]))
+
+    def iter_polymarket_touch_markets(self):
+        return (self.current(m) for m in self.markets if self.is_touch_market(m))
+
+    def fetch_markets_by_id(self, market_ids):
+        return [self.current(self.markets[self.positions[i]]) for i in market_ids if i in self.positions]
+
+def parse_summaries_rowwise(connector, summaries):
+    """The original per-row get_option_chain_summary parse loop, kept as the benchmark baseline"""
+    data = []
+    for item in summaries:
+        name = item["instrument_name"]
+        parts = name.split("-")
+        if len(parts) < 4: continue
+
+        expiry_str = parts[1]
+        try:
+            strike = float(parts[2])
+        except ValueError:
+            continue
+
+        opt_type = "call" if parts[3] == "C" else "put"
+        try:
+            expiry_date = datetime.strptime(expiry_str, "%d%b%y").strftime("%Y-%m-%d")
+        except ValueError:
+            expiry_date = None
+
+        data.append({
+            "instrument": name,
+            "expiry": expiry_date,
+            "strike": strike,
+            "type": opt_type,
+            "mark_price": item.get("mark_price"),
+            "bid": item.get("bid_price"),
+            "ask": item.get("ask_price"),
+            "mark_iv": item.get("mark_iv"),
+            "underlying_price": item.get("underlying_price"),
+            "open_interest": item.get("open_interest"),
+            "volume_usd": item.get("volume_usd_24h")
+        })
+    return pd.DataFrame(data)
+
+# Generated price questions: (template, kind, direction); {a}/{b} are strikes in thousands
+QUESTION_TEMPLATES = [
+    ("Will {name} reach ${a},000 {window}?", "touch", "up"),
+    ("Will {name} hit ${a}k {window}?", "touch", "up"),
+    ("Will {name} dip to ${a},000 {window}?", "touch", "down"),
+    ("Will {name} fall below ${a}K {window}?", "touch", "down"),
+    ("Will the price of {name} be above ${a},000 {window}?", "above", "up"),
+    ("Will {name} close lower than ${a}k {window}?", "above", "down"),
+    ("Will the price of {name} be between ${a},000 and ${b},000 {window}?", "range", None),
+    ("{name} ${a}-{b}k {window}?", "range", None),
+]
+OTHER_QUESTIONS = [
+    "Will the Fed cut rates {window}?",
+    "Will the Lakers win the NBA Finals {window}?",
+    "Will Nvidia reach ${a} {window}?",
+    "Will Elon Musk tweet more than {a} times {window}?",
+    "Will Dogecoin hit ${a} {window}?",
+]
+WINDOWS = ["in February 2026", "by March 31", "on June 1", "this week", "before 2027", "today", "by the end of 2026"]
+
+def synthetic_questions(n, price_share=0.3, seed=0):
+    """n Gamma-style questions, price_share of them on BTC/ETH/SOL. Returns [(question, labels or None)]."""
+    rng = np.random.default_rng(seed)
+    names = [(asset, name) for asset, aliases in PolymarketTouchScanner.ASSET_ALIASES.items() for name in aliases]
+    questions = []
+    for _ in range(n):
+        a = int(rng.integers(1, 200))
+        window = WINDOWS[rng.integers(len(WINDOWS))]
+        if rng.random() < price_share:
+            asset, name = names[rng.integers(len(names))]
+            template, kind, direction = QUESTION_TEMPLATES[rng.integers(len(QUESTION_TEMPLATES))]
+            b = a + int(rng.integers(1, 10))
+            high = b * 1000.0 if kind == "range" else None
+            questions.append((template.format(name=name, a=a, b=b, window=window), (asset, kind, direction, a * 1000.0, high, window)))
+        else:
+            questions.append((OTHER_QUESTIONS[rng.integers(len(OTHER_QUESTIONS))].format(a=a, window=window), None))
+    return questions
+
+def classify_substrings(asset_patterns, question):
+    """The original chained-substring touch filter and $-regex strike parse, kept as the benchmark baseline"""
+    if "What price will Bitcoin hit in February 2026?" not in question:
+        if not any(pattern.search(question) for _, pattern in asset_patterns): return None
+        if not ("hit" in question or "reach" in question or "above" in question): return None
+    strike_match = re.search(r'\$([\d,]+)', question)
+    return float(strike_match.group(1).replace(",", "")) if strike_match else None
+
+def best_of(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+def peak_memory(fn):
+    """Peak traced allocation (bytes) while fn runs"""
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def bench_chain_parse(sizes=(1000, 5000, 20000), repeat=5):
+    """Row-wise vs columnar get_option_chain_summary parsing"""
+    connector = DeribitConnector("BTC", http=ResponseCache(None))
+    results = []
+    for n in sizes:
+        summaries = synthetic_summaries(n)
+        rowwise = best_of(lambda: parse_summaries_rowwise(connector, summaries), repeat)
+        columnar = best_of(lambda: connector.parse_summaries(summaries), repeat)
+        results.append({"instruments": n, "rowwise_s": rowwise, "columnar_s": columnar, "speedup": rowwise / columnar})
+        print(f"chain_parse n={n:>6}: rowwise {rowwise*1e3:8.2f} ms | columnar {columnar*1e3:8.2f} ms | {rowwise/columnar:5.1f}x")
+    return results
+
+def bench_one_touch(sizes=(1000, 100000), repeat=3):
+    """Scalar one_touch_probability loop vs one_touch_probability_batch"""
+    results = []
+    for n in sizes:
+        rng = np.random.default_rng(n)
+        S = np.full(n, 100000.0)
+        K = S * rng.uniform(0.5, 2.0, n)
+        T = rng.uniform(0.01, 1.0, n)
+        sigma = rng.uniform(0.3, 1.0, n)
+        scalar_n = min(n, 2000) # The scalar loop is timed on a prefix and scaled
+        scalar = best_of(lambda: [BlackScholesModels.one_touch_probability(S[i], K[i], T[i], sigma[i]) for i in range(scalar_n)], repeat)
+        scalar *= n / scalar_n
+        batch = best_of(lambda: BlackScholesModels.one_touch_probability_batch(S, K, T, sigma), repeat)
+        results.append({"n": n, "scalar_per_s": n / scalar, "batch_per_s": n / batch})
+        print(f"one_touch n={n:>7}: scalar {n/scalar:12,.0f}/s | batch {n/batch:14,.0f}/s")
+    return results
+
+def bench_monte_carlo(sizes=(100, 500), target_se=0.003):
+    """MonteCarloTouchPricer markets per second and its gap to the closed form (continuous, no jumps)"""
+    from monte_carlo import MonteCarloTouchPricer
+    results = []
+    for n in sizes:
+        rng = np.random.default_rng(n)
+        S = np.full(n, 100000.0)
+        K = S * rng.uniform(0.6, 1.6, n)
+        T = rng.choice([7, 14, 30, 60, 90], n) / 365.0 # Markets share a handful of expiries, as in a scan
+        sigma = rng.uniform(0.4, 0.8, n)
+        pricer = MonteCarloTouchPricer(seed=0, target_se=target_se)
+        elapsed = best_of(lambda: pricer.price(S, K, T, sigma), 1)
+        prob, stderr = pricer.price(S, K, T, sigma)
+        gap = np.abs(prob - BlackScholesModels.one_touch_probability_batch(S, K, T, sigma))
+        results.append({"n": n, "markets_per_s": n / elapsed, "max_abs_gap": float(gap.max()), "max_stderr": float(stderr.max())})
+        print(f"monte_carlo n={n:>5}: {n/elapsed:8,.0f} mkts/s | max |MC - BS| {gap.max():.4f} | max se {stderr.max():.4f}")
+    return results
+
+def make_replicator(summaries, markets):
+    from touch_replicator import TouchReplicator
+    return TouchReplicator(
+        deribit=FakeDeribitConnector(summaries),
+        poly_scanner=FakePolymarketScanner(markets),
+        clock=lambda: BENCH_NOW,
+    )
+
+def run_pipeline(summaries, markets):
+    """Full offline TouchReplicator pass; returns stage times (s) and the result count"""
+    replicator = make_replicator(summaries, markets)
+    times = {}
+    start = time.perf_counter()
+    replicator.fetch_option_chains()
+    replicator.get_chain_index()
+    times["chain"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    details = replicator.fetch_market_details()
+    times["markets"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    results = replicator.price_markets(details)
+    times["pricing"] = time.perf_counter() - start
+    times["total"] = sum(times.values())
+    return times, len(results)
+
+def bench_pipeline(instruments=(1000, 10000, 50000), markets=(100, 2000, 20000), repeat=3):
+    """Chain load, market parse and pricing through TouchReplicator with fake connectors"""
+    results = []
+    for n_inst in instruments:
+        summaries = synthetic_summaries(n_inst)
+        for n_mkt in markets:
+            universe = synthetic_markets(n_mkt)
+            runs = [run_pipeline(summaries, universe) for _ in range(repeat)]
+            times = {stage: min(t[stage] for t, _ in runs) for stage in runs[0][0]}
+            priced = runs[0][1]
+            peak = peak_memory(lambda: run_pipeline(summaries, universe))
+            results.append({
+                "instruments": n_inst,
+                "markets": n_mkt,
+                "priced": priced,
+                "seconds": times,
+                "instruments_per_s": n_inst / times["chain"],
+                "markets_per_s": n_mkt / (times["markets"] + times["pricing"]),
+                "peak_mb": peak / 1e6,
+            })
+            print(f"pipeline inst={n_inst:>6} mkts={n_mkt:>6}: chain {times['chain']*1e3:8.1f} ms | "
+                  f"markets {times['markets']*1e3:8.1f} ms | pricing {times['pricing']*1e3:8.1f} ms | "
+                  f"{n_mkt/(times['markets']+times['pricing']):10,.0f} mkts/s | peak {peak/1e6:7.1f} MB")
+    return results
+
+def bench_deribit_metrics(instruments=(1000, 10000, 50000), calls=2000, repeat=3):
+    """Scalar calculate_deribit_metrics calls per second"""
+    results = []
+    universe = synthetic_markets(calls)
+    for n_inst in instruments:
+        replicator = make_replicator(synthetic_summaries(n_inst), universe)
+        replicator.fetch_option_chains()
+        details = [replicator.poly_scanner.parse_market_details(m) for m in universe]
+        replicator.calculate_deribit_metrics(details[0]["strike"], details[0]["expiry"]) # Builds index and surface
+        elapsed = best_of(lambda: [replicator.calculate_deribit_metrics(d["strike"], d["expiry"]) for d in details], repeat)
+        results.append({"instruments": n_inst, "calls": calls, "calls_per_s": calls / elapsed})
+        print(f"deribit_metrics inst={n_inst:>6}: {calls/elapsed:10,.0f} calls/s")
+    return results
+
+def bench_poll_scheduler(markets=200, hours=2.0, tick=10.0, vol=0.6, threshold=0.10, seed=0):
+    """
+    PollScheduler on a simulated clock against fake APIs whose Yes prices follow a
+    GBM spot path (touch probability plus a per-market bias, a new price every `tick`
+    seconds), vs fixed-cadence full scans spending the same Gamma requests (endpoints
+    are rate-limited separately; the fake chain is static, so chain requests are only
+    counted). Sampled in the middle of every tick: mean |known - true| Yes price and the
+    share of market-samples whose signal (edge > threshold) is wrong.
+    """
+    from touch_replicator import TouchReplicator
+    from poll_scheduler import PollScheduler, SimulatedClock, CHAIN_ENDPOINT, MARKETS_ENDPOINT
+
+    rng = np.random.default_rng(seed)
+    universe = synthetic_markets(markets, seed=seed)
+    n_ticks = int(hours * 3600 / tick) + 1
+    year = 365 * 86400.0
+    spot = 100000.0 * np.exp(np.cumsum(np.r_[0.0, rng.normal(0.0, vol * np.sqrt(tick / year), n_ticks - 1)]))
+
+    clock = SimulatedClock()
+    yes = None
+    scanner = SimulatedPolymarketScanner(universe, lambda i, t: yes[i, min(int(t // tick), n_ticks - 1)], clock)
+    details = [scanner.parse_market_details(m) for m in universe]
+    K = np.array([d["strike"] for d in details])
+    T = (np.array([d["expiry_time"] for d in details])[:, None] - BENCH_NOW.timestamp() - tick * np.arange(n_ticks)) / year
+    touch = BlackScholesModels.one_touch_probability_batch(spot[None, :], K[:, None], T, vol)
+    yes = np.round(np.clip(touch + rng.uniform(-0.05, 0.20, markets)[:, None], 0.001, 0.999), 3)
+
+    replicator = TouchReplicator(
+        deribit=FakeDeribitConnector(synthetic_summaries(1000)),
+        poly_scanner=scanner,
+        clock=lambda: BENCH_NOW + timedelta(seconds=clock.time()),
+    )
+    scheduler = PollScheduler(replicator, threshold=threshold, discovery_interval=hours * 3600, clock=clock.time, sleep=clock.sleep)
+
+    start = time.perf_counter()
+    samples = [] # (market positions, tick, reference prob, known Yes price)
+    scheduler.run(duration=tick / 2)
+    for _ in range(n_ticks - 1):
+        scheduler.run(duration=tick)
+        live = list(scheduler.results)
+        known = np.array([scheduler.markets[i]["poly_price"] for i in live])
+        ref = known - np.array([scheduler.results[i]["edge"] for i in live])
+        samples.append((np.array([scanner.positions[i] for i in live]), min(int(clock.time() // tick), n_ticks - 1), ref, known))
+    elapsed = time.perf_counter() - start
+
+    requests = scheduler.limiters[MARKETS_ENDPOINT].requests
+    period = max(1, int(n_ticks * scheduler.discovery_cost() / requests)) # Fixed scan period (ticks) paging the same Gamma requests
+
+    def score(known_of):
+        errors, wrong = [], []
+        for rows, j, ref, known in samples:
+            true, known = yes[rows, j], known_of(rows, j, known)
+            errors.append(np.abs(true - known))
+            wrong.append((known - ref > threshold) != (true - ref > threshold))
+        return float(np.concatenate(errors).mean()), float(np.concatenate(wrong).mean())
+
+    adaptive = score(lambda rows, j, known: known)
+    fixed = score(lambda rows, j, known: yes[rows, (j // period) * period])
+    results = {
+        "markets": markets, "hours": hours, "gamma_requests": requests, "chain_requests": scheduler.limiters[CHAIN_ENDPOINT].requests,
+        "fixed_scan_every_s": period * tick, "sim_speedup": hours * 3600 / elapsed,
+        "adaptive": {"mean_abs_price_error": adaptive[0], "wrong_signal": adaptive[1]},
+        "fixed": {"mean_abs_price_error": fixed[0], "wrong_signal": fixed[1]},
+    }
+    print(f"poll_scheduler mkts={markets} {hours:g}h: {requests} Gamma requests (= full scans every {period*tick:,.0f}s), "
+          f"{scheduler.limiters[CHAIN_ENDPOINT].requests} chain | "
+          f"price error adaptive {adaptive[0]:.4f} vs fixed {fixed[0]:.4f} | "
+          f"wrong signal adaptive {adaptive[1]:.2%} vs fixed {fixed[1]:.2%} | {hours*3600/elapsed:,.0f}x real time")
+    return [results]
+
+def bench_market_classifier(sizes=(10000, 50000), repeat=3):
+    """
+    MarketClassifier.classify vs the original substring filter + strike regex over generated
+    Gamma questions (30% crypto price questions). Accuracy: the generated price questions'
+    template labels (the hand-labelled corpus is tests/test_market_classifier.py).
+    """
+    from market_classifier import MarketClassifier, corpus_errors
+    classifier = MarketClassifier()
+    asset_patterns = [
+        (asset, re.compile(r"\b(?:" + "|".join(aliases) + r")\b"))
+        for asset, aliases in PolymarketTouchScanner.ASSET_ALIASES.items()
+    ]
+    results = []
+    for n in sizes:
+        corpus = synthetic_questions(n)
+        questions = [q for q, _ in corpus]
+        baseline = best_of(lambda: [classify_substrings(asset_patterns, q) for q in questions], repeat)
+        compiled = best_of(lambda: [classifier.classify(q) for q in questions], repeat)
+        labelled = [(q, labels) for q, labels in corpus if labels]
+        generated_errors = len(corpus_errors(labelled, classifier))
+        baseline_strikes = sum(classify_substrings(asset_patterns, q) == labels[3] for q, labels in labelled)
+        results.append({
+            "questions": n,
+            "baseline_per_s": n / baseline,
+            "classifier_per_s": n / compiled,
+            "generated_accuracy": 1 - generated_errors / len(labelled),
+            "baseline_strike_accuracy": baseline_strikes / len(labelled),
+        })
+        print(f"market_classifier n={n:>6}: substrings {n/baseline:10,.0f} q/s | classifier {n/compiled:10,.0f} q/s | "
+              f"generated accuracy {1 - generated_errors/len(labelled):.1%} (baseline strikes {baseline_strikes/len(labelled):.1%})")
+    return results
+
+def bench_backtest(markets=(100, 500), hours=24, chain_minutes=(1, 5), instruments=1000):
+    """
+    TouchBacktester.price_rows over recorded minute data: one market snapshot per minute for
+    `hours`, a chain snapshot every `chain_minutes`. Reported as minutes of pricing per year of
+    minute snapshots (525,600 market snapshots), extrapolated from the recorded span.
+    """
+    import shutil
+    import tempfile
+    from backtest import TouchBacktester
+    from snapshot_store import SnapshotRecorder
+
+    t0 = int(BENCH_NOW.timestamp()) * 10**9
+    chains = [FakeDeribitConnector(synthetic_summaries(instruments, seed=seed)).get_option_chain_summary() for seed in range(4)]
+    n_snapshots = int(hours * 60)
+    results = []
+    for n_mkt in markets:
+        universe = synthetic_markets(n_mkt)
+        for every in chain_minutes:
+            root = tempfile.mkdtemp(prefix="touch_backtest_bench-")
+            try:
+                recorder = SnapshotRecorder(root)
+                for minute in range(0, n_snapshots, every):
+                    recorder.record_chain(chains[(minute // every) % len(chains)], t0 + minute * 60 * 10**9)
+                for minute in range(n_snapshots):
+                    recorder.record_markets(universe, t0 + minute * 60 * 10**9 + 10**9)
+                backtester = TouchBacktester(root)
+                start = time.perf_counter()
+                rows = backtester.price_rows()
+                elapsed = time.perf_counter() - start
+            finally:
+                shutil.rmtree(root, ignore_errors=True)
+            per_year = elapsed / n_snapshots * 525600 / 60
+            results.append({"markets": n_mkt, "chain_every_min": every, "snapshots": n_snapshots, "rows": len(rows),
+                            "seconds": elapsed, "rows_per_s": len(rows) / elapsed, "minutes_per_year": per_year})
+            print(f"backtest mkts={n_mkt:>5} chain every {every:>2} min: {n_snapshots} snapshots in {elapsed:6.2f} s | "
+                  f"{len(rows)/elapsed:10,.0f} rows/s | {per_year:7.1f} min per year of minute data")
+    return results
+
+IMPORT_TARGETS = {
+    "bs_models": "import bs_models",
+    "polymarket_touch_scanner": "import polymarket_touch_scanner",
+    "touch_replicator": "import touch_replicator",
+    "cli": "import cli",
+    "cli --help": "import cli, contextlib, io\nwith contextlib.redirect_stdout(io.StringIO()):\n    try: cli.main(['--help'])\n    except SystemExit: pass",
+}
+
+def bench_import_time(targets=None, repeat=5):
+    """Wall time of a fresh interpreter importing each module (startup cost a CLI user pays)"""
+    baseline = best_of(lambda: subprocess.run([sys.executable, "-c", "pass"], check=True), repeat)
+    results = []
+    for name, code in (targets or IMPORT_TARGETS).items():
+        elapsed = best_of(lambda: subprocess.run([sys.executable, "-c", code], check=True), repeat)
+        results.append({"target": name, "seconds": elapsed, "import_s": elapsed - baseline})
+        print(f"import_time {name:>26}: {elapsed*1e3:8.1f} ms ({(elapsed-baseline)*1e3:8.1f} ms over bare interpreter)")
+    return results
+
+BENCHMARKS = {
+    "chain_parse": bench_chain_parse,
+    "one_touch": bench_one_touch,
+    "monte_carlo": bench_monte_carlo,
+    "pipeline": bench_pipeline,
+    "deribit_metrics": bench_deribit_metrics,
+    "import_time": bench_import_time,
+    "poll_scheduler": bench_poll_scheduler,
+    "market_classifier": bench_market_classifier,
+    "backtest": bench_backtest,
+}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Touch replicator benchmarks")
+    parser.add_argument("names", nargs="*", default=list(BENCHMARKS), help=f"Benchmarks to run: {', '.join(BENCHMARKS)}")
+    parser.add_argument("--instruments", help="Comma-separated chain sizes for pipeline / deribit_metrics")
+    parser.add_argument("--markets", help="Comma-separated market counts for pipeline")
+    parser.add_argument("--json", metavar="PATH", help="Save results to PATH for comparison between runs")
+    args = parser.parse_args()
+
+    sizes = lambda text: tuple(int(x) for x in text.split(",") if x.strip())
+    options = {
+        "pipeline": {k: sizes(v) for k, v in (("instruments", args.instruments), ("markets", args.markets)) if v},
+        "deribit_metrics": {"instruments": sizes(args.instruments)} if args.instruments else {},
+    }
+
+    report = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "results": {},
+    }
+    for name in args.names:
+        if name not in BENCHMARKS:
+            sys.exit(f"Unknown benchmark: {name}")
+        report["results"][name] = BENCHMARKS[name](**options.get(name, {}))
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.json}")
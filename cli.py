@@ -0,0 +1,153 @@
+"""
+Touch Bet Replicator command line.
+
+    python cli.py replicate [--html] [--currencies BTC,ETH] ...   Poly touch markets vs Deribit (TouchReplicator)
+    python cli.py serve [--port 8000] [--interval 60|--adaptive]  Scan loop + live results server (results_server.py)
+    python cli.py scan [--currencies BTC]                         Touch vs European spread scan (PolymarketTouchScanner)
+    python cli.py analyze                                         Feb 2026 credit-spread fair values (Feb2026TouchAnalyzer)
+
+Only argparse is imported up front; each command imports its own modules
+(pandas, numpy, requests) when it runs, so --help and argument errors
+return immediately.
+"""
+import sys
+import argparse
+
+def currency_list(text):
+    return [c.strip().upper() for c in text.split(",") if c.strip()]
+
+def build_replicator(args):
+    from touch_replicator import TouchReplicator
+    from instrumentation import Instrumentation
+
+    spread_optimizer = parallel_pricer = depth_pricer = touch_pricer = sink = None
+    if args.best_spread:
+        from spread_optimizer import SpreadOptimizer
+        spread_optimizer = SpreadOptimizer(max_width_pct=args.max_spread_width)
+    if args.workers > 1:
+        from parallel_pricing import ParallelPricer
+        parallel_pricer = ParallelPricer(workers=args.workers)
+    if args.depth_notional:
+        from depth_pricing import DepthPricer
+        depth_pricer = DepthPricer(notional=args.depth_notional, edge_threshold=args.depth_threshold)
+    if args.monte_carlo:
+        from monte_carlo import MonteCarloTouchPricer
+        touch_pricer = MonteCarloTouchPricer(
+            monitoring=args.monitoring,
+            jump_intensity=args.jump_intensity,
+            jump_mean=args.jump_mean,
+            jump_std=args.jump_std,
+            seed=args.seed,
+        )
+
+    if args.jsonl:
+        from result_sink import JsonlSink
+        sink = JsonlSink(args.jsonl)
+    elif args.parquet:
+        from result_sink import ParquetSink
+        sink = ParquetSink(args.parquet)
+
+    replicator = TouchReplicator(
+        currencies=currency_list(args.currencies),
+        spread_optimizer=spread_optimizer,
+        instrumentation=Instrumentation(enabled=getattr(args, "profile", False) or bool(getattr(args, "prometheus", None))),
+        parallel_pricer=parallel_pricer,
+        depth_pricer=depth_pricer,
+        touch_pricer=touch_pricer,
+        sink=sink,
+    )
+    return replicator
+
+def run_replicate(args):
+    replicator = build_replicator(args)
+    try:
+        replicator.scan(html_output=args.html)
+    finally:
+        if replicator.sink: replicator.sink.close()
+    if args.profile:
+        import json
+        print(json.dumps(replicator.metrics.as_dict(), indent=2, default=str))
+    if args.prometheus:
+        replicator.metrics.write_prometheus(args.prometheus)
+
+def run_serve(args):
+    import threading
+    from results_server import ResultsServer, scan_loop
+
+    replicator = build_replicator(args)
+    server = ResultsServer(host=args.host, port=args.port).start()
+    print(f"Serving results on {server.url} (JSON: {server.url}/results)")
+    stop = threading.Event()
+    try:
+        if args.adaptive:
+            from poll_scheduler import PollScheduler
+            scheduler = PollScheduler(replicator, discovery_interval=args.discovery_interval,
+                                      on_update=server.board.upsert, on_snapshot=server.board.publish)
+            scheduler.run(stop=stop)
+        else:
+            scan_loop(replicator, server.board, interval=args.interval, stop=stop)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+        if replicator.sink: replicator.sink.close()
+
+def run_scan(args):
+    from polymarket_touch_scanner import PolymarketTouchScanner
+    PolymarketTouchScanner(assets=currency_list(args.currencies)).find_arbitrage()
+
+def run_analyze(args):
+    from feb2026_analysis import Feb2026TouchAnalyzer
+    Feb2026TouchAnalyzer().analyze()
+
+def add_replicate_arguments(parser):
+    parser.add_argument("--currencies", default="BTC", help="Comma-separated underlyings, e.g. BTC,ETH,SOL")
+    parser.add_argument("--best-spread", action="store_true", help="Hedge up touches with the best call spread centred on each strike instead of the adjacent strikes")
+    parser.add_argument("--max-spread-width", type=float, default=0.10, help="Spread width cap as a fraction of the strike")
+    parser.add_argument("--workers", type=int, default=1, help="Pricing processes for large market lists (1 = in-process)")
+    parser.add_argument("--depth-notional", type=float, help="Price against L2 books for this many NO shares")
+    parser.add_argument("--depth-threshold", type=float, default=0.05, help="Edge the max executable size must keep")
+    parser.add_argument("--monte-carlo", action="store_true", help="Model touch probability by simulation instead of the GBM formula")
+    parser.add_argument("--monitoring", type=float, help="Seconds between resolution price observations (default continuous)")
+    parser.add_argument("--jump-intensity", type=float, default=0.0, help="Jumps per year for --monte-carlo")
+    parser.add_argument("--jump-mean", type=float, default=0.0, help="Mean log jump size")
+    parser.add_argument("--jump-std", type=float, default=0.0, help="Std dev of log jump size")
+    parser.add_argument("--seed", type=int, help="Random seed for --monte-carlo")
+    history = parser.add_mutually_exclusive_group()
+    history.add_argument("--jsonl", metavar="PATH", help="Append every scan's results to a JSONL file")
+    history.add_argument("--parquet", metavar="DIR", help="Append every scan's results to a Parquet dataset partitioned by scan date")
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Touch Bet Replicator")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    replicate = commands.add_parser("replicate", help="Price Polymarket touch markets against Deribit")
+    replicate.add_argument("--html", action="store_true", help="Write the index.html dashboard")
+    replicate.add_argument("--profile", action="store_true", help="Print stage, latency, skip and HTTP metrics after the scan")
+    replicate.add_argument("--prometheus", metavar="PATH", help="Write scan metrics in Prometheus text format to PATH")
+    add_replicate_arguments(replicate)
+    replicate.set_defaults(run=run_replicate)
+
+    serve = commands.add_parser("serve", help="Scan on a loop and serve the latest results over HTTP")
+    serve.add_argument("--host", default="127.0.0.1", help="Address to bind")
+    serve.add_argument("--port", type=int, default=8000, help="Port to bind")
+    serve.add_argument("--interval", type=float, default=60.0, help="Seconds between scans")
+    serve.add_argument("--adaptive", action="store_true", help="Poll each market on its own schedule within API rate limits instead of full scans")
+    serve.add_argument("--discovery-interval", type=float, default=600.0, help="Seconds between full market listings with --adaptive")
+    add_replicate_arguments(serve)
+    serve.set_defaults(run=run_serve)
+
+    scan = commands.add_parser("scan", help="Touch vs European call-spread scan")
+    scan.add_argument("--currencies", default="BTC", help="Comma-separated underlyings, e.g. BTC,ETH,SOL")
+    scan.set_defaults(run=run_scan)
+
+    analyze = commands.add_parser("analyze", help="Feb 2026 credit-spread fair values")
+    analyze.set_defaults(run=run_analyze)
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    args.run(args)
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
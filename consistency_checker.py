@@ -0,0 +1,204 @@
+import numpy as np
+from market_classifier import TOUCH_KINDS, MarketClassifier
+
+_classifier = MarketClassifier()
+
+def classify_question(question):
+    """(kind, direction): kind 'touch' (hit/reach by a date) or 'above' (on a date); direction 'up' or 'down'"""
+    c = _classifier.classify(question)
+    kind = c.kind if c is not None and c.kind in TOUCH_KINDS else "touch"
+    direction = c.direction if c is not None and c.direction else "up"
+    return kind, direction
+
+# Window phrases open from the market's listing ("by March 31"); others name their start ("in February")
+OPEN_WINDOWS = ("by", "before", "until", "through")
+MONTHS = ("jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec")
+
+def window_start(window, expiry):
+    """
+    When a market's window opens, as a key markets can share: '' for windows open from
+    listing (by/before/until/through, or no window phrase), 'YYYY-MM-01' for 'in/during
+    <Month> [year]' (year of the expiry when not written), else the phrase and expiry
+    (only markets worded alike and expiring together share such a start)
+    """
+    words = (window or "").lower().replace(",", " ").split()
+    if not words or words[0] in OPEN_WINDOWS:
+        return ""
+    if words[0] in ("in", "during") and len(words) > 1 and words[1][:3] in MONTHS:
+        year = next((w for w in words[2:] if len(w) == 4 and w.isdigit()), expiry[:4])
+        return f"{year}-{MONTHS.index(words[1][:3]) + 1:02d}-01"
+    return f"{' '.join(words)} | {expiry}"
+
+def _runs(values):
+    """(start, end) of each run of equal consecutive values"""
+    if len(values) == 0:
+        return []
+    starts = np.flatnonzero(np.r_[True, values[1:] != values[:-1]])
+    return zip(starts, np.r_[starts[1:], len(values)])
+
+class _PrefixMin:
+    """Fenwick tree over strike ranks: insert (rank, price, item), query min price over ranks <= r"""
+
+    def __init__(self, size):
+        self.price = np.full(size + 1, np.inf)
+        self.item = np.full(size + 1, -1)
+
+    def insert(self, rank, price, item):
+        i = rank + 1
+        while i < len(self.price):
+            if price < self.price[i]:
+                self.price[i] = price
+                self.item[i] = item
+            i += i & -i
+
+    def query(self, rank):
+        best_price, best_item = np.inf, -1
+        i = rank + 1
+        while i > 0:
+            if self.price[i] < best_price:
+                best_price, best_item = self.price[i], self.item[i]
+            i -= i & -i
+        return best_price, best_item
+
+class ConsistencyChecker:
+    """
+    Nesting / monotonicity checks across Polymarket markets on one asset
+    (see CORRELATION_ARB.md). For an upside strike, market A must be priced
+    at least as high as market B whenever A's event contains B's:
+
+      touch >= touch   touch(K_A by T_A) >= touch(K_B by T_B)  if K_A <= K_B, T_A >= T_B, same start
+      touch >= above   touch(K_A by T_A) >= above(K_B on T_B)  if K_A <= K_B, start_A <= T_B <= T_A
+      above >= above   above(K_A on T)   >= above(K_B on T)    if K_A <= K_B
+
+    Downside markets (dip to / below) use the mirrored strike order. A touch
+    window contains another only when both open at the same time (window_start):
+    'by March 31' contains 'by February 28', but 'in February' does not contain
+    'in January', nor does 'by March 31' contain 'in February' once February has
+    begun.
+
+    Each dominated market is checked against its cheapest dominating market
+    with a sweep over expiries (latest first) and a prefix-min tree over
+    strikes, so the check is O(n log n) per window start. Only that pair is
+    reported: it has the largest edge of all the market's violations, and every
+    other dominating market priced below the dominated one is a violation too,
+    up to n^2 of them, left out.
+    """
+
+    def __init__(self, tolerance=0.0):
+        self.tolerance = tolerance # Minimum price gap reported as a violation
+
+    def index_markets(self, market_details):
+        """Parsed markets (parse_market_details output) grouped by (asset, direction)"""
+        groups = {}
+        for details in market_details:
+            window = details.get("window")
+            if details.get("kind") and details.get("direction"):
+                kind, direction = details["kind"], details["direction"] # Classified by the scanner
+            else:
+                kind, direction = classify_question(details.get("question", ""))
+                c = _classifier.classify(details.get("question", ""))
+                window = window or (c.window if c is not None else None)
+            entry = dict(details, kind=kind, direction=direction, window=window)
+            groups.setdefault((details.get("asset"), direction), []).append(entry)
+        return groups
+
+    def check(self, market_details):
+        """Violations sorted by edge: {'rule', 'asset', 'direction', 'buy_yes', 'buy_no', 'edge'}"""
+        violations = []
+        for (asset, direction), markets in self.index_markets(market_details).items():
+            violations += self._check_group(asset, direction, markets)
+        violations.sort(key=lambda v: v["edge"], reverse=True)
+        return violations
+
+    def _check_group(self, asset, direction, markets):
+        n = len(markets)
+        strikes = np.array([m["strike"] for m in markets], dtype=float)
+        # Mirror downside strikes so "contains" is always K_A <= K_B
+        keys = -strikes if direction == "down" else strikes
+        # YYYY-MM-DD strings: lexical order is chronological
+        expiries = np.array([m["expiry"] for m in markets], dtype=str)
+        _, expiry_codes = np.unique(expiries, return_inverse=True)
+        prices = np.array([m["poly_price"] for m in markets], dtype=float)
+        is_touch = np.array([m["kind"] == "touch" for m in markets])
+        starts = np.array([window_start(m.get("window"), m["expiry"]) for m in markets])
+        _, ranks = np.unique(keys, return_inverse=True)
+
+        found = []
+
+        # Touches dominate every market with a higher (mirrored) strike and an earlier or equal expiry,
+        # one sweep per window start: the touches opening then, and the 'above' markets dated inside
+        # their windows where the start is a date
+        for start in np.unique(starts[is_touch]):
+            touches = is_touch & (starts == start)
+            dated = start == "" or start[:1].isdigit()
+            members = np.flatnonzero(touches | (~is_touch & (expiries >= start) if dated else touches))
+            # Latest expiries first; each expiry group is inserted before it is queried so ties count as contained
+            tree = _PrefixMin(n)
+            order = members[np.lexsort((keys[members], expiry_codes[members]))[::-1]]
+            for lo, hi in _runs(expiry_codes[order]):
+                group = order[lo:hi]
+                for i in group:
+                    if is_touch[i]:
+                        tree.insert(ranks[i], prices[i], i)
+                for i in group:
+                    price, j = tree.query(ranks[i])
+                    if j >= 0 and j != i:
+                        found.append(("touch>=" + ("touch" if is_touch[i] else "above"), j, i))
+
+        # 'Above' markets on the same date: lower (mirrored) strike dominates, a running min per date
+        above = np.flatnonzero(~is_touch)
+        order = above[np.lexsort((keys[above], expiry_codes[above]))]
+        for lo, hi in _runs(expiry_codes[order]):
+            group = order[lo:hi]
+            best, best_j = np.inf, -1
+            for klo, khi in _runs(keys[group]):
+                same_strike = group[klo:khi]
+                for i in same_strike:
+                    if prices[i] < best:
+                        best, best_j = prices[i], i
+                for i in same_strike:
+                    if best_j != i:
+                        found.append(("above>=above", best_j, i))
+
+        # An 'above' market can sit in several windows: keep its cheapest dominating touch
+        best = {}
+        for rule, j, i in found:
+            if (rule, i) not in best or prices[j] < prices[best[rule, i]]:
+                best[rule, i] = j
+
+        violations = []
+        for (rule, i), j in best.items():
+            edge = prices[i] - prices[j]
+            if edge > self.tolerance:
+                violations.append({
+                    "rule": rule,
+                    "asset": asset,
+                    "direction": direction,
+                    "buy_yes": markets[j], # Containing event, priced too low
+                    "buy_no": markets[i], # Contained event, priced too high
+                    "edge": float(edge),
+                })
+        return violations
+
+def print_violations(violations):
+    for v in violations:
+        a, b = v["buy_yes"], v["buy_no"]
+        print(f"[{v['asset']} {v['direction']}] {v['rule']}  edge {v['edge']:.1%}")
+        print(f"  Buy YES {a['poly_price']:.1%}: {a['question']} ({a['expiry']})")
+        print(f"  Buy NO  {1 - b['poly_price']:.1%}: {b['question']} ({b['expiry']})")
+        print("-" * 30)
+
+if __name__ == "__main__":
+    import argparse
+    from polymarket_touch_scanner import PolymarketTouchScanner
+
+    parser = argparse.ArgumentParser(description="Nested-event consistency check across Polymarket markets")
+    parser.add_argument("--currencies", default="BTC", help="Comma-separated underlyings, e.g. BTC,ETH,SOL")
+    parser.add_argument("--tolerance", type=float, default=0.01, help="Minimum price gap to report")
+    args = parser.parse_args()
+
+    scanner = PolymarketTouchScanner(assets=[c.strip().upper() for c in args.currencies.split(",") if c.strip()])
+    details = [d for d in map(scanner.parse_market_details, scanner.iter_polymarket_touch_markets()) if d]
+    violations = ConsistencyChecker(tolerance=args.tolerance).check(details)
+    print(f"\n{len(violations)} violations across {len(details)} markets\n")
+    print_violations(violations)
@@ -0,0 +1,165 @@
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+
+def vwap(levels, qty):
+    """
+    Average fill price of `qty` (scalar or array) against book levels [[price, size], ...] sorted best first.
+    qty 0 gives the best price; NaN where the book is too thin.
+    """
+    qty = np.asarray(qty, dtype=float)
+    levels = np.asarray(levels, dtype=float).reshape(-1, 2)
+    if len(levels) == 0:
+        return np.full(qty.shape, np.nan)
+
+    prices, sizes = levels[:, 0], levels[:, 1]
+    cum_size = np.cumsum(sizes)
+    cum_cost = np.cumsum(prices * sizes)
+    i = np.minimum(np.searchsorted(cum_size, qty, side="left"), len(prices) - 1)
+    prev_size = np.where(i > 0, cum_size[i - 1], 0.0)
+    prev_cost = np.where(i > 0, cum_cost[i - 1], 0.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        avg = (prev_cost + (qty - prev_size) * prices[i]) / qty
+    avg = np.where(qty > 0, avg, prices[0])
+    return np.where(qty > cum_size[-1], np.nan, avg)
+
+def depth(levels):
+    return float(sum(size for _, size in levels))
+
+def hedge_parts(hedge):
+    """
+    (spread, weight) pairs of a result's hedge: the far spread, plus the near one of a
+    calendar blend ({"legs", "width", "spot", "weight", "scale"} under "near"), weighted as in spread_prob
+    """
+    near = hedge.get("near")
+    if not near:
+        return [(hedge, 1.0)]
+    return [(hedge, 1.0 - near["weight"]), (near, near["weight"])]
+
+class DepthPricer:
+    """
+    Size-aware edge from L2 books on both venues.
+
+    For N 'No' shares (N USD paid out if the market resolves No):
+      poly_prob(N)  = 1 - VWAP of N shares on the No token's asks
+      hedge_prob(N) = c * debit / width for q = cN / width spreads, buying
+                      legs[0] (the lower call / upper put) on its asks and
+                      selling legs[1] on its bids: the long replication of
+                      the Yes payout a No position needs. c is the hedge's
+                      scale: 2 for a touch (at touch the spread is worth
+                      ~width/2), 1 for finishing above/below K on the date
+      edge(N)       = poly_prob(N) - hedge_prob(N)
+    A calendar-blended spread_prob (weight w on the near expiry) is hedged
+    on both expiries: q = cwN / width_near near spreads and
+    q = c(1 - w)N / width_far far spreads, hedge_prob the weighted sum.
+    This is the trade generate_html displays and spread_prob prices at the
+    top of the book, so at size 0 hedge_prob reproduces spread_prob.
+    Markets without a spread hedge use bs_prob as the reference. Both
+    terms only worsen with size, so the largest size keeping the edge at
+    or above the threshold is found by bisection.
+
+    Books are fetched concurrently: Deribit one instrument per request,
+    Polymarket tokens in batches on the CLOB /books endpoint. Endpoints
+    come from the connectors (DeribitConnector.BASE_URL, scanner clob_url),
+    so a local fake book server can stand in for both.
+    """
+
+    def __init__(self, notional=1000.0, edge_threshold=0.05, book_depth=20, workers=8, batch_size=50, bisect_steps=40):
+        self.notional = notional # 'No' shares the executable edge is quoted for
+        self.edge_threshold = edge_threshold
+        self.book_depth = book_depth
+        self.workers = workers
+        self.batch_size = batch_size # Tokens per CLOB /books request
+        self.bisect_steps = bisect_steps
+
+    def fetch_books(self, replicator, scan_results):
+        """({instrument: book}, {token_id: book}) for the hedge legs and No tokens of the results"""
+        legs = {}
+        tokens = set()
+        for r in scan_results:
+            if r.get("hedge"):
+                for spread, _ in hedge_parts(r["hedge"]):
+                    for instrument in spread["legs"]:
+                        legs[instrument] = r.get("asset") or replicator.currencies[0]
+            if len(r.get("token_ids", [])) > 1:
+                tokens.add(r["token_ids"][1])
+        tokens = sorted(tokens)
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            leg_futures = {
+                instrument: pool.submit(replicator.deribit_connectors[asset].get_order_book, instrument, self.book_depth)
+                for instrument, asset in legs.items() if asset in replicator.deribit_connectors
+            }
+            token_futures = [
+                pool.submit(replicator.poly_scanner.get_order_books, tokens[i:i + self.batch_size])
+                for i in range(0, len(tokens), self.batch_size)
+            ]
+            leg_books = {instrument: f.result() for instrument, f in leg_futures.items()}
+            token_books = {}
+            for f in token_futures:
+                token_books.update(f.result())
+        return {k: v for k, v in leg_books.items() if v}, token_books
+
+    def edge_at(self, result, no_book, leg_books, size):
+        """(poly_prob, ref_prob, edge) executable for `size` No shares (arrays broadcast)"""
+        size = np.asarray(size, dtype=float)
+        poly_prob = 1.0 - vwap(no_book["asks"], size)
+        hedge = result.get("hedge")
+        if hedge:
+            ref_prob = np.zeros(size.shape)
+            for spread, weight in hedge_parts(hedge):
+                bought, sold = (leg_books[name] for name in spread["legs"])
+                scale = spread.get("scale", 2.0)
+                contracts = scale * weight * size / spread["width"]
+                debit = (vwap(bought["asks"], contracts) - vwap(sold["bids"], contracts)) * spread["spot"]
+                ref_prob = ref_prob + weight * scale * debit / spread["width"]
+            ref_prob = np.maximum(ref_prob, 0.0)
+        else:
+            ref_prob = np.full(size.shape, result["bs_prob"])
+        return poly_prob, ref_prob, poly_prob - ref_prob
+
+    def max_size(self, result, no_book, leg_books):
+        """Largest No size (shares) whose executable edge stays >= edge_threshold; 0 if none"""
+        limit = depth(no_book["asks"])
+        hedge = result.get("hedge")
+        for spread, weight in hedge_parts(hedge) if hedge else []:
+            if weight > 0:
+                bought, sold = (leg_books[name] for name in spread["legs"])
+                contracts_per_share = spread.get("scale", 2.0) * weight / spread["width"]
+                limit = min(limit, min(depth(bought["asks"]), depth(sold["bids"])) / contracts_per_share)
+        if limit <= 0 or not self.edge_at(result, no_book, leg_books, 0.0)[2] >= self.edge_threshold:
+            return 0.0
+        if self.edge_at(result, no_book, leg_books, limit)[2] >= self.edge_threshold:
+            return limit
+
+        lo, hi = 0.0, limit
+        for _ in range(self.bisect_steps):
+            mid = 0.5 * (lo + hi)
+            if self.edge_at(result, no_book, leg_books, mid)[2] >= self.edge_threshold:
+                lo = mid
+            else:
+                hi = mid
+        return lo
+
+    def enrich(self, replicator, scan_results):
+        """
+        Add exec_poly_prob, exec_ref_prob, exec_edge (at `notional`) and max_size to each result
+        whose books are available (None otherwise). Returns the results.
+        """
+        leg_books, token_books = self.fetch_books(replicator, scan_results)
+        for r in scan_results:
+            r.update({"exec_poly_prob": None, "exec_ref_prob": None, "exec_edge": None, "max_size": None})
+            tokens = r.get("token_ids", [])
+            no_book = token_books.get(tokens[1]) if len(tokens) > 1 else None
+            hedge = r.get("hedge")
+            legs = [name for spread, _ in hedge_parts(hedge) for name in spread["legs"]] if hedge else []
+            if not no_book or any(name not in leg_books for name in legs):
+                continue
+
+            poly_prob, ref_prob, edge = (float(x) for x in self.edge_at(r, no_book, leg_books, self.notional))
+            r.update({
+                "exec_poly_prob": None if np.isnan(poly_prob) else poly_prob,
+                "exec_ref_prob": None if np.isnan(ref_prob) else ref_prob,
+                "exec_edge": None if np.isnan(edge) else edge,
+                "max_size": self.max_size(r, no_book, leg_books),
+            })
+        return scan_results
@@ -1,41 +1,69 @@
 import requests
-import pandas as pd
+import numpy as np
 from datetime import datetime
+from functools import lru_cache
 import time
+from http_cache import default_cache
 
 class DeribitConnector:
     BASE_URL = "https://www.deribit.com/api/v2"
 
-    def __init__(self, currency="BTC"):
+    # Assets whose options trade on the USDC-settled linear books: asset -> (API currency, instrument prefix)
+    LINEAR_OPTIONS = {"SOL": ("USDC", "SOL_USDC")}
+    # Price fields (chain columns) linear books quote in USDC
+    LINEAR_PRICE_FIELDS = ("mark_price", "bid", "ask")
+
+    def __init__(self, currency="BTC", http=None):
         self.currency = currency
+        self.http = http or default_cache() # Shared on-disk response cache (see http_cache.py)
+        self.session = requests.Session() # Uncached calls (order books)
 
     def get_ticker_by_currency(self, currency="BTC"):
         """Fetch all tickers for a currency to get mark price and IV"""
-        url = f"{self.BASE_URL}/public/get_book_summary_by_currency?currency={currency}&kind=option"
+        url = f"{self.BASE_URL}/public/get_book_summary_by_currency"
         try:
-            resp = requests.get(url)
+            resp = self.http.get(url, params={"currency": currency, "kind": "option"})
             return resp.json().get("result", [])
         except Exception as e:
             print(f"Error fetching ticker for {currency}: {e}")
             return []
 
-    def parse_expiry(self, expiry_str):
-        """Parse DDMMMYY (e.g. 28MAR25) to YYYY-MM-DD"""
+    def get_order_book(self, instrument, depth=20):
+        """
+        L2 book of one instrument: {"bids": [[price, amount], ...] best first, "asks": ...}, or None on error.
+        Prices are in underlying units, as in get_option_chain_summary (linear books are divided by the underlying price).
+        """
+        url = f"{self.BASE_URL}/public/get_order_book"
         try:
-            # Deribit format: 28MAR25
-            dt = datetime.strptime(expiry_str, "%d%b%y")
-            return dt.strftime("%Y-%m-%d")
-        except ValueError:
+            resp = self.session.get(url, params={"instrument_name": instrument, "depth": depth}, timeout=10)
+            book = resp.json().get("result") or {}
+        except Exception as e:
+            print(f"Error fetching order book for {instrument}: {e}")
             return None
 
+        scale = 1.0
+        if self.currency in self.LINEAR_OPTIONS and book.get("underlying_price"):
+            scale = 1.0 / book["underlying_price"]
+        return {
+            side: [[float(price) * scale, float(amount)] for price, amount in book.get(side) or []]
+            for side in ("bids", "asks")
+        }
+
+    def parse_expiry(self, expiry_str):
+        """Parse DDMMMYY (e.g. 28MAR25) to YYYY-MM-DD"""
+        return _parse_expiry_code(expiry_str)
+
     def get_option_chain_summary(self):
         """
         Fetch summary of all option instruments for the currency (mark_price, bid, ask, open_interest, mark_iv).
         Returns a DataFrame.
         """
+        import pandas as pd
+
+        api_currency, prefix = self.LINEAR_OPTIONS.get(self.currency, (self.currency, None))
         try:
-            url = f"{self.BASE_URL}/public/get_book_summary_by_currency?currency={self.currency}&kind=option"
-            resp = requests.get(url)
+            url = f"{self.BASE_URL}/public/get_book_summary_by_currency"
+            resp = self.http.get(url, params={"currency": api_currency, "kind": "option"})
             if resp.status_code != 200:
                 print(f"Error fetching summaries: {resp.text}")
                 return pd.DataFrame()
@@ -45,39 +73,95 @@ class DeribitConnector:
             print(f"Error fetching summaries: {e}")
             return pd.DataFrame()
 
-        data = []
-        for item in summaries:
-            # Instrument name format: BTC-28MAR25-100000-C
-            name = item["instrument_name"]
-            parts = name.split("-")
-            if len(parts) < 4: continue
-            
-            expiry_str = parts[1] # e.g. 28MAR25
-            try:
-                strike = float(parts[2])
-            except ValueError:
-                continue
-                
-            opt_type = "call" if parts[3] == "C" else "put"
-            expiry_date = self.parse_expiry(expiry_str)
-            
-            data.append({
-                "instrument": name,
-                "expiry": expiry_date,
-                "strike": strike,
-                "type": opt_type,
-                "mark_price": item.get("mark_price"), # In BTC
-                "bid": item.get("bid_price"),
-                "ask": item.get("ask_price"),
-                "mark_iv": item.get("mark_iv"),
-                "underlying_price": item.get("underlying_price"), # Index price
-                "open_interest": item.get("open_interest"),
-                "volume_usd": item.get("volume_usd_24h")
-            })
-            
-        df = pd.DataFrame(data)
+        if prefix is None:
+            return self.parse_summaries(summaries)
+
+        # Linear books list several underlyings and quote in USDC.
+        # Convert prices to underlying units so premium * spot is USD as for BTC/ETH.
+        summaries = [item for item in summaries if item["instrument_name"].startswith(prefix + "-")]
+        df = self.parse_summaries(summaries)
+        if not df.empty:
+            for col in self.LINEAR_PRICE_FIELDS:
+                df[col] = df[col] / df["underlying_price"]
         return df
 
+    def parse_summaries(self, summaries):
+        """
+        Columnar parse of get_book_summary_by_currency results.
+        Instrument names are split in bulk and each distinct expiry code is
+        parsed once. Columns: categorical expiry (YYYY-MM-DD) and type,
+        float strike, datetime64 expiry_dt.
+        """
+        import pandas as pd
+
+        if not summaries:
+            return pd.DataFrame()
+
+        # Instrument name format: BTC-28MAR25-100000-C
+        names = pd.Series([item["instrument_name"] for item in summaries], dtype=object)
+        parts = names.str.split("-", n=3, expand=True)
+        if parts.shape[1] < 4:
+            return pd.DataFrame()
+
+        strike = pd.to_numeric(parts[2], errors="coerce")
+        keep = (parts[3].notna() & strike.notna()).to_numpy()
+        if not keep.any():
+            return pd.DataFrame()
+
+        # One strptime per distinct expiry code (e.g. 28MAR25)
+        codes = parts[1][keep]
+        memo = {code: _parse_expiry_code(code) for code in codes.unique()}
+        expiry = codes.map(memo)
+
+        def column(field):
+            return np.array([item.get(field) for item in summaries], dtype=float)[keep]
+
+        df = pd.DataFrame({
+            "instrument": names[keep].to_numpy(),
+            "expiry": expiry.to_numpy(),
+            "strike": strike[keep].to_numpy(dtype=float),
+            "type": pd.Categorical(np.where(parts[3][keep] == "C", "call", "put")),
+            "mark_price": column("mark_price"), # In BTC
+            "bid": column("bid_price"),
+            "ask": column("ask_price"),
+            "mark_iv": column("mark_iv"),
+            "underlying_price": column("underlying_price"), # Index price
+            "open_interest": column("open_interest"),
+            "volume_usd": column("volume_usd_24h"),
+        })
+        df["expiry"] = df["expiry"].astype("category")
+        df["expiry_dt"] = pd.to_datetime(df["expiry"].astype(object), format="%Y-%m-%d")
+        return df
+
+def underlying_units(instrument, values, underlying_price=None):
+    """
+    Quote fields of one instrument (chain column -> value) in underlying units, as
+    get_option_chain_summary stores them: linear books (SOL_USDC-...) quote prices in
+    USDC, so those are divided by the underlying price (values' own, else `underlying_price`).
+    Linear prices with no underlying price to scale by are dropped; other instruments pass through.
+    """
+    prefixes = tuple(prefix + "-" for _, prefix in DeribitConnector.LINEAR_OPTIONS.values())
+    if not instrument.startswith(prefixes):
+        return values
+    spot = values.get("underlying_price") or underlying_price
+    scaled = {}
+    for col, value in values.items():
+        if col in DeribitConnector.LINEAR_PRICE_FIELDS and value is not None:
+            if not spot or spot != spot: continue
+            value = value / spot
+        scaled[col] = value
+    return scaled
+
+@lru_cache(maxsize=None)
+def _parse_expiry_code(expiry_str):
+    """Parse DDMMMYY (e.g. 28MAR25) to YYYY-MM-DD, memoized"""
+    try:
+        # Deribit format: 28MAR25
+        dt = datetime.strptime(expiry_str, "%d%b%y")
+        return dt.strftime("%Y-%m-%d")
+    except ValueError:
+        return None
+
 if __name__ == "__main__":
     dc = DeribitConnector("BTC")
     df = dc.get_option_chain_summary()
@@ -1,10 +1,13 @@
 import pandas as pd
 from deribit_connector import DeribitConnector
+from option_chain_index import OptionChainIndex
+from spread_optimizer import SpreadOptimizer
 
 class Feb2026TouchAnalyzer:
-    def __init__(self):
+    def __init__(self, spread_optimizer=None):
         self.deribit = DeribitConnector("BTC")
         self.option_chain = pd.DataFrame()
+        self.spread_optimizer = spread_optimizer or SpreadOptimizer()
 
     def analyze(self):
         print("Fetching Deribit Option Chain...")
@@ -83,6 +86,18 @@ class Feb2026TouchAnalyzer:
             print(f"  Fair Value for 'No Touch': {1 - prob_touch:.2%}")
             print("-" * 30)
 
+        # Best spread over the strike pairs centred on K in the width window, on the target expiry
+        print("\n=== Best Credit Spread (Strike Pairs Centred on K in Width Window) ===")
+        index = OptionChainIndex(chain_2026)
+        best = self.spread_optimizer.optimize(index, strikes, [target_expiry] * len(strikes))
+        for i, k in enumerate(strikes):
+            if pd.isna(best["spread_prob"][i]):
+                print(f"Strike {k}: No quoted spread in window.")
+                continue
+            print(f"Strike ${k:,.0f} (Spread: ${best['k_short'][i]/1000:.0f}k-${best['k_long'][i]/1000:.0f}k, {best['expiry'][i]}):")
+            print(f"  Credit: ${best['credit'][i]:.2f} | Width: ${best['width'][i]:,.0f}")
+            print(f"  Implied Touch Prob: {best['spread_prob'][i]:.2%}")
+
 if __name__ == "__main__":
     analyzer = Feb2026TouchAnalyzer()
     analyzer.analyze()
@@ -0,0 +1,196 @@
+import os
+import json
+import time
+import getpass
+import hashlib
+import tempfile
+from urllib.parse import urlencode, urlsplit
+import requests
+
+try:
+    import fcntl # POSIX only; without it processes may fetch the same entry concurrently
+except ImportError:
+    fcntl = None
+
+class CachedResponse:
+    """The parts of requests.Response the connectors use, served from the cache"""
+
+    def __init__(self, entry):
+        self.status_code = entry["status_code"]
+        self.text = entry["body"]
+        self.headers = {"ETag": entry.get("etag"), "Last-Modified": entry.get("last_modified")}
+        self.from_cache = True
+
+    def json(self):
+        return json.loads(self.text)
+
+class ResponseCache:
+    """
+    GET response cache shared by every process on the host.
+
+    Entries are JSON files under `root`, one per URL + query, written
+    atomically (temp file + os.replace) so readers never see a partial
+    body. A fetch holds an flock on the entry, so concurrent processes
+    wait for the first download and then reuse it. Fresh entries (younger
+    than the endpoint's TTL) are served without a request; stale ones are
+    revalidated with If-None-Match / If-Modified-Since when the server
+    sent validators, and a 304 renews the entry.
+    """
+
+    # Seconds an entry is served without asking the server, by endpoint (last URL path segment).
+    # Gamma prices stay below PolymarketPollingFeed's 5 s poll so every poll sees a new price.
+    DEFAULT_TTLS = {
+        "get_book_summary_by_currency": 10.0,
+        "markets": 2.0,
+    }
+
+    def __init__(self, root, ttls=None, default_ttl=0.0):
+        self.root = root # None = pass-through, nothing is cached
+        self.ttls = dict(self.DEFAULT_TTLS if ttls is None else ttls)
+        self.default_ttl = default_ttl
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self.instrumentation = None # Instrumentation receiving bytes/time per endpoint
+        if root:
+            os.makedirs(root, mode=0o700, exist_ok=True) # Entries are private to the user running the scans
+
+    @staticmethod
+    def endpoint(url):
+        return urlsplit(url).path.rstrip("/").rsplit("/", 1)[-1]
+
+    def ttl(self, url):
+        return self.ttls.get(self.endpoint(url), self.default_ttl)
+
+    def key(self, url, params):
+        full = url if not params else url + "?" + urlencode(sorted(params.items()))
+        return hashlib.sha256(full.encode()).hexdigest()
+
+    def get(self, url, params=None, timeout=30, session=None):
+        """Like requests.get(url, params=...); may return a CachedResponse instead of a Response"""
+        if self.instrumentation is None or not self.instrumentation.enabled:
+            return self._get(url, params, timeout, session)
+        start = time.perf_counter()
+        resp = self._get(url, params, timeout, session)
+        nbytes = len(resp.text) if isinstance(resp, CachedResponse) else len(resp.content)
+        self.instrumentation.http(self.endpoint(url), nbytes, time.perf_counter() - start,
+                                  cached=isinstance(resp, CachedResponse))
+        return resp
+
+    def _get(self, url, params, timeout, session):
+        fetch = session.get if session is not None else requests.get
+        if not self.root:
+            return fetch(url, params=params, timeout=timeout)
+
+        path = os.path.join(self.root, self.key(url, params) + ".json")
+        ttl = self.ttl(url)
+        entry = self._read(path)
+        if self._fresh(entry, ttl):
+            self.hits += 1
+            return CachedResponse(entry)
+
+        with _FileLock(path + ".lock"):
+            # Another process may have refreshed the entry while we waited
+            entry = self._read(path)
+            if self._fresh(entry, ttl):
+                self.hits += 1
+                return CachedResponse(entry)
+
+            headers = {}
+            if entry and entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry and entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+            resp = fetch(url, params=params, timeout=timeout, headers=headers)
+            if resp.status_code == 304 and entry:
+                self.revalidated += 1
+                entry["fetched_at"] = time.time()
+                self._write(path, entry)
+                return CachedResponse(entry)
+
+            self.misses += 1
+            if resp.status_code == 200:
+                self._write(path, {
+                    "url": url,
+                    "params": params,
+                    "fetched_at": time.time(),
+                    "status_code": resp.status_code,
+                    "etag": resp.headers.get("ETag"),
+                    "last_modified": resp.headers.get("Last-Modified"),
+                    "body": resp.text,
+                })
+            return resp
+
+    def stats(self):
+        return {"hits": self.hits, "revalidated": self.revalidated, "misses": self.misses}
+
+    @staticmethod
+    def _fresh(entry, ttl):
+        return entry is not None and ttl > 0 and time.time() - entry["fetched_at"] < ttl
+
+    @staticmethod
+    def _read(path):
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write(self, path, entry):
+        fd, tmp = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(entry, f)
+            os.replace(tmp, path)
+        except OSError as e:
+            print(f"Error writing HTTP cache entry: {e}")
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+class _FileLock:
+    def __init__(self, path):
+        self.path = path
+        self.f = None
+
+    def __enter__(self):
+        if fcntl is not None:
+            self.f = open(self.path, "a")
+            fcntl.flock(self.f, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc):
+        if self.f is not None:
+            fcntl.flock(self.f, fcntl.LOCK_UN)
+            self.f.close()
+
+_default_cache = None
+
+def default_cache():
+    """
+    Process-wide cache used by the connectors.
+    Location: $TOUCH_HTTP_CACHE_DIR (empty disables caching), else a per-user directory under the system temp dir.
+    """
+    global _default_cache
+    if _default_cache is None:
+        root = os.environ.get("TOUCH_HTTP_CACHE_DIR", default_cache_dir())
+        _default_cache = ResponseCache(root or None)
+    return _default_cache
+
+def default_cache_dir():
+    """<temp dir>/touch_replicator_http-<user>, or None when another user owns it (caching off)"""
+    try:
+        user = getpass.getuser()
+    except Exception:
+        user = str(os.getuid()) if hasattr(os, "getuid") else "default"
+    root = os.path.join(tempfile.gettempdir(), f"touch_replicator_http-{user}")
+    try:
+        os.makedirs(root, mode=0o700, exist_ok=True)
+        owner = os.stat(root).st_uid
+    except OSError as e:
+        print(f"HTTP cache disabled: {e}")
+        return None
+    if hasattr(os, "getuid") and owner != os.getuid():
+        print(f"HTTP cache disabled: {root} belongs to another user")
+        return None
+    return root
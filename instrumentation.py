@@ -0,0 +1,154 @@
+import os
+import time
+import bisect
+import tempfile
+import threading
+from contextlib import contextmanager, nullcontext
+
+_NO_OP = nullcontext()
+
+class Instrumentation:
+    """
+    Scan metrics: stage timers, latency histograms, skip counts by reason
+    and HTTP traffic per endpoint.
+
+    When disabled every recording method returns immediately, so the
+    instrumented code paths cost one attribute check.
+    Read with as_dict(); write_prometheus() exports the text format.
+    """
+
+    # Latency histogram bucket upper bounds (seconds)
+    LATENCY_BUCKETS = (1e-5, 5e-5, 1e-4, 5e-4, 1e-3, 5e-3, 1e-2, 5e-2, 0.1, 0.5, 1.0)
+
+    def __init__(self, enabled=True, buckets=None):
+        self.enabled = enabled
+        self.buckets = tuple(buckets or self.LATENCY_BUCKETS)
+        self.lock = threading.Lock() # HTTP fetches report from worker threads
+        self.reset()
+
+    def reset(self):
+        self.stages = {} # name -> [seconds, calls]
+        self.histograms = {} # name -> [bucket counts (+Inf last), sum, count]
+        self.skips = {} # reason -> count
+        self.http_stats = {} # endpoint -> {"requests", "cached", "bytes", "seconds"}
+
+    def stage(self, name):
+        """Context manager adding the wall time of the block to stage `name`"""
+        if not self.enabled:
+            return _NO_OP
+        return self._timed(name)
+
+    @contextmanager
+    def _timed(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_stage(name, time.perf_counter() - start)
+
+    def add_stage(self, name, seconds):
+        if not self.enabled: return
+        with self.lock:
+            stage = self.stages.setdefault(name, [0.0, 0])
+            stage[0] += seconds
+            stage[1] += 1
+
+    def observe(self, name, seconds, n=1):
+        """Add a latency sample to histogram `name`; n > 1 records n samples of `seconds` (a batch's per-item share)"""
+        if not self.enabled: return
+        hist = self.histograms.get(name)
+        if hist is None:
+            hist = self.histograms[name] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        hist[0][bisect.bisect_left(self.buckets, seconds)] += n
+        hist[1] += seconds * n
+        hist[2] += n
+
+    def skip(self, reason, n=1):
+        """Count markets dropped from a scan, by reason"""
+        if not self.enabled: return
+        self.skips[reason] = self.skips.get(reason, 0) + n
+
+    def http(self, endpoint, nbytes, seconds, cached=False):
+        if not self.enabled: return
+        with self.lock:
+            stats = self.http_stats.setdefault(endpoint, {"requests": 0, "cached": 0, "bytes": 0, "seconds": 0.0})
+            stats["requests"] += 1
+            stats["cached"] += int(cached)
+            stats["bytes"] += nbytes
+            stats["seconds"] += seconds
+
+    def raw_state(self):
+        """Stage, histogram and skip counts as plain data (picklable, for merge() in another process)"""
+        return {"stages": self.stages, "histograms": self.histograms, "skips": self.skips}
+
+    def merge(self, state):
+        """Add another instance's raw_state(), e.g. a pricing worker's"""
+        if not self.enabled: return
+        with self.lock:
+            for name, (seconds, calls) in state["stages"].items():
+                stage = self.stages.setdefault(name, [0.0, 0])
+                stage[0] += seconds
+                stage[1] += calls
+            for name, (counts, total, count) in state["histograms"].items():
+                hist = self.histograms.setdefault(name, [[0] * (len(self.buckets) + 1), 0.0, 0])
+                hist[0] = [a + b for a, b in zip(hist[0], counts)]
+                hist[1] += total
+                hist[2] += count
+            for reason, n in state["skips"].items():
+                self.skips[reason] = self.skips.get(reason, 0) + n
+
+    def as_dict(self):
+        histograms = {}
+        for name, (counts, total, count) in self.histograms.items():
+            cumulative, running = {}, 0
+            for bound, n in zip(self.buckets + (float("inf"),), counts):
+                running += n
+                cumulative[bound] = running
+            histograms[name] = {"buckets": cumulative, "sum": total, "count": count}
+        return {
+            "stages": {name: {"seconds": s, "calls": c} for name, (s, c) in self.stages.items()},
+            "latency": histograms,
+            "skipped": dict(self.skips),
+            "http": {endpoint: dict(stats) for endpoint, stats in self.http_stats.items()},
+        }
+
+    def prometheus_text(self, prefix="touch"):
+        data = self.as_dict()
+        lines = []
+
+        def metric(name, kind, samples):
+            if not samples: return
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+            for labels, value in samples:
+                label_text = ",".join(f'{k}="{v}"' for k, v in labels.items())
+                lines.append(f"{prefix}_{name}{{{label_text}}} {value}")
+
+        stages = data["stages"]
+        metric("stage_seconds_total", "counter", [({"stage": n}, s["seconds"]) for n, s in stages.items()])
+        metric("stage_calls_total", "counter", [({"stage": n}, s["calls"]) for n, s in stages.items()])
+
+        if data["latency"]:
+            lines.append(f"# TYPE {prefix}_latency_seconds histogram")
+        for name, hist in data["latency"].items():
+            for bound, count in hist["buckets"].items():
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f'{prefix}_latency_seconds_bucket{{op="{name}",le="{le}"}} {count}')
+            lines.append(f'{prefix}_latency_seconds_sum{{op="{name}"}} {hist["sum"]}')
+            lines.append(f'{prefix}_latency_seconds_count{{op="{name}"}} {hist["count"]}')
+
+        metric("markets_skipped_total", "counter", [({"reason": r}, n) for r, n in data["skipped"].items()])
+
+        http = data["http"]
+        metric("http_requests_total", "counter", [({"endpoint": e}, s["requests"]) for e, s in http.items()])
+        metric("http_cached_total", "counter", [({"endpoint": e}, s["cached"]) for e, s in http.items()])
+        metric("http_bytes_total", "counter", [({"endpoint": e}, s["bytes"]) for e, s in http.items()])
+        metric("http_seconds_total", "counter", [({"endpoint": e}, s["seconds"]) for e, s in http.items()])
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path, prefix="touch"):
+        """Write the text format atomically (for node_exporter's textfile collector)"""
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            f.write(self.prometheus_text(prefix))
+        os.replace(tmp, path)
@@ -0,0 +1,145 @@
+import re
+from functools import lru_cache
+from record import Record
+
+# Names a question may use for each underlying
+ASSET_ALIASES = {
+    "BTC": ["BTC", "Bitcoin"],
+    "ETH": ["ETH", "Ethereum", "Ether"],
+    "SOL": ["SOL", "Solana"],
+}
+
+# Kinds the touch replicator prices (one strike, touched or finishing above/below it)
+TOUCH_KINDS = ("touch", "above")
+
+SUFFIXES = {"k": 1e3, "thousand": 1e3, "m": 1e6, "million": 1e6, "b": 1e9, "billion": 1e9}
+
+_NUMBER = r"\d{1,3}(?:,\d{3})+(?:\.\d+)?|\d+(?:\.\d+)?"
+_SUFFIX = r"\s?(?i:thousand|million|billion)\b|[kKmMbB]\b"
+_MONTH = r"(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?"
+_DAY = r"(?:mon|tues|wednes|thurs|fri|satur|sun)day\b"
+_WHEN = rf"(?:{_MONTH}|{_DAY}|\d|(?:the\s+)?end\b|this\b|next\b|today\b|tomorrow\b|q[1-4]\b)"
+
+# Tokens of the single-pass scan, tried in this order at each position (group name, pattern)
+TOKEN_PATTERNS = [
+    ("range", rf"\$\s?(?P<lo>{_NUMBER})(?P<lo_sfx>{_SUFFIX})?\s?(?:-|–|to)\s?\$(?P<hi>{_NUMBER})(?P<hi_sfx>{_SUFFIX})?"
+              rf"|\$\s?(?P<lo2>{_NUMBER})\s?(?:-|–)\s?(?P<hi2>{_NUMBER})(?P<hi2_sfx>{_SUFFIX})?"),
+    ("strike", rf"\$\s?(?P<num>{_NUMBER})(?P<sfx>{_SUFFIX})?"),
+    ("between", r"(?i:\bbetween\b)"),
+    ("touch_down", r"(?i:\b(?:dip|dips|drop|drops|fall|falls|sink|sinks|crash|crashes|plunge|plunges|tumble|tumbles)\b)"),
+    ("touch_up", r"(?i:\b(?:hit|hits|reach|reaches|touch|touches|break|breaks|exceed|exceeds|surpass|surpasses"
+                 r"|(?:rise|rises|climb|climbs|surge|surges|pump|pumps|rally|rallies|spike|spikes)\s+to)\b)"),
+    ("above", r"(?i:\b(?:above|over|higher than|greater than|more than|at least)(?=\s*\$))"),
+    ("below", r"(?i:\b(?:below|under|lower than|less than|at most)(?=\s*\$))"),
+    ("window", rf"(?i:\b(?:by|before|in|on|at|during|until|through)\s+{_WHEN}[^?$]*"
+               rf"|\b(?:this|next)\s+(?:week|weekend|month|year|quarter)\b[^?$]*|\b(?:today|tomorrow)\b[^?$]*)"),
+]
+
+class MarketClass(Record):
+    """What a market question asks (MarketClassifier.classify output)"""
+    __slots__ = ("asset", "kind", "direction", "strike", "strike_high", "window")
+
+def strike_value(number, suffix=None):
+    """'100,000' -> 100000.0, ('100', 'k') -> 100000.0, ('1.5', ' million') -> 1500000.0"""
+    value = float(number.replace(",", ""))
+    return value * SUFFIXES[suffix.strip().lower()] if suffix else value
+
+@lru_cache(maxsize=None)
+def _compile(aliases):
+    """
+    (asset pattern, token pattern) for aliases ((name, asset), ...): the token pattern is one
+    alternation over every token and the asset names; the asset pattern alone rejects the
+    bulk of a market listing, which names no scanned asset, before the full scan
+    """
+    names = sorted((name for name, _ in aliases), key=len, reverse=True)
+    asset = r"\b(?:" + "|".join(map(re.escape, names)) + r")\b"
+    patterns = TOKEN_PATTERNS + [("asset", asset)]
+    return re.compile(asset), re.compile("|".join(f"(?P<{name}>{pattern})" for name, pattern in patterns))
+
+class MarketClassifier:
+    """
+    Single-pass classifier for Polymarket price questions.
+
+    One precompiled alternation walks the question once, left to right,
+    picking up asset names, strikes ($100,000 / $100k / $1.5M), ranges
+    ($90k-$95k, between $X and $Y), touch verbs (hit, reach, dip to, ...),
+    above/below comparisons and the window (by March 31, in February 2026,
+    this week, ...). classify() turns the tokens into:
+
+      asset        first scanned asset named (asset names are case-sensitive)
+      kind         'touch' (a hit/reach/dip verb), 'above' (above/below a strike
+                   on a date, no touch verb), 'range' or None (no verb)
+      direction    'down' for dip/drop/fall/below wording, else 'up' (None for ranges)
+      strike       the single strike (range: the low end); None when absent, ambiguous
+                   (several strikes, e.g. '$100k or $80k first') or not a price level
+                   (no touch/above/range wording, e.g. 'ETF inflows top $1B')
+      strike_high  the high end of a range
+      window       the window phrase as written, e.g. 'by March 31'
+    """
+
+    def __init__(self, assets=None, aliases=None):
+        aliases = aliases or ASSET_ALIASES
+        self.assets = tuple(assets or aliases)
+        self.alias_asset = {name: asset for asset in self.assets for name in aliases.get(asset, [asset])}
+        self.asset_pattern, self.pattern = _compile(tuple(self.alias_asset.items()))
+
+    def classify(self, question):
+        """MarketClass of a question, or None if it names no scanned asset"""
+        if not self.asset_pattern.search(question):
+            return None
+        asset = window = None
+        strikes, ranges = [], []
+        touch = euro = down = between = False
+        for m in self.pattern.finditer(question):
+            token = m.lastgroup
+            if token == "strike":
+                strikes.append(strike_value(m["num"], m["sfx"]))
+            elif token == "asset":
+                asset = asset or self.alias_asset[m["asset"]]
+            elif token == "touch_up":
+                touch = True
+            elif token == "touch_down":
+                touch = down = True
+            elif token == "above":
+                euro = True
+            elif token == "below":
+                euro = down = True
+            elif token == "window":
+                window = window or m["window"].strip(" ,.:;")
+            elif token == "between":
+                between = True
+            elif m["lo"] is not None:
+                # $90-$95k: the low end takes the high end's suffix when it has none
+                ranges.append((strike_value(m["lo"], m["lo_sfx"] or m["hi_sfx"]), strike_value(m["hi"], m["hi_sfx"])))
+            else:
+                ranges.append((strike_value(m["lo2"], m["hi2_sfx"]), strike_value(m["hi2"], m["hi2_sfx"])))
+        if asset is None:
+            return None
+
+        strike = strike_high = None
+        if between and len(strikes) == 2 and not ranges:
+            ranges = [tuple(sorted(strikes))]
+            strikes = []
+        if len(ranges) == 1 and not strikes:
+            kind, direction = "range", None
+            strike, strike_high = ranges[0]
+        else:
+            kind = "touch" if touch else "above" if euro else None
+            direction = "down" if down else "up"
+            if kind is not None and len(strikes) == 1 and not ranges:
+                strike = strikes[0]
+        return MarketClass(asset=asset, kind=kind, direction=direction, strike=strike, strike_high=strike_high, window=window)
+
+def corpus_errors(corpus, classifier=None):
+    """
+    (question, expected, got) for every labelled question the classifier gets wrong.
+    corpus: [(question, (asset, kind, direction, strike, strike_high, window) or None)]
+    """
+    classifier = classifier or MarketClassifier()
+    errors = []
+    for question, expected in corpus:
+        c = classifier.classify(question)
+        got = None if c is None else (c.asset, c.kind, c.direction, c.strike, c.strike_high, c.window)
+        if got != expected:
+            errors.append((question, expected, got))
+    return errors
@@ -0,0 +1,155 @@
+import math
+import numpy as np
+
+SECONDS_PER_YEAR = 365 * 86400
+BGK_BETA = 0.5826 # -zeta(1/2) / sqrt(2 pi): Broadie-Glasserman-Kou discrete monitoring shift
+
+class MonteCarloTouchPricer:
+    """
+    Monte Carlo one-touch probabilities, a drop-in for
+    BlackScholesModels.one_touch_probability_batch.
+
+    Log-price paths follow the same risk-neutral GBM drift (r - sigma^2 / 2),
+    optionally with Merton jumps (Poisson intensity per year, normal log
+    jump sizes, drift compensated). Markets sharing an expiry are simulated
+    together: one draw of normals (and jumps) per chunk, scaled by each
+    market's own sigma, so a (markets, paths, steps) block is one NumPy pass.
+
+    Monitoring:
+      monitoring=None  continuous; with bridge=True each step adds the
+                       Brownian-bridge probability of crossing between its
+                       endpoints, so coarse steps stay unbiased
+      monitoring=secs  the resolution source is observed every `secs`; with
+                       the bridge the barrier is shifted out by
+                       exp(0.5826 * sigma * sqrt(secs)) (Broadie-Glasserman-Kou);
+                       without it paths are checked on that grid exactly
+                       (capped at max_steps steps)
+
+    Paths come in antithetic pairs from a seeded generator, in chunks of at
+    most max_cells values per array. Simulation stops once every market's
+    standard error is at or below target_se, or at max_paths.
+    """
+
+    def __init__(self, monitoring=None, steps_per_day=1, bridge=True, antithetic=True,
+                 jump_intensity=0.0, jump_mean=0.0, jump_std=0.0,
+                 seed=None, chunk_paths=20000, min_paths=2000, max_paths=100000, target_se=0.003,
+                 max_steps=2000, max_cells=1_000_000):
+        self.monitoring = monitoring # Seconds between observations of the resolution price (None = continuous)
+        self.steps_per_day = steps_per_day # Simulation steps per day when not set by the monitoring grid
+        self.bridge = bridge
+        self.antithetic = antithetic
+        self.jump_intensity = jump_intensity # Jumps per year
+        self.jump_mean = jump_mean # Mean log jump size
+        self.jump_std = jump_std # Std dev of log jump size
+        self.seed = seed
+        self.chunk_paths = chunk_paths
+        self.min_paths = min_paths # Paths before target_se may stop a market (rare touches need a sample)
+        self.max_paths = max_paths
+        self.target_se = target_se # None = always run max_paths
+        self.max_steps = max_steps
+        self.max_cells = max_cells # Bound on markets * paths * steps per chunk array
+        self.last_stderr = None # Standard errors of the last one_touch_probability_batch call
+
+    def steps(self, T):
+        """Simulation steps for time to expiry T (years)"""
+        if self.monitoring and not self.bridge:
+            n = math.ceil(T * SECONDS_PER_YEAR / self.monitoring)
+        else:
+            n = math.ceil(T * 365 * self.steps_per_day)
+        return int(min(max(n, 1), self.max_steps))
+
+    def one_touch_probability_batch(self, S, K, T, sigma, r=0.04):
+        prob, self.last_stderr = self.price(S, K, T, sigma, r)
+        return prob
+
+    def price(self, S, K, T, sigma, r=0.04):
+        """
+        (probability, standard error) arrays for touching K before T; inputs broadcast.
+        Expired (T <= 0), zero-vol or at-the-barrier entries are 1.0 if S >= K else 0.0, with zero error.
+        """
+        S, K, T, sigma, r = np.broadcast_arrays(
+            *(np.asarray(x, dtype=float) for x in (S, K, T, sigma, r))
+        )
+        prob = np.where(S >= K, 1.0, 0.0)
+        stderr = np.zeros(prob.shape)
+        live = (T > 0) & (sigma > 0) & (K != S)
+        prob[~np.isfinite(S + K + T + sigma + r)] = np.nan
+        live &= np.isfinite(prob)
+
+        rng = np.random.default_rng(self.seed)
+        flat_T = T.ravel()
+        for t in np.unique(flat_T[live.ravel()]):
+            group = np.flatnonzero(live.ravel() & (flat_T == t))
+            per_chunk = max(1, self.max_cells // self.steps(t)) # Markets per block so one path fits in max_cells
+            for start in range(0, len(group), per_chunk):
+                rows = group[start:start + per_chunk]
+                p, se = self._price_expiry(rng, S.ravel()[rows], K.ravel()[rows], t, sigma.ravel()[rows], r.ravel()[rows])
+                prob.ravel()[rows] = p
+                stderr.ravel()[rows] = se
+        return prob, stderr
+
+    def _price_expiry(self, rng, S, K, T, sigma, r):
+        """Markets sharing one expiry: (probability, standard error)"""
+        m, n = len(S), self.steps(T)
+        dt = T / n
+
+        # Work with the barrier above the path: down markets are mirrored
+        sign = np.where(K > S, 1.0, -1.0)[:, None, None]
+        barrier = np.log(K / S)
+        if self.monitoring and self.bridge:
+            barrier += np.sign(barrier) * BGK_BETA * sigma * math.sqrt(self.monitoring / SECONDS_PER_YEAR)
+        barrier = np.abs(barrier)[:, None, None]
+
+        jump_comp = self.jump_intensity * (math.exp(self.jump_mean + 0.5 * self.jump_std**2) - 1.0)
+        drift = ((r - 0.5 * sigma**2 - jump_comp) * dt)[:, None, None]
+        vol = (sigma * math.sqrt(dt))[:, None, None]
+        bridge_var = (sigma**2 * dt)[:, None, None]
+
+        draws = 2 if self.antithetic else 1
+        count, total, total_sq = np.zeros(m), np.zeros(m), np.zeros(m)
+        stderr = np.full(m, np.inf)
+        active = np.arange(m) # Markets still short of target_se
+        while len(active):
+            pairs = max(1, min(self.chunk_paths // draws, self.max_cells // (len(active) * n)))
+            batch = min(pairs, math.ceil((self.max_paths - count[active[0]] * draws) / draws))
+            Z = rng.standard_normal((batch, n))
+            jumps = 0.0
+            if self.jump_intensity > 0:
+                N = rng.poisson(self.jump_intensity * dt, (batch, n))
+                jumps = sign[active] * (N * self.jump_mean + np.sqrt(N) * self.jump_std * rng.standard_normal((batch, n)))[None]
+
+            estimate = np.zeros((len(active), batch))
+            for z in ((Z, -Z) if self.antithetic else (Z,)):
+                diffusion = sign[active] * (drift[active] + vol[active] * z[None])
+                estimate += self._touched(diffusion, jumps, barrier[active], bridge_var[active])
+            estimate /= draws
+
+            count[active] += batch
+            total[active] += estimate.sum(axis=1)
+            total_sq[active] += (estimate**2).sum(axis=1)
+            c = count[active]
+            mean = total[active] / c
+            stderr[active] = np.sqrt(np.maximum(total_sq[active] / c - mean**2, 0.0) / np.maximum(c - 1, 1))
+
+            done = c * draws >= self.max_paths
+            if self.target_se is not None:
+                done |= (c * draws >= self.min_paths) & (stderr[active] <= self.target_se)
+            active = active[~done]
+        return total / count, stderr
+
+    def _touched(self, diffusion, jumps, barrier, bridge_var):
+        """Per-path touch estimate (markets, paths): 1 if a node reaches the barrier, else the bridge crossing probability"""
+        path = np.cumsum(diffusion + jumps, axis=2)
+        before_jump = path - jumps if self.jump_intensity > 0 else path
+        hit = (path >= barrier).any(axis=2)
+        if before_jump is not path:
+            hit |= (before_jump >= barrier).any(axis=2)
+        if not self.bridge:
+            return hit.astype(float)
+
+        # P(max of the bridge between a step's endpoints >= barrier); nodes past the barrier are hits already
+        gap1 = np.maximum(barrier - before_jump, 0.0)
+        gap0 = np.maximum(barrier - (before_jump - diffusion), 0.0) # Step start points (0 for the first step)
+        with np.errstate(over="ignore"):
+            cross = np.exp(gap0 * gap1 * (-2.0 / bridge_var))
+        return np.where(hit, 1.0, 1.0 - np.prod(1.0 - cross, axis=2))
@@ -0,0 +1,155 @@
+import numpy as np
+
+class OptionChainIndex:
+    """
+    Pre-sorted view of a Deribit option chain (output of get_option_chain_summary).
+    Built once per chain so per-market lookups ("next expiry >= date",
+    "nearest strike", "bracketing strikes") are searchsorted calls
+    instead of DataFrame scans.
+    """
+
+    NUMERIC_COLUMNS = ["strike", "mark_price", "bid", "ask", "mark_iv", "underlying_price", "open_interest", "volume_usd"]
+
+    def __init__(self, chain):
+        self.chain = chain
+        self.expiries = np.array([], dtype=object)
+        self._slices = {}
+        self._positions = None # instrument -> [(slice key, row)], built on first update_quote
+        self.version = 0 # Bumped by update_quote so derived objects (VolSurface) know to refit
+
+        if chain is None or chain.empty:
+            return
+
+        import pandas as pd
+
+        df = chain[chain["expiry"].notna()].sort_values(["expiry", "strike"], kind="mergesort")
+        if df.empty:
+            return
+
+        columns = {}
+        for col in self.NUMERIC_COLUMNS:
+            if col in df:
+                columns[col] = pd.to_numeric(df[col], errors="coerce").to_numpy(dtype=float, copy=True)
+        columns["instrument"] = df["instrument"].to_numpy(dtype=object)
+        columns["type"] = df["type"].to_numpy(dtype=object)
+
+        self._build(columns, df["expiry"].astype(str).to_numpy(dtype=object))
+
+    @classmethod
+    def from_columns(cls, columns, expiry_col):
+        """Index over column arrays already sorted by (expiry, strike), without a DataFrame (chain is None)"""
+        index = cls(None)
+        index._build(columns, np.asarray(expiry_col, dtype=object))
+        return index
+
+    def _build(self, columns, expiry_col):
+        self._columns = columns
+        self._expiry_col = expiry_col
+
+        # Expiries are YYYY-MM-DD strings, so lexical order == chronological order
+        self.expiries, starts = np.unique(expiry_col, return_index=True)
+        ends = np.append(starts[1:], len(expiry_col))
+
+        for expiry, start, end in zip(self.expiries, starts, ends):
+            segment = {col: values[start:end] for col, values in columns.items()}
+            self._slices[(expiry, None)] = segment
+            for opt_type in ("call", "put"):
+                mask = segment["type"] == opt_type
+                self._slices[(expiry, opt_type)] = {col: values[mask] for col, values in segment.items()}
+
+    @property
+    def empty(self):
+        return len(self.expiries) == 0
+
+    def sorted_columns(self):
+        """(columns, expiry) arrays of the whole chain in index order; from_columns rebuilds the index"""
+        if self.empty:
+            return {}, np.array([], dtype=object)
+        return self._columns, self._expiry_col
+
+    def next_expiry(self, expiry):
+        """First listed expiry on or after `expiry` (YYYY-MM-DD), or None"""
+        i = np.searchsorted(self.expiries, expiry, side="left")
+        if i >= len(self.expiries):
+            return None
+        return self.expiries[i]
+
+    def strikes(self, expiry, opt_type=None):
+        """Sorted strike array for an expiry (opt_type None = calls and puts together)"""
+        segment = self._slices.get((expiry, opt_type))
+        if segment is None:
+            return np.array([], dtype=float)
+        return segment["strike"]
+
+    def columns(self, expiry, opt_type=None):
+        """Column arrays of the (expiry, opt_type) slice, sorted by strike"""
+        return self._slices.get((expiry, opt_type), {})
+
+    def row(self, expiry, opt_type, i):
+        """Row `i` of the (expiry, opt_type) slice as a dict"""
+        segment = self._slices[(expiry, opt_type)]
+        return {col: values[i] for col, values in segment.items()}
+
+    def spot(self, expiry):
+        """Underlying (index/forward) price quoted on the expiry"""
+        segment = self._slices.get((expiry, None))
+        if segment is None or len(segment["strike"]) == 0:
+            return None
+        spot = segment["underlying_price"][0]
+        return None if np.isnan(spot) else spot
+
+    def nearest(self, expiry, strike, opt_type=None):
+        """Option with the strike closest to `strike` (ties go to the lower strike)"""
+        strikes = self.strikes(expiry, opt_type)
+        if len(strikes) == 0:
+            return None
+        i = np.searchsorted(strikes, strike, side="left")
+        if i == len(strikes):
+            i -= 1
+        elif i > 0 and (strike - strikes[i - 1]) <= (strikes[i] - strike):
+            i -= 1
+        return self.row(expiry, opt_type, i)
+
+    def bracket(self, expiry, strike, opt_type="call"):
+        """
+        Strikes bracketing K: (last option with strike <= K, first option with strike > K).
+        Either side is None when missing.
+        """
+        strikes = self.strikes(expiry, opt_type)
+        i = np.searchsorted(strikes, strike, side="right")
+        lower = self.row(expiry, opt_type, i - 1) if i > 0 else None
+        upper = self.row(expiry, opt_type, i) if i < len(strikes) else None
+        return lower, upper
+
+    def _instrument_positions(self, instrument):
+        if self._positions is None:
+            self._positions = {}
+            for key, segment in self._slices.items():
+                for i, name in enumerate(segment["instrument"]):
+                    self._positions.setdefault(name, []).append((key, i))
+        return self._positions.get(instrument)
+
+    def quote(self, instrument):
+        """Current numeric fields of one instrument, or None if it is not in the index"""
+        positions = self._instrument_positions(instrument)
+        if not positions:
+            return None
+        key, i = positions[0]
+        return {col: values[i] for col, values in self._slices[key].items() if col in self.NUMERIC_COLUMNS}
+
+    def update_quote(self, instrument, values):
+        """
+        Overwrite numeric fields (bid, ask, mark_iv, ...) of one instrument in place.
+        Returns the instrument's expiry, or None if it is not in the index.
+        """
+        positions = self._instrument_positions(instrument)
+        if not positions:
+            return None
+        for key, i in positions:
+            segment = self._slices[key]
+            for col, value in values.items():
+                # Strikes define the sort order and are never updated
+                if col != "strike" and col in segment and col in self.NUMERIC_COLUMNS:
+                    segment[col][i] = np.nan if value is None else value
+        self.version += 1
+        return positions[0][0][0]
@@ -0,0 +1,131 @@
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from option_chain_index import OptionChainIndex
+
+STRING_COLUMNS = ["instrument", "type"]
+
+class SharedChainIndex:
+    """
+    An OptionChainIndex's sorted columns copied once into a shared memory
+    block (one record array). Workers attach by name and rebuild the index
+    from the shared columns, so the chain is never pickled per task.
+    """
+
+    def __init__(self, index):
+        columns, expiry = index.sorted_columns()
+        fields = [(col, "f8") for col in OptionChainIndex.NUMERIC_COLUMNS if col in columns]
+        strings = {col: columns[col] for col in STRING_COLUMNS if col in columns}
+        strings["expiry"] = expiry
+        for col, values in strings.items():
+            fields.append((col, f"S{max([1] + [len(v) for v in values])}"))
+
+        dtype = np.dtype(fields)
+        n = len(expiry)
+        self.shm = shared_memory.SharedMemory(create=True, size=max(1, n * dtype.itemsize))
+        table = np.ndarray(n, dtype=dtype, buffer=self.shm.buf)
+        for col, _ in fields:
+            table[col] = strings[col] if col in strings else columns[col]
+        del table # Release the buffer export so close() can succeed
+
+        self.handle = (self.shm.name, n, dtype)
+
+    def close(self):
+        self.shm.close()
+        self.shm.unlink()
+
+def attach_chain_index(handle):
+    """(shared memory, OptionChainIndex) for a SharedChainIndex handle; keep the block open while the index is used"""
+    name, n, dtype = handle
+    try:
+        shm = shared_memory.SharedMemory(name=name, track=False) # Python 3.13+: leave the block to its creator
+    except TypeError:
+        # Older versions register the block again, with the resource tracker pool workers share with the parent,
+        # so the creator's unlink still releases it exactly once
+        shm = shared_memory.SharedMemory(name=name)
+
+    table = np.ndarray(n, dtype=dtype, buffer=shm.buf)
+    columns = {}
+    for col in dtype.names:
+        if dtype[col].kind == "S":
+            columns[col] = table[col].astype(str).astype(object)
+        else:
+            columns[col] = table[col]
+    expiry = columns.pop("expiry")
+    return shm, OptionChainIndex.from_columns(columns, expiry)
+
+# Per-worker state, set by _init_worker
+_worker_replicator = None
+_worker_blocks = []
+
+def _init_worker(handles, now, currencies, risk_free_rate, spread_optimizer, touch_pricer, instrumented):
+    global _worker_replicator
+    from instrumentation import Instrumentation
+    from touch_replicator import TouchReplicator
+    replicator = TouchReplicator(clock=lambda: now, currencies=currencies, spread_optimizer=spread_optimizer,
+                                 touch_pricer=touch_pricer, instrumentation=Instrumentation(enabled=instrumented))
+    replicator.risk_free_rate = risk_free_rate
+    for asset, handle in handles.items():
+        shm, index = attach_chain_index(handle)
+        _worker_blocks.append(shm)
+        replicator.use_chain_index(asset, index)
+    _worker_replicator = replicator
+
+def _price_chunk(chunk):
+    """(scan results, the chunk's metrics as Instrumentation.raw_state())"""
+    metrics = _worker_replicator.metrics
+    metrics.reset()
+    return _worker_replicator.price_markets(chunk), metrics.raw_state()
+
+class ParallelPricer:
+    """
+    Prices large market lists on a process pool.
+
+    Each asset's chain index is placed in shared memory once per call;
+    workers attach to it in their initializer. Markets are split into
+    chunks in input order, and the per-chunk results are concatenated in
+    the same order before the stable sort by edge, so the output matches
+    TouchReplicator.price_markets exactly. Each chunk's stage timings,
+    latency samples and skip counts are merged into the replicator's
+    Instrumentation, so stages read as summed worker time (more than the
+    wall time with several workers).
+    """
+
+    def __init__(self, workers=4, chunk_size=500, min_markets=2000):
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.min_markets = min_markets # Smaller lists are priced in-process (pool start-up would dominate)
+
+    def price(self, replicator, market_details):
+        if len(market_details) < self.min_markets or self.workers <= 1:
+            return replicator.price_markets(market_details)
+
+        assets = {details.get("asset") or replicator.currencies[0] for details in market_details}
+        shared = {}
+        try:
+            for asset in assets:
+                index = replicator.get_chain_index(asset)
+                if not index.empty:
+                    shared[asset] = SharedChainIndex(index)
+
+            chunks = [market_details[i:i + self.chunk_size] for i in range(0, len(market_details), self.chunk_size)]
+            initargs = (
+                {asset: s.handle for asset, s in shared.items()},
+                replicator.clock(),
+                replicator.currencies,
+                replicator.risk_free_rate,
+                replicator.spread_optimizer,
+                replicator.touch_pricer,
+                replicator.metrics.enabled,
+            )
+            scan_results = []
+            with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker, initargs=initargs) as pool:
+                for chunk_results, metrics in pool.map(_price_chunk, chunks):
+                    scan_results += chunk_results
+                    replicator.metrics.merge(metrics)
+        finally:
+            for s in shared.values():
+                s.close()
+
+        scan_results.sort(key=lambda x: x["edge"], reverse=True)
+        return scan_results
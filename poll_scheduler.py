@@ -0,0 +1,325 @@
+import math
+import time
+from statistics import NormalDist
+from touch_replicator import SECONDS_PER_YEAR, poly_expiry_time
+
+_NORMAL = NormalDist()
+
+CHAIN_ENDPOINT = "get_book_summary_by_currency"
+MARKETS_ENDPOINT = "markets"
+
+class SimulatedClock:
+    """time() / sleep() pair where sleep advances time instantly (simulations against fake APIs)"""
+
+    def __init__(self, start=0.0):
+        self.now = start
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += max(0.0, seconds)
+
+class EndpointLimiter:
+    """
+    Client-side request budget for one endpoint: a token bucket (`rate`
+    requests per second, bursts of up to `burst`) plus exponential backoff
+    after errors (backoff, 2 * backoff, ... up to max_backoff seconds,
+    reset by the next success).
+    """
+
+    def __init__(self, rate, burst, backoff=2.0, max_backoff=300.0, clock=time.monotonic):
+        self.rate = rate
+        self.burst = burst
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.clock = clock
+        self.tokens = float(burst)
+        self.updated = clock()
+        self.blocked_until = -math.inf # Error backoff: no requests before this time
+        self.failures = 0 # Consecutive errors
+        self.requests = 0
+        self.errors = 0
+
+    def _refill(self):
+        now = self.clock()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        return now
+
+    def ready_at(self, cost=1):
+        """Earliest clock time `cost` requests may be sent"""
+        now = self._refill()
+        cost = min(cost, self.burst)
+        return max(self.blocked_until, now + max(0.0, cost - self.tokens) / self.rate)
+
+    def acquire(self, cost=1):
+        """Spend `cost` requests if the endpoint is open and has them now"""
+        now = self._refill()
+        cost = min(cost, self.burst)
+        if now < self.blocked_until or self.tokens < cost - 1e-9:
+            return False
+        self.tokens -= cost
+        self.requests += cost
+        return True
+
+    def success(self):
+        self.failures = 0
+
+    def failure(self):
+        self.failures += 1
+        self.errors += 1
+        self.blocked_until = self.clock() + min(self.max_backoff, self.backoff * 2 ** (self.failures - 1))
+
+class PollScheduler:
+    """
+    Adaptive polling for a TouchReplicator. Instead of full scans at a fixed
+    cadence, each market's Yes price is re-fetched on its own interval and
+    each asset's chain as often as its most urgent market needs, within
+    client-side rate limits per endpoint.
+
+    A market's interval is the time its edge needs to move `target_move` of
+    its distance to the signal threshold. The touch probability moves by
+    about 2 phi(z) sqrt(dt / T) over dt (z: standard deviations to the strike
+    over the remaining life T, implied by bs_prob), so
+        interval = T * (target_move * |edge - threshold| / (2 phi(z)))^2
+    clipped to [min_interval, max_interval]: markets near expiry or near the
+    threshold are polled often, far-dated and deep out-of-the-money ones
+    rarely. When requests run short the most overdue markets (age / interval)
+    go first, batch_size ids per Gamma request, and a request with spare ids
+    takes the next most overdue markets along. A discovery pass over every
+    page of active markets runs every discovery_interval to pick up new ones.
+
+    Errors (an empty chain, a failed request) back the endpoint off.
+    clock/sleep default to time.monotonic/time.sleep; with a SimulatedClock
+    and fake connectors a day of polling runs in seconds.
+    """
+
+    # Client-side limits by endpoint (names as in ResponseCache.DEFAULT_TTLS): (requests per second, burst)
+    RATE_LIMITS = {
+        CHAIN_ENDPOINT: (1.0, 5),
+        MARKETS_ENDPOINT: (2.0, 10),
+    }
+
+    def __init__(self, replicator, threshold=0.10, target_move=0.25, min_interval=10.0, max_interval=900.0,
+                 discovery_interval=600.0, batch_size=50, rate_limits=None, clock=None, sleep=None,
+                 on_update=None, on_snapshot=None):
+        self.replicator = replicator
+        self.threshold = threshold # Edge that signals (scan prints SIGNAL above 0.10)
+        self.target_move = target_move # Fraction of the distance to the threshold the edge may move unseen
+        self.min_interval = min_interval # Seconds; above the HTTP cache's chain TTL (10 s), which serves anything fresher
+        self.max_interval = max_interval
+        self.discovery_interval = discovery_interval
+        self.batch_size = batch_size # Market ids per Gamma request
+        self.clock = clock or time.monotonic
+        self.sleep = sleep or time.sleep
+        self.on_update = on_update # callback(re-priced results), e.g. ResultsBoard.upsert
+        self.on_snapshot = on_snapshot # callback(every result) after a discovery pass, e.g. ResultsBoard.publish
+        limits = dict(self.RATE_LIMITS, **(rate_limits or {}))
+        self.limiters = {endpoint: EndpointLimiter(rate, burst, clock=self.clock) for endpoint, (rate, burst) in limits.items()}
+        self.markets = {} # market id -> parsed details
+        self.results = {} # market id -> latest result
+        self.intervals = {} # market id -> seconds between price polls
+        self.polled = {} # market id -> clock time of its last price
+        self.chain_polled = {} # asset -> clock time of its last chain
+        self.discovered = None # Clock time of the last discovery pass
+
+    def market_asset(self, market_id):
+        return self.markets[market_id].get("asset") or self.replicator.currencies[0]
+
+    def interval(self, market_id):
+        """Seconds between price polls of a market (max_interval while it has no price)"""
+        result = self.results.get(market_id)
+        if result is None:
+            return self.max_interval
+        p, edge = result["bs_prob"], result["edge"]
+        if not (math.isfinite(p) and math.isfinite(edge)):
+            return self.min_interval
+        T = self.replicator.years_until(poly_expiry_time(self.markets[market_id]))
+        p = min(max(p, 1e-12), 1.0)
+        sensitivity = 2.0 * _NORMAL.pdf(_NORMAL.inv_cdf(1.0 - 0.5 * p)) # d prob / d z
+        seconds = T * SECONDS_PER_YEAR * (self.target_move * abs(edge - self.threshold) / sensitivity) ** 2
+        return min(max(seconds, self.min_interval), self.max_interval)
+
+    def chain_interval(self, asset):
+        """Seconds between chain polls of an asset: its most urgent market's interval"""
+        intervals = [self.intervals[i] for i in self.markets if self.market_asset(i) == asset]
+        return min(intervals, default=self.max_interval)
+
+    def discovery_cost(self):
+        """Gamma requests one discovery pass spends (pages of active markets)"""
+        scanner = self.replicator.poly_scanner
+        cap, page_size = getattr(scanner, "max_markets", None), getattr(scanner, "page_size", None)
+        return max(1, math.ceil(cap / page_size)) if cap and page_size else 1
+
+    def due_chains(self, now):
+        """Assets whose chain is due, most overdue first"""
+        due = []
+        for asset in self.replicator.currencies:
+            last = self.chain_polled.get(asset)
+            overdue = math.inf if last is None else (now - last) / self.chain_interval(asset)
+            if overdue >= 1.0:
+                due.append((overdue, asset))
+        return [asset for _, asset in sorted(due, reverse=True)]
+
+    def due_batches(self, now):
+        """Gamma id batches covering every due market, most overdue first; the last batch is topped up"""
+        ranked = sorted(self.markets, key=lambda i: (now - self.polled[i]) / self.intervals[i], reverse=True)
+        n_due = sum(1 for i in ranked if now - self.polled[i] >= self.intervals[i])
+        ranked = ranked[:math.ceil(n_due / self.batch_size) * self.batch_size]
+        return [ranked[i:i + self.batch_size] for i in range(0, len(ranked), self.batch_size)]
+
+    def poll(self):
+        """Send every fetch that is due and within its endpoint's budget. Returns the number of requests."""
+        now = self.clock()
+        sent = 0
+        for asset in self.due_chains(now):
+            if not self.limiters[CHAIN_ENDPOINT].acquire(): break
+            sent += 1
+            self.refresh_chain(asset)
+
+        markets = self.limiters[MARKETS_ENDPOINT]
+        if self.discovered is None or now - self.discovered >= self.discovery_interval:
+            cost = self.discovery_cost()
+            if markets.acquire(cost):
+                sent += cost
+                self.discover()
+
+        for batch in self.due_batches(self.clock()):
+            if not markets.acquire(): break
+            sent += 1
+            self.refresh_prices(batch)
+        return sent
+
+    def next_wakeup(self):
+        """Clock time at which the next fetch is due and its endpoint open"""
+        chain_limiter, markets_limiter = self.limiters[CHAIN_ENDPOINT], self.limiters[MARKETS_ENDPOINT]
+        times = []
+        for asset in self.replicator.currencies:
+            last = self.chain_polled.get(asset)
+            due = -math.inf if last is None else last + self.chain_interval(asset)
+            times.append(max(due, chain_limiter.ready_at()))
+        due = -math.inf if self.discovered is None else self.discovered + self.discovery_interval
+        times.append(max(due, markets_limiter.ready_at(self.discovery_cost())))
+        if self.markets:
+            due = min(self.polled[i] + self.intervals[i] for i in self.markets)
+            times.append(max(due, markets_limiter.ready_at()))
+        return min(times)
+
+    def run(self, duration=None, max_requests=None, stop=None):
+        """
+        Poll until `duration` seconds have passed, max_requests have been sent,
+        or `stop` (threading.Event, waited on in real time) is set. Returns the requests sent.
+        """
+        end = None if duration is None else self.clock() + duration
+        sent = 0
+        while stop is None or not stop.is_set():
+            n = self.poll()
+            sent += n
+            if max_requests is not None and sent >= max_requests:
+                break
+            now = self.clock()
+            wake = self.next_wakeup()
+            if end is not None and wake >= end:
+                self.wait(end - now, stop)
+                break
+            self.wait(max(wake - now, 0.0 if n else 1e-3), stop) # Never spin when nothing could be sent
+        return sent
+
+    def wait(self, seconds, stop=None):
+        if stop is None:
+            self.sleep(max(0.0, seconds))
+        else:
+            stop.wait(max(0.0, seconds))
+
+    def reprice(self, market_ids):
+        """Price markets against the loaded chains; refreshes their results and intervals"""
+        market_ids = list(market_ids)
+        priced = self.replicator.price_markets([self.markets[i] for i in market_ids])
+        for i in market_ids:
+            self.results.pop(i, None)
+        for r in priced:
+            self.results[r["id"]] = r
+        for i in market_ids:
+            self.intervals[i] = self.interval(i)
+        return priced
+
+    def notify(self, priced):
+        if priced and self.on_update:
+            self.on_update(priced)
+
+    def refresh_chain(self, asset):
+        limiter = self.limiters[CHAIN_ENDPOINT]
+        try:
+            chain = self.replicator.deribit_connectors[asset].get_option_chain_summary()
+        except Exception as e:
+            print(f"Error fetching {asset} chain: {e}")
+            chain = None
+        if chain is None or chain.empty:
+            limiter.failure()
+            return []
+        limiter.success()
+        self.replicator.set_chain(asset, chain)
+        self.chain_polled[asset] = self.clock()
+        priced = self.reprice([i for i in self.markets if self.market_asset(i) == asset])
+        self.notify(priced)
+        return priced
+
+    def discover(self):
+        """Full pass over the active markets: new markets join, closed ones leave"""
+        limiter = self.limiters[MARKETS_ENDPOINT]
+        try:
+            details = self.replicator.fetch_market_details()
+        except Exception as e:
+            print(f"Error discovering markets: {e}")
+            details = []
+        if not details:
+            limiter.failure()
+            return []
+        limiter.success()
+        now = self.discovered = self.clock()
+        self.markets = {d["id"]: d for d in details}
+        self.results, self.intervals = {}, {}
+        self.polled = {i: now for i in self.markets}
+        priced = self.reprice(self.markets)
+        priced.sort(key=lambda x: x["edge"], reverse=True)
+        if self.replicator.sink:
+            self.replicator.sink.write(priced, self.replicator.clock())
+        if self.on_snapshot:
+            self.on_snapshot(priced)
+        return priced
+
+    def refresh_prices(self, market_ids):
+        limiter = self.limiters[MARKETS_ENDPOINT]
+        scanner = self.replicator.poly_scanner
+        try:
+            markets = scanner.fetch_markets_by_id(market_ids)
+        except Exception as e:
+            print(f"Error fetching Polymarket prices: {e}")
+            markets = None
+        if markets is None:
+            limiter.failure()
+            return []
+        limiter.success()
+        now = self.clock()
+        for m in markets:
+            details = scanner.parse_market_details(m)
+            if details and details["id"] in self.markets:
+                self.markets[details["id"]] = details
+        for i in market_ids:
+            self.polled[i] = now # Ids missing from the reply (closed) wait for the next discovery pass
+        priced = self.reprice(market_ids)
+        self.notify(priced)
+        return priced
+
+    def stats(self):
+        """Requests and errors per endpoint, and the age of the known Yes prices (seconds)"""
+        now = self.clock()
+        ages = [now - t for t in self.polled.values()]
+        return {
+            "markets": len(self.markets),
+            "requests": {endpoint: limiter.requests for endpoint, limiter in self.limiters.items()},
+            "errors": {endpoint: limiter.errors for endpoint, limiter in self.limiters.items()},
+            "mean_price_age": sum(ages) / len(ages) if ages else None,
+            "max_price_age": max(ages, default=None),
+        }
@@ -1,117 +1,320 @@
+import math
 import requests
-import re
+import json
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from datetime import datetime
-import pandas as pd
-from deribit_connector import DeribitConnector
+from functools import lru_cache
+from http_cache import default_cache
+from record import Record
+from market_classifier import ASSET_ALIASES, TOUCH_KINDS, MarketClassifier
+
+class Opportunity(Record):
+    """One find_arbitrage hit (Poly price vs European spread)"""
+    __slots__ = ("type", "asset", "question", "kind", "direction", "strike", "expiry", "poly_price", "deribit_euro_price", "edge",
+                 "deribit_expiry", "spread", "rules")
+
+def decode_json_list(raw):
+    """Gamma list fields (outcomePrices, clobTokenIds) arrive JSON-encoded; [] if missing or malformed"""
+    if raw is None:
+        return []
+    try:
+        values = json.loads(raw) if isinstance(raw, str) else raw
+    except ValueError:
+        return []
+    return list(values) if isinstance(values, list) else []
+
+def decode_outcome_prices(raw):
+    """outcomePrices (a JSON-encoded list of strings, or a list) as floats; [] if malformed"""
+    try:
+        return [float(p) for p in decode_json_list(raw)]
+    except (ValueError, TypeError):
+        return []
 
 class PolymarketTouchScanner:
     GAMMA_API_URL = "https://gamma-api.polymarket.com/markets"
+    CLOB_API_URL = "https://clob.polymarket.com"
+
+    ASSET_ALIASES = ASSET_ALIASES # Names a question may use for each underlying (market_classifier.py)
+
+    def __init__(self, gamma_url=None, max_markets=3000, page_size=500, fetch_workers=4, assets=("BTC",), parse_cache_size=10000, http=None, clob_url=None, deribit=None):
+        self.parse_cache_size = parse_cache_size # Parsed markets (and classified questions) kept in the LRU caches
+        self.set_assets(assets)
+        # Only find_arbitrage needs chains: one connector per asset, built on first use (`deribit` serves the first asset)
+        self.deribit_connectors = {} if deribit is None else {self.assets[0]: deribit}
+        self.option_chains = {} # asset -> Deribit chain DataFrame, fetched by find_arbitrage
+        self.gamma_url = gamma_url or self.GAMMA_API_URL
+        self.clob_url = clob_url or self.CLOB_API_URL
+        self.max_markets = max_markets # None = fetch until the API runs out of pages
+        self.page_size = page_size
+        self.fetch_workers = fetch_workers
+        self.http = http or default_cache() # Shared on-disk response cache (see http_cache.py)
+
+        # One keep-alive session shared by all page fetches
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=max(1, fetch_workers))
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def deribit_for(self, asset):
+        """Deribit connector of one scanned asset"""
+        if asset not in self.deribit_connectors:
+            from deribit_connector import DeribitConnector
+            self.deribit_connectors[asset] = DeribitConnector(asset, http=self.http)
+        return self.deribit_connectors[asset]
+
+    def set_assets(self, assets):
+        """Underlyings to scan for (keys of ASSET_ALIASES)"""
+        self.assets = tuple(assets)
+        self.classifier = MarketClassifier(self.assets, self.ASSET_ALIASES)
+        # One classification per question, shared by the market filter and the parser
+        self.classify = lru_cache(maxsize=self.parse_cache_size)(self.classifier.classify)
+        self.clear_parse_cache() # Cached entries carry the detected asset
+
+    def clear_parse_cache(self):
+        self.parse_cache = OrderedDict() # (id, updatedAt) -> static parsed fields, or None if unparseable
+        self.parse_cache_hits = 0
+        self.parse_cache_misses = 0
 
-    def __init__(self):
-        self.deribit = DeribitConnector("BTC")
-        self.option_chain = pd.DataFrame()
+    def parse_cache_stats(self):
+        return {"hits": self.parse_cache_hits, "misses": self.parse_cache_misses, "size": len(self.parse_cache)}
+
+    def detect_asset(self, question):
+        """First scanned asset named in the question, or None"""
+        c = self.classify(question)
+        return c.asset if c else None
+
+    def is_touch_market(self, market):
+        """Question-level filter: one-strike touch (up or down) or above/below markets on the scanned assets"""
+        c = self.classify(market.get("question", ""))
+        return c is not None and c.kind in TOUCH_KINDS and c.strike is not None
+
+    def fetch_market_page(self, offset, limit):
+        """Fetch one page of active markets. Returns a list, or None on error."""
+        params = {
+            "active": "true",
+            "closed": "false",
+            "limit": limit,
+            "offset": offset,
+            "order": "volume24hr",
+            "ascending": "false"
+        }
+        try:
+            resp = self.http.get(self.gamma_url, params=params, timeout=30, session=self.session)
+            return resp.json()
+        except Exception as e:
+            print(f"Error fetching Polymarket: {e}")
+            return None
+
+    def fetch_markets_by_id(self, market_ids):
+        """Current Gamma rows of specific markets, one request for the batch. Returns a list, or None on error."""
+        params = {"id": list(market_ids), "limit": len(market_ids)}
+        try:
+            resp = self.http.get(self.gamma_url, params=params, timeout=30, session=self.session)
+            markets = resp.json()
+        except Exception as e:
+            print(f"Error fetching Polymarket markets by id: {e}")
+            return None
+        return markets if isinstance(markets, list) else None
+
+    def get_order_books(self, token_ids):
+        """
+        L2 books for several outcome tokens in one CLOB /books request.
+        Returns {token_id: {"bids": [[price, size], ...] best first, "asks": ...}}; {} on error.
+        """
+        try:
+            resp = self.session.post(f"{self.clob_url}/books", json=[{"token_id": t} for t in token_ids], timeout=30)
+            books = resp.json()
+        except Exception as e:
+            print(f"Error fetching Polymarket books: {e}")
+            return {}
+
+        result = {}
+        for book in books if isinstance(books, list) else []:
+            levels = {}
+            for side, descending in (("bids", True), ("asks", False)):
+                side_levels = [[float(level["price"]), float(level["size"])] for level in book.get(side) or []]
+                levels[side] = sorted(side_levels, key=lambda level: level[0], reverse=descending)
+            result[book.get("asset_id")] = levels
+        return result
+
+    def iter_polymarket_touch_markets(self):
+        """
+        Generator over active 'Touch' markets.
+        Pages are fetched concurrently (at most `fetch_workers` in flight) and
+        filtered as they arrive, so only matching markets are kept.
+        Markets are yielded in page-arrival order.
+        """
+        limit = self.page_size
+        cap = self.max_markets
+        next_offset = 0
+        end_offset = None # No pages are requested at or past this offset
+        fetched = 0
+        pending = {}
+
+        print("Fetching ALL Polymarket active markets...")
+
+        pool = ThreadPoolExecutor(max_workers=max(1, self.fetch_workers))
+        try:
+            while True:
+                # Keep the pool full until we hit the cap or the last page
+                while len(pending) < self.fetch_workers:
+                    if end_offset is not None and next_offset >= end_offset: break
+                    if cap is not None and next_offset >= cap: break
+                    page_limit = limit if cap is None else min(limit, cap - next_offset)
+                    pending[pool.submit(self.fetch_market_page, next_offset, page_limit)] = (next_offset, page_limit)
+                    next_offset += page_limit
+
+                if not pending: break
+
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    offset, page_limit = pending.pop(future)
+                    batch = future.result()
+                    if not batch or len(batch) < page_limit:
+                        # Short, empty or failed page: nothing beyond it
+                        last = offset + len(batch or [])
+                        end_offset = last if end_offset is None else min(end_offset, last)
+                    if not batch: continue
+
+                    fetched += len(batch)
+                    print(f"Fetched {fetched} markets...", end='\r')
+                    for m in batch:
+                        if self.is_touch_market(m):
+                            yield m
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+        print(f"\nTotal Markets Fetched: {fetched}")
 
     def fetch_polymarket_touch_markets(self):
         """Fetch active 'Touch' markets from Polymarket with pagination"""
-        markets = []
-        offset = 0
-        limit = 500
-        
-        print("Fetching ALL Polymarket active markets...")
-        
-        while True:
-            params = {
-                "active": "true",
-                "closed": "false",
-                "limit": limit,
-                "offset": offset,
-                "order": "volume24hr",
-                "ascending": "false"
-            }
-            try:
-                resp = requests.get(self.GAMMA_API_URL, params=params)
-                batch = resp.json()
-                if not batch: break
-                markets.extend(batch)
-                offset += limit
-                print(f"Fetched {len(markets)} markets...", end='\r')
-                if len(markets) >= 3000: break # Increased limit for long-tail
-            except Exception as e:
-                print(f"Error fetching Polymarket: {e}")
-                break
-        
-        print(f"\nTotal Markets Fetched: {len(markets)}")
-        
-        touch_markets = []
-        for m in markets:
-            question = m.get("question", "")
-            # Filter for "What price will Bitcoin hit in February 2026?"
-            if "What price will Bitcoin hit in February 2026?" in question:
-                touch_markets.append(m)
-            # Or general pattern
-            elif ("BTC" in question or "Bitcoin" in question) and ("hit" in question or "reach" in question or "above" in question):
-                touch_markets.append(m)
-        
-        return touch_markets
+        return list(self.iter_polymarket_touch_markets())
 
     def parse_market_details(self, market):
-        """Extract Strike and Expiry from market question/description"""
+        """
+        Extract Strike and Expiry from market question/description, plus the current Yes price.
+        Static fields are cached per (id, updatedAt); only the price is decoded on a hit.
+        """
+        key = (market.get("id"), market.get("updatedAt"))
+        if key[0] is None:
+            static = self.parse_static_details(market)
+        elif key in self.parse_cache:
+            self.parse_cache_hits += 1
+            self.parse_cache.move_to_end(key)
+            static = self.parse_cache[key]
+        else:
+            self.parse_cache_misses += 1
+            static = self.parse_static_details(market)
+            self.parse_cache[key] = static
+            if len(self.parse_cache) > self.parse_cache_size:
+                self.parse_cache.popitem(last=False)
+
+        if static is None:
+            return None
+
+        # Get Current Price of "Yes"
+        prices = decode_outcome_prices(market.get("outcomePrices"))
+        yes_price = prices[0] if prices else 0.0 # Assuming Yes is first
+
+        details = dict(static)
+        details["poly_price"] = yes_price
+        return details
+
+    def parse_static_details(self, market):
+        """Fields of a market that do not change between scans (strike, expiry, asset, kind, url, tokens)"""
         question = market.get("question", "")
-        description = market.get("description", "")
         end_date_iso = market.get("endDate") # ISO format: 2024-02-29T23:59:00Z
-        
-        # Default strike parsing for "Will BTC hit $X"
-        strike_match = re.search(r'\$([\d,]+)', question)
-        strike = float(strike_match.group(1).replace(",", "")) if strike_match else None
-        
-        # Special parsing for "What price will Bitcoin hit in February 2026?"
-        # The market might be a Group market where outcomes are strikes ($100k, $120k).
-        # OR it might be individual markets: "Will Bitcoin hit $100k in Feb 2026?"
-        # The user linked a Group market. Polymarket API returns Group markets differently.
-        # If it's a Group Market, outcomes might be ["$100k", "$120k", "No Touch"].
-        # But usually Group Markets are split into individual "Binary Markets" in the API list.
-        # So we might see "Will Bitcoin hit $100k in Feb 2026?" as a separate item.
-        
-        # Let's check if the strike is in the outcome name if not in question
-        if strike is None:
-             # Check outcomes
-             pass
-
-        if not strike:
+
+        # Strike, asset and touch direction from the question ($100,000 / $100k / dip to ...);
+        # range, multi-strike and strike-less questions are not single-strike markets
+        c = self.classify(question)
+        if c is None or c.kind not in TOUCH_KINDS or not c.strike:
             return None
-        
+
         # Extract Expiry Date
         if end_date_iso:
             try:
-                expiry = datetime.fromisoformat(end_date_iso.replace("Z", "+00:00")).strftime("%Y-%m-%d")
+                end_date = datetime.fromisoformat(end_date_iso.replace("Z", "+00:00"))
+                expiry = end_date.strftime("%Y-%m-%d")
             except ValueError:
                 return None
         else:
             return None
 
-        # Get Current Price of "Yes"
-        try:
-            prices = eval(market.get("outcomePrices", "[]"))
-            yes_price = float(prices[0]) # Assuming Yes is first
-        except:
-            yes_price = 0.0
-
         return {
             "id": market.get("id"),
+            "asset": c.asset,
             "question": question,
-            "strike": strike,
+            "strike": c.strike,
+            "kind": c.kind, # 'touch' or 'above' (finishing above/below on the date)
+            "direction": c.direction, # 'up' or 'down'
+            "window": c.window,
             "expiry": expiry,
-            "poly_price": yes_price,
-            "url": f"https://polymarket.com/event/{market.get('slug')}"
+            "expiry_time": end_date.timestamp() if end_date.tzinfo else None, # POSIX end time; naive endDates fall back to the expiry date
+            "url": f"https://polymarket.com/event/{market.get('slug')}",
+            "token_ids": decode_json_list(market.get("clobTokenIds")) # CLOB outcome tokens, same order as outcomes (Yes, No)
         }
 
+    def euro_price(self, chain_index, details):
+        """
+        European price of a market from Deribit marks: the vertical spread bracketing its strike
+        on the first expiry on or after the market's, over its width. Calls give P(S_T > K),
+        puts P(S_T < K); the side follows TouchReplicator.market_inputs_batch (a touch of K
+        above spot uses calls, one below spot puts; above/below markets go by their wording).
+        Returns (price, deribit expiry, opt_type, k_lower, k_upper), or None.
+        """
+        strike = details["strike"]
+
+        # If Deribit expires BEFORE Poly, and the price hits after Deribit expires but before
+        # Poly expires, we lose the hedge. So we need Deribit expiry >= Poly expiry.
+        closest_expiry = chain_index.next_expiry(details["expiry"])
+        if closest_expiry is None:
+            return None
+
+        if details.get("kind", "touch") == "touch":
+            spot = chain_index.spot(closest_expiry)
+            if not spot: return None
+            up = strike > spot
+        else:
+            up = details.get("direction", "up") == "up"
+        opt_type = "call" if up else "put"
+
+        # Calls: strike just below (<= K) and just above (> K); puts: just below (< K) and just above (>= K)
+        lower, upper = chain_index.bracket(closest_expiry, strike if up else math.nextafter(strike, -math.inf), opt_type)
+        if lower is None or upper is None:
+            return None
+
+        # Mark prices for the initial scan (Poly price vs theoretical European price)
+        p_lower, p_upper = lower["mark_price"], upper["mark_price"]
+        if p_lower is None or p_upper is None or math.isnan(p_lower) or math.isnan(p_upper):
+            return None
+
+        # Underlying price (Index)
+        index_price = lower.get("underlying_price") or upper.get("underlying_price")
+        if not index_price: return None
+
+        width = upper["strike"] - lower["strike"]
+        if width <= 0: return None
+
+        # Spread value (cost to buy) over width is the binary price
+        spread_value_usd = (p_lower - p_upper if up else p_upper - p_lower) * index_price
+        return spread_value_usd / width, closest_expiry, opt_type, lower["strike"], upper["strike"]
+
     def find_arbitrage(self):
-        """Scan for arbitrage opportunities"""
-        print("Fetching Deribit Option Chain...")
-        self.option_chain = self.deribit.get_option_chain_summary()
-        if self.option_chain.empty:
-            print("Failed to fetch Deribit data.")
-            return
+        """Scan for arbitrage opportunities; returns the Opportunity list it reports"""
+        from option_chain_index import OptionChainIndex # pandas: only needed here, kept off the import path
+        # Each market is priced off its own asset's chain
+        chain_indexes = {}
+        for asset in self.assets:
+            print(f"Fetching Deribit {asset} Option Chain...")
+            self.option_chains[asset] = self.deribit_for(asset).get_option_chain_summary()
+            if self.option_chains[asset].empty:
+                print(f"Failed to fetch Deribit {asset} data.")
+                continue
+            chain_indexes[asset] = OptionChainIndex(self.option_chains[asset])
+        if not chain_indexes:
+            return []
 
         print("Fetching Polymarket Touch Markets...")
         poly_markets = self.fetch_polymarket_touch_markets()
@@ -122,135 +325,55 @@ class PolymarketTouchScanner:
         for m in poly_markets:
             details = self.parse_market_details(m)
             if not details: continue
-            
+
+            chain_index = chain_indexes.get(details["asset"])
+            if chain_index is None: continue
+
+            priced = self.euro_price(chain_index, details)
+            if priced is None: continue
+            euro_binary_price, closest_expiry, opt_type, k_lower, k_upper = priced
+
             strike = details["strike"]
             expiry = details["expiry"]
             poly_price = details["poly_price"]
-            
-            # Find matching Deribit options
-            # We need Call options with Expiry <= Poly Expiry (or close)
-            # Actually, for Touch options, any expiry is valid as long as it covers the period?
-            # No, if Poly expires Feb 28, we need Deribit options expiring ON or AFTER Feb 28 to hedge properly?
-            # Wait. If Deribit expires BEFORE Poly, and BTC hits after Deribit expires but before Poly expires, we lose hedge.
-            # So we need Deribit expiry >= Poly expiry.
-            
-            # Filter chain for matching expiry
-            # Simplified: look for exact date or next available
-            
-            relevant_opts = self.option_chain[self.option_chain["expiry"] >= expiry]
-            if relevant_opts.empty:
-                continue
-                
-            # Sort by expiry to find closest
-            relevant_opts = relevant_opts.sort_values("expiry")
-            closest_expiry = relevant_opts.iloc[0]["expiry"]
-            
-            # Get Calls for closest expiry
-            calls = relevant_opts[(relevant_opts["expiry"] == closest_expiry) & (relevant_opts["type"] == "call")]
-            
-            # Find strikes around target K
-            # We want a vertical spread: Buy Call(K-Width), Sell Call(K+Width)
-            # Or just use the ATM/OTM Call price as a proxy for probability?
-            # A Binary Call probability is approx Delta (N(d2)).
-            # Or simpler: Price of Call Spread / Width.
-            
-            # Let's find strikes closest to K
-            calls = calls.sort_values("strike")
-            
-            # Find strike just below and just above K
-            # We need strictly less than or equal to strike
-            lower_candidates = calls[calls["strike"] <= strike]
-            upper_candidates = calls[calls["strike"] > strike]
-            
-            if lower_candidates.empty or upper_candidates.empty:
-                continue
-                
-            lower_strike = lower_candidates.iloc[-1]
-            upper_strike = upper_candidates.iloc[0]
-            
-            k_lower = lower_strike["strike"]
-            k_upper = upper_strike["strike"]
-            
-            # Use ASK prices if available (conservative execution), else mark
-            # For arbitrage detection, we want to know if Poly (Buy) < Deribit (Sell Spread).
-            # To Sell Spread on Deribit: Sell Lower Call (Bid), Buy Upper Call (Ask).
-            # Cost to enter short spread = Premium Received = Bid_Lower - Ask_Upper.
-            # But here we are comparing Poly Price vs Theoretical European Price.
-            # Let's use Mark Price for initial scan.
-            
-            p_lower_btc = lower_strike["mark_price"]
-            p_upper_btc = upper_strike["mark_price"]
-            
-            # Handle potential None values
-            if p_lower_btc is None or p_upper_btc is None:
-                continue
-                
-            # Underlying price (Index)
-            index_price = lower_strike.get("underlying_price") or upper_strike.get("underlying_price")
-            if not index_price: continue
-            
-            p_lower_usd = p_lower_btc * index_price
-            p_upper_usd = p_upper_btc * index_price
-            
-            width = k_upper - k_lower
-            if width <= 0: continue
-            
-            # Spread Value (Cost to Buy)
-            spread_value_usd = p_lower_usd - p_upper_usd
-            
-            # Implied Probability (Binary Price)
-            euro_binary_price = spread_value_usd / width
-            
+            kind = details.get("kind", "touch")
+
             # Sanity Check: Price must be between 0 and 1
             if euro_binary_price < 0 or euro_binary_price > 1.05: # Allow small error
                  # If > 1, it implies arbitrage within Deribit itself or bad data
-                 # print(f"DEBUG: {details['question']} - Impossible Price {euro_binary_price:.2f} (Spread: {spread_value_usd:.2f}, Width: {width})")
                  continue
-            
+
             # Compare
-            # Theory: Touch Price (Poly) should be >= European Price (Deribit)
-            # Arbitrage: If Poly < Deribit, it's undervalued (Buy Poly).
-            # Wait. Touch >= European is always true.
-            # So if Poly < European, Poly is DEFINITELY cheap.
-            # Why? Because Touch includes the probability of hitting K and then dropping back. European excludes that.
-            
+            # Touch: Poly (Touch) should be >= European (Deribit), since a touch includes the
+            # probability of hitting K and then moving back. So if Poly < European, Poly is cheap.
+            # Above/below: the market is the European digital itself, so either side can be cheap.
             diff = euro_binary_price - poly_price
-            
+            spread = f"{k_lower}-{k_upper} {opt_type}s"
+
             # Print analysis for all valid comparisons
             print(f"Analyzed: {details['question']}")
-            print(f"  Poly (Touch): {poly_price:.3f} | Deribit (Euro): {euro_binary_price:.3f}")
+            print(f"  Poly ({'Touch' if kind == 'touch' else 'Euro'}): {poly_price:.3f} | Deribit (Euro): {euro_binary_price:.3f}")
             print(f"  Ratio: {poly_price/euro_binary_price if euro_binary_price > 0 else 'inf':.2f}x | Diff: {diff:.3f}")
-            print(f"  Expiry: {expiry} | Strike: {strike} | Spread: {k_lower}-{k_upper}")
+            print(f"  Expiry: {expiry} | Strike: {strike} | Spread: {spread}")
             print("-" * 30)
 
+            fields = dict(asset=details["asset"], question=details["question"], kind=kind, direction=details.get("direction", "up"),
+                          strike=strike, expiry=expiry, poly_price=poly_price,
+                          deribit_euro_price=euro_binary_price, deribit_expiry=closest_expiry, spread=spread)
             if diff > 0.05: # 5% edge (Poly CHEAPER than Euro - Strong Buy)
-                opportunities.append({
-                    "type": "Buy Poly (Undervalued)",
-                    "question": details["question"],
-                    "strike": strike,
-                    "expiry": expiry,
-                    "poly_price": poly_price,
-                    "deribit_euro_price": euro_binary_price,
-                    "edge": diff,
-                    "deribit_expiry": closest_expiry,
-                    "spread": f"{k_lower}-{k_upper}"
-                })
-            elif poly_price > euro_binary_price * 2.5 and euro_binary_price > 0.05:
+                opportunities.append(Opportunity(type="Buy Poly (Undervalued)", edge=diff, **fields))
+            elif kind == "touch" and poly_price > euro_binary_price * 2.5 and euro_binary_price > 0.05:
                 # If Poly is > 2.5x Euro, it might be overpriced (Short Poly?)
                 # Theoretical max for Touch/Euro is ~2.0 (Reflection Principle).
                 # If > 2.0, likely overpriced.
-                opportunities.append({
-                    "type": "Sell Poly (Overpriced)",
-                    "question": details["question"],
-                    "strike": strike,
-                    "expiry": expiry,
-                    "poly_price": poly_price,
-                    "deribit_euro_price": euro_binary_price,
-                    "edge": poly_price - euro_binary_price,
-                    "deribit_expiry": closest_expiry,
-                    "spread": f"{k_lower}-{k_upper}",
-                    "description": m.get("description", "No description")
-                })
+                opportunities.append(Opportunity(
+                    type="Sell Poly (Overpriced)", edge=poly_price - euro_binary_price,
+                    rules=m.get("description", "No description")[:200], # Only the printed part of the rules is kept
+                    **fields))
+            elif kind != "touch" and -diff > 0.05: # Digital priced over the European spread
+                opportunities.append(Opportunity(
+                    type="Sell Poly (Overpriced)", edge=-diff,
+                    rules=m.get("description", "No description")[:200], **fields))
 
         # Report
         print(f"\nFound {len(opportunities)} Interesting Opportunities:")
@@ -258,9 +381,10 @@ class PolymarketTouchScanner:
             print(f"[{op['type']}] {op['question']}")
             print(f"  Poly: ${op['poly_price']:.3f} | Deribit Euro: ${op['deribit_euro_price']:.3f}")
             print(f"  Edge: {op['edge']*100:.1f}% | Strike: {op['strike']} | Spread: {op['spread']}")
-            if op.get("description"):
-                print(f"  Rules: {op['description'][:200]}...") # Truncate description
+            if op.get("rules"):
+                print(f"  Rules: {op['rules']}...")
             print("-" * 50)
+        return opportunities
 
 if __name__ == "__main__":
     scanner = PolymarketTouchScanner()
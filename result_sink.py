@@ -0,0 +1,121 @@
+import os
+import json
+import uuid
+from datetime import datetime
+from record import Record
+
+class ScanResult(Record):
+    """One priced market (TouchReplicator.price_markets output)"""
+    __slots__ = ("id", "asset", "market", "expiry", "strike", "kind", "direction", # kind/direction as priced (see market_inputs_batch)
+                 "poly_prob", "bs_prob", "spread_prob", "iv", "edge", "url", "spread_details", "hedge", "token_ids",
+                 "exec_poly_prob", "exec_ref_prob", "exec_edge", "max_size") # Set by DepthPricer.enrich
+
+# Flat columns written by the sinks: scan_time, the scalar ScanResult fields and the hedge legs
+COLUMNS = ["scan_time", "id", "asset", "market", "expiry", "strike", "poly_prob", "bs_prob", "spread_prob", "iv", "edge",
+           "spread_details", "long_leg", "short_leg", "exec_poly_prob", "exec_ref_prob", "exec_edge", "max_size", "url"]
+STRING_COLUMNS = {"id", "asset", "market", "expiry", "spread_details", "long_leg", "short_leg", "url"}
+
+def flat_row(result, scan_time):
+    """COLUMNS values of one result (NaN -> None)"""
+    hedge = result.get("hedge") or {}
+    legs = dict(zip(("long_leg", "short_leg"), hedge.get("legs") or (None, None)))
+    row = {"scan_time": scan_time}
+    for col in COLUMNS[1:]:
+        value = legs[col] if col in legs else result.get(col)
+        row[col] = None if isinstance(value, float) and value != value else value
+    return row
+
+class ResultSink:
+    """Destination for scan results: write() is called once per scan with that scan's results"""
+
+    def write(self, results, scan_time=None):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+class JsonlSink(ResultSink):
+    """Appends one JSON line per result (COLUMNS, scan_time as ISO text) to a file"""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = None
+
+    def write(self, results, scan_time=None):
+        stamp = (scan_time or datetime.now()).isoformat(timespec="seconds")
+        if self._file is None:
+            self._file = open(self.path, "a")
+        for r in results:
+            self._file.write(json.dumps(flat_row(r, stamp), default=float) + "\n")
+        self._file.flush()
+        return len(results)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+class ParquetSink(ResultSink):
+    """
+    Appends each scan as one Parquet file to a dataset partitioned by scan date:
+    root/scan_date=YYYY-MM-DD/part-<scan time>-<id>.parquet (needs pyarrow).
+    Read it back with load_history(root) or any Hive-partitioned Parquet reader.
+    """
+
+    def __init__(self, root, compression="snappy"):
+        try:
+            import pyarrow
+        except ImportError:
+            raise ImportError("ParquetSink needs pyarrow: pip install pyarrow")
+        self.root = root
+        self.compression = compression
+        fields = [("scan_time", pyarrow.timestamp("s"))]
+        fields += [(col, pyarrow.string() if col in STRING_COLUMNS else pyarrow.float64()) for col in COLUMNS[1:]]
+        self.schema = pyarrow.schema(fields)
+
+    def write(self, results, scan_time=None):
+        import pyarrow
+        import pyarrow.parquet as pq
+
+        if not results:
+            return 0
+        scan_time = (scan_time or datetime.now()).replace(microsecond=0)
+        rows = [flat_row(r, scan_time) for r in results]
+        table = pyarrow.Table.from_pydict({col: [row[col] for row in rows] for col in COLUMNS}, schema=self.schema)
+
+        partition = os.path.join(self.root, f"scan_date={scan_time:%Y-%m-%d}")
+        os.makedirs(partition, exist_ok=True)
+        name = f"part-{scan_time:%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}.parquet"
+        tmp = os.path.join(partition, "." + name)
+        pq.write_table(table, tmp, compression=self.compression)
+        os.replace(tmp, os.path.join(partition, name)) # Readers never see a partial file
+        return len(rows)
+
+def load_history(path, market_id=None, since=None):
+    """
+    Edge history written by a sink as a DataFrame (JSONL file or Parquet dataset directory),
+    optionally for one market id and/or scans at or after `since` (datetime).
+    """
+    import pandas as pd
+
+    if os.path.isdir(path):
+        filters = []
+        if market_id is not None: filters.append(("id", "==", str(market_id)))
+        if since is not None: filters.append(("scan_date", ">=", f"{since:%Y-%m-%d}"))
+        df = pd.read_parquet(path, filters=filters or None)
+    else:
+        chunks = []
+        for chunk in pd.read_json(path, lines=True, chunksize=100_000, precise_float=True, dtype={col: str for col in STRING_COLUMNS}):
+            if market_id is not None: chunk = chunk[chunk["id"] == str(market_id)]
+            chunks.append(chunk)
+        df = pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame(columns=COLUMNS)
+
+    # Same columns and dtypes whichever sink wrote the history
+    df = df.reindex(columns=COLUMNS)
+    for col in COLUMNS[1:]:
+        if col not in STRING_COLUMNS:
+            df[col] = pd.to_numeric(df[col], errors="coerce").astype(float)
+    df["scan_time"] = pd.to_datetime(df["scan_time"]).astype("datetime64[ns]")
+    if since is not None:
+        df = df[df["scan_time"] >= pd.Timestamp(since)]
+    return df.sort_values(["scan_time", "edge"], ascending=[True, False], kind="mergesort").reset_index(drop=True)
@@ -0,0 +1,304 @@
+import json
+import queue
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+# Result fields the board keeps and serves, in row order
+FIELDS = ["id", "asset", "market", "expiry", "strike", "poly_prob", "bs_prob", "spread_prob", "iv", "edge",
+          "spread_details", "exec_edge", "max_size", "url"]
+SORT_KEYS = ("edge", "expiry", "strike")
+
+class ResultsBoard:
+    """
+    Latest scan results held in memory, one tuple per market (FIELDS order)
+    keyed by market id. Full scans replace the board, streaming re-prices
+    upsert into it; either way each viewer gets only the rows that changed.
+    """
+
+    def __init__(self, queue_size=256):
+        self.rows = {} # market id -> tuple in FIELDS order
+        self.version = 0
+        self.updated = None # time.time() of the last change
+        self.queue_size = queue_size # Pending updates per viewer before it is dropped (it reconnects and resyncs)
+        self._subscribers = set()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def row(result):
+        # NaN is not valid JSON; viewers get null
+        return tuple(None if value != value else value for value in (result.get(field) for field in FIELDS))
+
+    def publish(self, results, replace=True):
+        """
+        Store results (TouchReplicator result dicts). replace=True treats them as a
+        full scan and drops markets missing from it; False upserts (streaming).
+        Returns the number of changed rows.
+        """
+        new_rows = {r["id"]: self.row(r) for r in results}
+        with self._lock:
+            upserts = [row for market_id, row in new_rows.items() if self.rows.get(market_id) != row]
+            removed = [market_id for market_id in self.rows if market_id not in new_rows] if replace else []
+            if not upserts and not removed:
+                return 0
+            self.rows.update(new_rows)
+            for market_id in removed:
+                del self.rows[market_id]
+            self.version += 1
+            self.updated = time.time()
+            self._broadcast({"version": self.version, "upserts": upserts, "removed": removed})
+        return len(upserts) + len(removed)
+
+    def upsert(self, results):
+        """TouchStreamer on_update callback"""
+        self.publish(results, replace=False)
+
+    def _broadcast(self, update):
+        for q in list(self._subscribers):
+            try:
+                q.put_nowait(update)
+            except queue.Full:
+                # Slow viewer: drop its backlog and end its stream
+                self._subscribers.discard(q)
+                with q.mutex:
+                    q.queue.clear()
+                q.put_nowait(None)
+
+    def subscribe(self):
+        """(queue of updates, snapshot update with every row); None on the queue ends the stream"""
+        q = queue.Queue(maxsize=self.queue_size)
+        with self._lock:
+            self._subscribers.add(q)
+            snapshot = {"version": self.version, "upserts": list(self.rows.values()), "removed": [], "snapshot": True}
+        return q, snapshot
+
+    def unsubscribe(self, q):
+        with self._lock:
+            self._subscribers.discard(q)
+
+    @property
+    def viewers(self):
+        return len(self._subscribers)
+
+    def query(self, asset=None, expiry=None, min_edge=None, min_strike=None, max_strike=None,
+              sort="edge", descending=True, limit=None):
+        """Rows matching the filters as dicts, sorted by edge, expiry or strike"""
+        if sort not in SORT_KEYS:
+            raise ValueError(f"sort must be one of {', '.join(SORT_KEYS)}")
+        with self._lock:
+            rows = list(self.rows.values())
+
+        asset_i, expiry_i, strike_i, edge_i = (FIELDS.index(f) for f in ("asset", "expiry", "strike", "edge"))
+        if asset: rows = [r for r in rows if r[asset_i] == asset]
+        if expiry: rows = [r for r in rows if r[expiry_i] == expiry]
+        # Rows missing the filtered field (None; NaN is stored as None) never match
+        if min_edge is not None: rows = [r for r in rows if r[edge_i] is not None and r[edge_i] >= min_edge]
+        if min_strike is not None: rows = [r for r in rows if r[strike_i] is not None and r[strike_i] >= min_strike]
+        if max_strike is not None: rows = [r for r in rows if r[strike_i] is not None and r[strike_i] <= max_strike]
+
+        # Missing sort values go last in either order
+        key = FIELDS.index(sort)
+        missing = [r for r in rows if r[key] is None or r[key] != r[key]]
+        rows = sorted((r for r in rows if r[key] is not None and r[key] == r[key]), key=lambda r: r[key], reverse=descending)
+        rows += missing
+        if limit is not None:
+            rows = rows[:limit]
+        return [dict(zip(FIELDS, r)) for r in rows]
+
+def scan_loop(replicator, board, interval=60.0, stop=None):
+    """Scan every `interval` seconds and publish to the board until `stop` (threading.Event) is set"""
+    stop = stop or threading.Event()
+    while not stop.is_set():
+        start = time.monotonic()
+        try:
+            board.publish(replicator.scan())
+        except Exception as e:
+            print(f"Scan failed: {e}")
+        stop.wait(max(0.0, interval - (time.monotonic() - start)))
+
+class ResultsHandler(BaseHTTPRequestHandler):
+    """
+    GET /                 live HTML table (EventSource on /events)
+    GET /results          JSON rows; ?asset=BTC&expiry=2026-02-27&min_edge=0.05
+                          &min_strike=&max_strike=&sort=edge|expiry|strike&order=desc|asc&limit=100
+    GET /events           server-sent events: a snapshot of every row, then changed rows
+    """
+    board = None # Set by ResultsServer
+    heartbeat = 15.0 # Seconds between SSE keep-alive comments
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path == "/":
+            self.send_body(200, "text/html; charset=utf-8", DASHBOARD_HTML.encode())
+        elif url.path == "/results":
+            self.send_results(parse_qs(url.query))
+        elif url.path == "/events":
+            self.send_events()
+        else:
+            self.send_body(404, "application/json", b'{"error": "not found"}')
+
+    def send_body(self, status, content_type, body):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_results(self, params):
+        arg = lambda name: params[name][0] if name in params else None
+        number = lambda name: float(arg(name)) if arg(name) is not None else None
+        try:
+            rows = self.board.query(
+                asset=arg("asset"),
+                expiry=arg("expiry"),
+                min_edge=number("min_edge"),
+                min_strike=number("min_strike"),
+                max_strike=number("max_strike"),
+                sort=arg("sort") or "edge",
+                descending=(arg("order") or "desc") != "asc",
+                limit=int(arg("limit")) if arg("limit") else None,
+            )
+        except ValueError as e:
+            self.send_body(400, "application/json", json.dumps({"error": str(e)}).encode())
+            return
+        body = {"version": self.board.version, "updated": self.board.updated, "count": len(rows), "results": rows}
+        self.send_body(200, "application/json", json.dumps(body, default=float).encode())
+
+    def send_events(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+
+        q, update = self.board.subscribe()
+        try:
+            self.write_event(dict(update, fields=FIELDS))
+            while True:
+                try:
+                    update = q.get(timeout=self.heartbeat)
+                except queue.Empty:
+                    self.wfile.write(b": keep-alive\n\n")
+                    self.wfile.flush()
+                    continue
+                if update is None:
+                    break # Fell behind; the browser reconnects and gets a fresh snapshot
+                self.write_event(update)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            self.board.unsubscribe(q)
+
+    def write_event(self, update):
+        self.wfile.write(f"id: {update['version']}\ndata: {json.dumps(update, default=float)}\n\n".encode())
+        self.wfile.flush()
+
+    def log_message(self, format, *args):
+        pass
+
+class ResultsServer:
+    """
+    Threaded HTTP server over a ResultsBoard. Viewers only read the board,
+    so any number of them share one scan loop (or TouchStreamer) and a
+    refresh costs no API calls.
+    """
+
+    def __init__(self, board=None, host="127.0.0.1", port=8000):
+        self.board = board or ResultsBoard()
+        handler = type("BoundResultsHandler", (ResultsHandler,), {"board": self.board})
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """Serve on a background thread"""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+DASHBOARD_HTML = """<!DOCTYPE html>
+<html>
+<head>
+    <title>Touch Bet Arbitrage Scanner</title>
+    <style>
+        body { font-family: sans-serif; padding: 20px; background: #f0f2f5; }
+        h1 { color: #333; }
+        .disclaimer { background-color: #fff3cd; border: 1px solid #ffeaa7; padding: 15px; margin-bottom: 20px; border-radius: 5px; color: #856404; }
+        table { border-collapse: collapse; background: white; width: 100%; }
+        th, td { padding: 6px 10px; border-bottom: 1px solid #eee; text-align: right; }
+        th { cursor: pointer; background: #fafafa; }
+        td.market { text-align: left; }
+        tr.signal td { color: green; font-weight: bold; }
+        tr.flash td { background: #fffbe6; }
+    </style>
+</head>
+<body>
+    <h1>Touch Bet Arbitrage Scanner</h1>
+    <div class="disclaimer">
+        <strong>Disclaimer:</strong> For research purposes only. Not financial advice.
+        Deribit fair values are approximations (spread replication / Black-Scholes) and the hedge is imperfect.
+    </div>
+    <p>Version <span id="version">-</span> | Markets: <span id="count">0</span> | <span id="status">connecting</span></p>
+    <table>
+        <thead><tr>
+            <th data-key="market">Market</th><th data-key="asset">Asset</th><th data-key="expiry">Expiry</th>
+            <th data-key="strike">Strike</th><th data-key="poly_prob">Poly</th><th data-key="bs_prob">BS</th>
+            <th data-key="spread_prob">Spread</th><th data-key="edge">Edge</th><th data-key="exec_edge">Exec Edge</th>
+        </tr></thead>
+        <tbody id="rows"></tbody>
+    </table>
+<script>
+const rows = new Map();
+let fields = [], sortKey = "edge", descending = true;
+const esc = v => String(v ?? "").replace(/[&<>"']/g, c => `&#${c.charCodeAt(0)};`);
+const pct = v => v === null || v === undefined ? "" : (100 * v).toFixed(1) + "%";
+
+function render(changed) {
+    const list = [...rows.values()].sort((a, b) => {
+        const x = a[sortKey], y = b[sortKey];
+        return (x === y ? 0 : (x === null ? -1 : y === null ? 1 : x < y ? -1 : 1)) * (descending ? -1 : 1);
+    });
+    document.getElementById("rows").innerHTML = list.map(r =>
+        `<tr class="${r.edge > 0.10 ? "signal" : ""} ${changed.has(r.id) ? "flash" : ""}">` +
+        `<td class="market"><a href="${esc(r.url)}" target="_blank">${esc(r.market)}</a></td><td>${esc(r.asset)}</td><td>${esc(r.expiry)}</td>` +
+        `<td>${Number(r.strike).toLocaleString()}</td><td>${pct(r.poly_prob)}</td><td>${pct(r.bs_prob)}</td>` +
+        `<td>${pct(r.spread_prob)}</td><td>${pct(r.edge)}</td><td>${pct(r.exec_edge)}</td></tr>`).join("");
+    document.getElementById("count").textContent = rows.size;
+}
+
+document.querySelectorAll("th").forEach(th => th.onclick = () => {
+    descending = th.dataset.key === sortKey ? !descending : true;
+    sortKey = th.dataset.key;
+    render(new Set());
+});
+
+const source = new EventSource("/events");
+source.onopen = () => document.getElementById("status").textContent = "live";
+source.onerror = () => document.getElementById("status").textContent = "reconnecting";
+source.onmessage = e => {
+    const update = JSON.parse(e.data);
+    if (update.fields) fields = update.fields;
+    if (update.snapshot) rows.clear();
+    const changed = new Set();
+    for (const values of update.upserts) {
+        const r = Object.fromEntries(fields.map((f, i) => [f, values[i]]));
+        rows.set(r.id, r);
+        changed.add(r.id);
+    }
+    for (const id of update.removed) rows.delete(id);
+    document.getElementById("version").textContent = update.version;
+    render(update.snapshot ? new Set() : changed);
+};
+</script>
+</body>
+</html>
+"""
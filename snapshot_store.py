@@ -0,0 +1,350 @@
+import os
+import json
+import time
+from datetime import datetime
+import numpy as np
+import pandas as pd
+from http_cache import ResponseCache
+from polymarket_touch_scanner import PolymarketTouchScanner, decode_outcome_prices
+
+CHAIN_NUMERIC = ["strike", "mark_price", "bid", "ask", "mark_iv", "underlying_price", "open_interest", "volume_usd",
+                 "expiry_dt"] # expiry_dt as float64 nanoseconds (NaN = NaT)
+CHAIN_STRINGS = ["instrument", "expiry", "type"]
+
+MARKET_NUMERIC = ["yes_price", "no_price"]
+MARKET_STRINGS = ["id", "question", "slug", "endDate", "updatedAt", "description"]
+
+class ColumnarTable:
+    """
+    Append-only columnar table on disk.
+
+    <path>/<col>.f8      little-endian float64 values (numeric columns)
+    <path>/<col>.i4      int32 dictionary codes (string columns, -1 = missing)
+    <path>/<col>.vocab   dictionary, one JSON string per line
+    <path>/snapshots.i8  one (timestamp_ns, row_start, row_count) int64 triple per snapshot
+
+    The snapshot index is written last, so a half-written snapshot is never visible to readers.
+    """
+
+    def __init__(self, path, numeric_columns, string_columns):
+        self.path = path
+        self.numeric_columns = numeric_columns
+        self.string_columns = string_columns
+        os.makedirs(path, exist_ok=True)
+
+        self._codes = {}
+        for col in string_columns:
+            vocab = _read_vocab(self._file(col, "vocab"))
+            self._codes[col] = {s: i for i, s in enumerate(vocab)}
+
+        index = _read_array(self._file("snapshots", "i8"), "<i8").reshape(-1, 3)
+        self.row_count = int(index[-1, 1] + index[-1, 2]) if len(index) else 0
+
+        # Drop rows of a snapshot that was interrupted before its index entry was written
+        for col in numeric_columns:
+            _truncate(self._file(col, "f8"), self.row_count * 8)
+        for col in string_columns:
+            _truncate(self._file(col, "i4"), self.row_count * 4)
+
+    def _file(self, name, ext):
+        return os.path.join(self.path, f"{name}.{ext}")
+
+    def _encode(self, col, values):
+        codes = self._codes[col]
+        new_words = []
+        out = np.empty(len(values), dtype="<i4")
+        for i, v in enumerate(values):
+            if v is None or (isinstance(v, float) and v != v):
+                out[i] = -1
+                continue
+            v = str(v)
+            code = codes.get(v)
+            if code is None:
+                code = codes[v] = len(codes)
+                new_words.append(v)
+            out[i] = code
+        if new_words:
+            with open(self._file(col, "vocab"), "a") as f:
+                f.writelines(json.dumps(w) + "\n" for w in new_words)
+        return out
+
+    def append(self, columns, n_rows, timestamp_ns=None):
+        """Append one snapshot. `columns` maps column name -> sequence of length n_rows."""
+        if timestamp_ns is None:
+            timestamp_ns = time.time_ns()
+
+        for col in self.numeric_columns:
+            values = columns.get(col)
+            arr = np.full(n_rows, np.nan) if values is None else pd.to_numeric(pd.Series(values), errors="coerce").to_numpy(dtype="<f8")
+            with open(self._file(col, "f8"), "ab") as f:
+                f.write(arr.tobytes())
+
+        for col in self.string_columns:
+            values = columns.get(col)
+            arr = np.full(n_rows, -1, dtype="<i4") if values is None else self._encode(col, values)
+            with open(self._file(col, "i4"), "ab") as f:
+                f.write(arr.tobytes())
+
+        with open(self._file("snapshots", "i8"), "ab") as f:
+            f.write(np.array([timestamp_ns, self.row_count, n_rows], dtype="<i8").tobytes())
+        self.row_count += n_rows
+
+class ColumnarTableReader:
+    """Memory-mapped view of a ColumnarTable. Numeric columns are returned without copying."""
+
+    def __init__(self, path, numeric_columns, string_columns):
+        self.path = path
+        self.index = _read_array(os.path.join(path, "snapshots.i8"), "<i8").reshape(-1, 3)
+        self.timestamps = self.index[:, 0]
+        self.numeric = {col: _read_array(os.path.join(path, f"{col}.f8"), "<f8") for col in numeric_columns}
+        self.codes = {col: _read_array(os.path.join(path, f"{col}.i4"), "<i4") for col in string_columns}
+        self.vocab = {}
+        for col in string_columns:
+            # Trailing None so code -1 decodes to missing
+            words = _read_vocab(os.path.join(path, f"{col}.vocab")) + [None]
+            self.vocab[col] = np.array(words, dtype=object)
+
+    def __len__(self):
+        return len(self.index)
+
+    def rows(self, i):
+        _, start, count = self.index[i]
+        return slice(int(start), int(start + count))
+
+    def numeric_columns(self, i):
+        """Numeric columns of snapshot i as memmap slices (zero-copy)"""
+        rows = self.rows(i)
+        return {col: values[rows] for col, values in self.numeric.items()}
+
+    def string_codes(self, i):
+        rows = self.rows(i)
+        return {col: codes[rows] for col, codes in self.codes.items()}
+
+    def decode(self, col, codes):
+        return self.vocab[col][codes]
+
+    def latest_at(self, timestamp_ns):
+        """Position of the last snapshot taken at or before timestamp_ns, or None"""
+        i = np.searchsorted(self.timestamps, timestamp_ns, side="right") - 1
+        return None if i < 0 else int(i)
+
+class SnapshotRecorder:
+    """Appends option chain (root/chains/<currency>) and Polymarket market (root/markets) snapshots under `root`"""
+
+    def __init__(self, root):
+        self.root = root
+        self.chains = {} # currency -> ColumnarTable, opened on first record
+        self.markets = ColumnarTable(os.path.join(root, "markets"), MARKET_NUMERIC, MARKET_STRINGS)
+
+    def chain_table(self, currency):
+        if currency not in self.chains:
+            self.chains[currency] = ColumnarTable(os.path.join(self.root, "chains", currency), CHAIN_NUMERIC, CHAIN_STRINGS)
+        return self.chains[currency]
+
+    def record_chain(self, chain, timestamp_ns=None, currency="BTC"):
+        """Record a get_option_chain_summary() DataFrame of one currency"""
+        columns = {col: chain[col].to_numpy() for col in CHAIN_NUMERIC + CHAIN_STRINGS if col in chain}
+        if "expiry_dt" in chain:
+            ns = chain["expiry_dt"].to_numpy(dtype="datetime64[ns]")
+            columns["expiry_dt"] = np.where(np.isnat(ns), np.nan, ns.astype("int64").astype(float))
+        self.chain_table(currency).append(columns, len(chain), timestamp_ns)
+
+    def record_markets(self, markets, timestamp_ns=None):
+        """Record raw Gamma market dicts (as returned by fetch_polymarket_touch_markets)"""
+        columns = {col: [m.get(col) for m in markets] for col in MARKET_STRINGS}
+        yes, no = [], []
+        for m in markets:
+            prices = decode_outcome_prices(m.get("outcomePrices"))
+            yes.append(prices[0] if len(prices) > 0 else None)
+            no.append(prices[1] if len(prices) > 1 else None)
+        columns["yes_price"] = yes
+        columns["no_price"] = no
+        self.markets.append(columns, len(markets), timestamp_ns)
+
+class RecordingDeribitConnector:
+    """Wraps a live DeribitConnector and records every chain it returns, under its currency"""
+
+    def __init__(self, connector, recorder):
+        self.connector = connector
+        self.recorder = recorder
+
+    def __getattr__(self, name):
+        return getattr(self.connector, name)
+
+    def get_option_chain_summary(self):
+        chain = self.connector.get_option_chain_summary()
+        if not chain.empty:
+            self.recorder.record_chain(chain, currency=self.connector.currency)
+        return chain
+
+class RecordingPolymarketScanner:
+    """Wraps a live PolymarketTouchScanner and records every fetched market list"""
+
+    def __init__(self, scanner, recorder):
+        self.scanner = scanner
+        self.recorder = recorder
+
+    def __getattr__(self, name):
+        return getattr(self.scanner, name)
+
+    def iter_polymarket_touch_markets(self):
+        markets = []
+        for m in self.scanner.iter_polymarket_touch_markets():
+            markets.append(m)
+            yield m
+        self.recorder.record_markets(markets)
+
+    def fetch_polymarket_touch_markets(self):
+        return list(self.iter_polymarket_touch_markets())
+
+class SnapshotReplay:
+    """
+    Replays a recorded directory. The cursor is a timestamp; each connector
+    serves the latest snapshot taken at or before it.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        chains = os.path.join(root, "chains")
+        currencies = sorted(os.listdir(chains)) if os.path.isdir(chains) else []
+        self.chains = {c: ColumnarTableReader(os.path.join(chains, c), CHAIN_NUMERIC, CHAIN_STRINGS) for c in currencies}
+        self.markets = ColumnarTableReader(os.path.join(root, "markets"), MARKET_NUMERIC, MARKET_STRINGS)
+        self.cursor = None
+
+    def chain(self, currency="BTC"):
+        """Chain table of one currency (empty when none was recorded)"""
+        if currency not in self.chains:
+            return ColumnarTableReader(os.path.join(self.root, "chains", currency), CHAIN_NUMERIC, CHAIN_STRINGS)
+        return self.chains[currency]
+
+    def timestamps(self):
+        """Every distinct snapshot time across all tables, ascending (ns)"""
+        ts = self.markets.timestamps
+        for chain in self.chains.values():
+            ts = np.union1d(ts, chain.timestamps)
+        return ts
+
+    def seek(self, timestamp_ns):
+        self.cursor = int(timestamp_ns)
+
+    def steps(self, start_ns=None, end_ns=None):
+        """Move the cursor through every snapshot time in [start_ns, end_ns]"""
+        ts = self.timestamps()
+        if start_ns is not None: ts = ts[ts >= start_ns]
+        if end_ns is not None: ts = ts[ts <= end_ns]
+        for t in ts:
+            self.seek(t)
+            yield int(t)
+
+    def now(self):
+        """Cursor as a naive local datetime, matching datetime.now() in live runs"""
+        return datetime.fromtimestamp(self.cursor / 1e9)
+
+    def chain_frame(self, i, currency="BTC"):
+        """Snapshot i of a currency's option chain as a get_option_chain_summary()-style DataFrame"""
+        chain = self.chain(currency)
+        codes = chain.string_codes(i)
+        data = {
+            "instrument": chain.decode("instrument", codes["instrument"]),
+            "expiry": chain.decode("expiry", codes["expiry"]),
+        }
+        numeric = chain.numeric_columns(i)
+        data["strike"] = numeric["strike"]
+        data["type"] = chain.decode("type", codes["type"])
+        for col in CHAIN_NUMERIC[1:-1]:
+            data[col] = numeric[col]
+        data["expiry_dt"] = pd.to_datetime(numeric["expiry_dt"], unit="ns")
+        return pd.DataFrame(data, copy=False)
+
+    def market_dicts(self, i):
+        """Snapshot i of the markets as Gamma-style dicts"""
+        codes = self.markets.string_codes(i)
+        strings = {col: self.markets.decode(col, codes[col]) for col in MARKET_STRINGS}
+        numeric = self.markets.numeric_columns(i)
+        markets = []
+        for j in range(len(numeric["yes_price"])):
+            m = {col: strings[col][j] for col in MARKET_STRINGS if strings[col][j] is not None}
+            prices = [p for p in (numeric["yes_price"][j], numeric["no_price"][j]) if p == p]
+            if prices:
+                m["outcomePrices"] = json.dumps([repr(float(p)) for p in prices])
+            markets.append(m)
+        return markets
+
+class ReplayDeribitConnector:
+    """Stands in for DeribitConnector, serving recorded chains"""
+
+    def __init__(self, replay, currency="BTC"):
+        self.replay = replay
+        self.currency = currency
+
+    def get_option_chain_summary(self):
+        i = self.replay.chain(self.currency).latest_at(self.replay.cursor)
+        if i is None:
+            return pd.DataFrame()
+        return self.replay.chain_frame(i, self.currency)
+
+class ReplayPolymarketScanner(PolymarketTouchScanner):
+    """Stands in for PolymarketTouchScanner, serving recorded market lists"""
+
+    def __init__(self, replay, assets=("BTC",)):
+        super().__init__(assets=assets, http=ResponseCache(None))
+        self.replay = replay
+
+    def iter_polymarket_touch_markets(self):
+        i = self.replay.markets.latest_at(self.replay.cursor)
+        if i is None:
+            return
+        yield from self.replay.market_dicts(i)
+
+    def fetch_polymarket_touch_markets(self):
+        return list(self.iter_polymarket_touch_markets())
+
+def replay_replicator(root, currencies=None):
+    """TouchReplicator wired to replay connectors (every recorded currency by default). Step it with replay.steps()."""
+    from touch_replicator import TouchReplicator
+    replay = SnapshotReplay(root)
+    currencies = tuple(currencies or replay.chains or ("BTC",))
+    replicator = TouchReplicator(
+        deribit=ReplayDeribitConnector(replay, currencies[0]),
+        poly_scanner=ReplayPolymarketScanner(replay, currencies),
+        clock=replay.now,
+        currencies=currencies,
+    )
+    for currency in currencies[1:]:
+        replicator.deribit_connectors[currency] = ReplayDeribitConnector(replay, currency)
+    return replicator, replay
+
+def record_connectors(replicator, recorder):
+    """Wrap every connector of a live TouchReplicator so each chain and market list it fetches is recorded"""
+    replicator.poly_scanner = RecordingPolymarketScanner(replicator.poly_scanner, recorder)
+    for currency, connector in replicator.deribit_connectors.items():
+        replicator.deribit_connectors[currency] = RecordingDeribitConnector(connector, recorder)
+    replicator.deribit = replicator.deribit_connectors[replicator.currencies[0]]
+    return replicator
+
+def _read_array(path, dtype):
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return np.zeros(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode="r")
+
+def _truncate(path, size):
+    if os.path.exists(path) and os.path.getsize(path) > size:
+        with open(path, "r+b") as f:
+            f.truncate(size)
+
+def _read_vocab(path):
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+if __name__ == "__main__":
+    import sys
+    from touch_replicator import TouchReplicator
+
+    root = sys.argv[1] if len(sys.argv) > 1 else "snapshots"
+    currencies = sys.argv[2].upper().split(",") if len(sys.argv) > 2 else ["BTC"]
+    recorder = SnapshotRecorder(root)
+    replicator = record_connectors(TouchReplicator(currencies=currencies), recorder)
+    replicator.scan()
+    print(f"Snapshots recorded to {root}/")
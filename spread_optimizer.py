@@ -0,0 +1,104 @@
+import numpy as np
+
+class SpreadOptimizer:
+    """
+    Cheapest executable call debit spread hedging a touch of each target strike.
+
+    A call spread replicates a touch of K only if it is worth about half its
+    width when spot reaches K, i.e. if it is centred on K; a deep in-the-money
+    pair (92k-101k for K = 100k) is worth far more at touch, so its
+    2 * debit / width overstates the touch probability. Candidates are
+    therefore (long, short) call pairs with k_long <= K < k_short whose
+    midpoint is no further from K than the adjacent pair's (99k-101k or
+    98k-102k qualify for K = 100k, 92k-101k does not) and whose width is
+    inside the window, on the first expiry covering the Poly expiry. Among
+    them the lowest executable debit per unit paid at touch wins: buy the
+    long leg at ask, sell the short leg at bid, score 2 * debit / width as in
+    TouchReplicator. Pairs are evaluated by broadcasting markets x candidate
+    pairs, one expiry at a time.
+    """
+
+    FIELDS = ["spread_prob", "k_long", "k_short", "debit", "width"]
+
+    def __init__(self, max_width=None, max_width_pct=0.10, max_cells=4_000_000):
+        self.max_width = max_width # Absolute width cap (USD); overrides max_width_pct
+        self.max_width_pct = max_width_pct # Width cap as a fraction of the target strike
+        self.max_cells = max_cells # Markets x pairs evaluated per block
+
+    def width_limits(self, strikes):
+        if self.max_width is not None:
+            return np.full(len(strikes), float(self.max_width))
+        return self.max_width_pct * strikes
+
+    def optimize_expiry(self, index, expiry, strikes):
+        """Best spread on one expiry for each strike. Missing entries are NaN."""
+        strikes = np.asarray(strikes, dtype=float)
+        out = {field: np.full(len(strikes), np.nan) for field in self.FIELDS}
+        out["long_instrument"] = np.full(len(strikes), None, dtype=object)
+        out["short_instrument"] = np.full(len(strikes), None, dtype=object)
+
+        calls = index.columns(expiry, "call")
+        spot = index.spot(expiry)
+        if not calls or not spot or len(strikes) == 0:
+            return out
+
+        s, bid, ask = calls["strike"], calls["bid"], calls["ask"]
+        limits = self.width_limits(strikes)
+
+        # Off-centre distance of the adjacent pair around each K: the most a candidate may have
+        a = np.clip(np.searchsorted(s, strikes, side="right"), 1, max(1, len(s) - 1))
+        max_offset = np.abs(0.5 * (s[a - 1] + s[np.minimum(a, len(s) - 1)]) - strikes) * (1 + 1e-12)
+
+        # Candidate pairs: long (i) below short (j), both legs quoted, width inside the widest window
+        i, j = np.triu_indices(len(s), k=1)
+        width = s[j] - s[i]
+        ok = (width > 0) & (width <= limits.max()) & np.isfinite(ask[i]) & np.isfinite(bid[j])
+        i, j, width = i[ok], j[ok], width[ok]
+        if len(i) == 0:
+            return out
+
+        debit = (ask[i] - bid[j]) * spot
+        prob = np.where(debit > 0, 2 * debit / width, 0.0)
+        mid = 0.5 * (s[i] + s[j])
+
+        block = max(1, self.max_cells // len(i))
+        for lo in range(0, len(strikes), block):
+            K = strikes[lo:lo + block, None]
+            cover = (s[i] <= K) & (K < s[j]) & (width <= limits[lo:lo + block, None])
+            cover &= np.abs(mid - K) <= max_offset[lo:lo + block, None]
+            score = np.where(cover, prob, np.inf)
+            best = np.argmin(score, axis=1)
+            rows = np.arange(len(best))
+            found = np.isfinite(score[rows, best])
+            pick = best[found]
+            dest = lo + np.flatnonzero(found)
+
+            out["spread_prob"][dest] = prob[pick]
+            out["k_long"][dest] = s[i[pick]]
+            out["k_short"][dest] = s[j[pick]]
+            out["debit"][dest] = debit[pick]
+            out["width"][dest] = width[pick]
+            out["long_instrument"][dest] = calls["instrument"][i[pick]]
+            out["short_instrument"][dest] = calls["instrument"][j[pick]]
+        return out
+
+    def optimize(self, index, strikes, expiries):
+        """
+        Best spread per market on the first listed expiry on or after its expiry.
+        strikes: target strikes; expiries: Poly expiry dates (YYYY-MM-DD) or the listed expiries to use.
+        Returns a dict of arrays (FIELDS + legs + 'expiry'); NaN/None where nothing qualifies.
+        """
+        strikes = np.asarray(strikes, dtype=float)
+        best = {field: np.full(len(strikes), np.nan) for field in self.FIELDS}
+        best["long_instrument"] = np.full(len(strikes), None, dtype=object)
+        best["short_instrument"] = np.full(len(strikes), None, dtype=object)
+        best["expiry"] = np.full(len(strikes), None, dtype=object)
+
+        covering = np.array([index.next_expiry(expiry) for expiry in expiries], dtype=object)
+        for expiry in {e for e in covering if e is not None}:
+            rows = np.flatnonzero(covering == expiry)
+            found = self.optimize_expiry(index, expiry, strikes[rows])
+            for field in found:
+                best[field][rows] = found[field]
+            best["expiry"][rows] = np.where(np.isfinite(found["spread_prob"]), expiry, None)
+        return best
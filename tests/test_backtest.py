@@ -0,0 +1,65 @@
+import json
+
+import numpy as np
+import pytest
+
+from backtest import TouchBacktester
+from benchmark import BENCH_NOW, FakeDeribitConnector, synthetic_markets, synthetic_summaries
+from snapshot_store import SnapshotRecorder, replay_replicator
+
+HOUR_NS = 3600 * 10**9
+T0 = int(BENCH_NOW.timestamp() * 1e9)
+
+@pytest.fixture(scope="module")
+def snapshots(tmp_path_factory):
+    """Two chain snapshots and four market snapshots, prices moving between them"""
+    root = str(tmp_path_factory.mktemp("snapshots"))
+    recorder = SnapshotRecorder(root)
+    markets = synthetic_markets(120)
+    for hour, seed in ((0, 0), (5, 1)):
+        recorder.record_chain(FakeDeribitConnector(synthetic_summaries(2000, seed=seed)).get_option_chain_summary(), T0 + hour * HOUR_NS)
+    for hour in (1, 3, 6, 30):
+        for m in markets:
+            yes = float(json.loads(m["outcomePrices"])[0])
+            yes = min(0.999, yes * (1 + 0.01 * hour))
+            m["outcomePrices"] = json.dumps([f"{yes:.3f}", f"{1 - yes:.3f}"])
+        recorder.record_markets(markets, T0 + hour * HOUR_NS)
+    return root
+
+def live_scans(root):
+    """price_markets of a replay replicator at every market snapshot: {(time, id): result}"""
+    replicator, replay = replay_replicator(root)
+    scans = {}
+    for t in replay.markets.timestamps:
+        replay.seek(t)
+        replicator.fetch_option_chains()
+        for r in replicator.price_markets(replicator.fetch_market_details()):
+            scans[(int(t), r["id"])] = r
+    return scans
+
+def test_rows_match_the_live_replicator(snapshots):
+    backtester = TouchBacktester(snapshots, chunk_snapshots=3)
+    rows = backtester.price_rows()
+    live = live_scans(snapshots)
+    ids = backtester.replay.markets.vocab["id"]
+
+    assert len(rows) == len(live) > 100
+    for row in rows.itertuples():
+        expected = live[(row.time, ids[row.market_code])]
+        assert row.strike == expected["strike"]
+        assert row.bs_prob == pytest.approx(expected["bs_prob"], rel=1e-9)
+        assert row.edge == pytest.approx(expected["edge"], rel=1e-9, abs=1e-12)
+        spread_prob = expected["spread_prob"]
+        assert row.spread_prob == pytest.approx(np.nan if spread_prob is None else spread_prob, rel=1e-9, nan_ok=True)
+
+def test_chunking_does_not_change_prices(snapshots):
+    one = TouchBacktester(snapshots, chunk_snapshots=1).price_rows()
+    all_ = TouchBacktester(snapshots, chunk_snapshots=512).price_rows()
+    assert one.equals(all_)
+
+def test_run_simulates_trades(snapshots):
+    result = TouchBacktester(snapshots, edge_threshold=0.0).run()
+    trades = result["trades"]
+    assert len(trades) > 0
+    assert set(trades["direction"]) <= {"up", "down"}
+    assert result["stats"]["trades"] == len(trades)
@@ -0,0 +1,84 @@
+import math
+import itertools
+
+import numpy as np
+import pytest
+from scipy.stats import norm
+
+from bs_models import BlackScholesModels, norm_cdf
+
+def scalar_one_touch(S, K, T, sigma, r=0.04):
+    """The original per-market closed form (math.log + scipy norm.cdf, branching on the barrier side)"""
+    if T <= 0: return 1.0 if (S >= K) else 0.0
+    if sigma <= 0: return 1.0 if (S >= K) else 0.0
+    mu = r - 0.5 * sigma**2
+    a = mu / sigma**2
+    z = (math.log(K / S) - mu * T) / (sigma * math.sqrt(T))
+    y = (math.log(K / S) + mu * T) / (sigma * math.sqrt(T))
+    if K > S:
+        return norm.cdf(-z) + (K / S) ** (2 * a) * norm.cdf(-y)
+    return norm.cdf(z) + (K / S) ** (2 * a) * norm.cdf(y)
+
+SPOT = 100000.0
+STRIKES = [50000.0, 80000.0, 99000.0, 100000.0, 101000.0, 120000.0, 250000.0]
+TIMES = [-0.1, 0.0, 1 / 365, 0.1, 0.5, 2.0]
+VOLS = [-0.2, 0.0, 0.05, 0.6, 1.5]
+
+def test_batch_matches_scalar_formula_on_grid():
+    grid = list(itertools.product(STRIKES, TIMES, VOLS))
+    K, T, sigma = (np.array(col) for col in zip(*grid))
+    batch = BlackScholesModels.one_touch_probability_batch(SPOT, K, T, sigma, 0.04)
+
+    expected = np.array([scalar_one_touch(SPOT, k, t, v) for k, t, v in grid])
+    np.testing.assert_allclose(batch, expected, rtol=1e-12, atol=1e-14)
+    assert batch.shape == (len(grid),)
+
+@pytest.mark.parametrize("K, T, sigma", [
+    (120000.0, 0.0, 0.6), (80000.0, -1.0, 0.6), # Expired: touched only if already through the strike
+    (120000.0, 0.5, 0.0), (80000.0, 0.5, -0.3), # No vol
+    (SPOT, 0.5, 0.6), (SPOT, 0.0, 0.0), # At the barrier
+])
+def test_edge_cases_match_scalar(K, T, sigma):
+    expected = scalar_one_touch(SPOT, K, T, sigma)
+    assert BlackScholesModels.one_touch_probability(SPOT, K, T, sigma) == pytest.approx(expected, abs=1e-14)
+    assert BlackScholesModels.one_touch_probability_batch([SPOT], [K], [T], [sigma])[0] == pytest.approx(expected, abs=1e-14)
+
+def test_degenerate_inputs_are_step_functions():
+    K = np.array([80000.0, SPOT, 120000.0])
+    for T, sigma in ((0.0, 0.6), (-1.0, 0.6), (0.5, 0.0), (0.5, -0.1)):
+        np.testing.assert_array_equal(BlackScholesModels.one_touch_probability_batch(SPOT, K, T, sigma), [1.0, 1.0, 0.0])
+
+def test_scalar_wrapper_and_broadcasting():
+    probs = BlackScholesModels.one_touch_probability_batch(SPOT, [90000.0, 110000.0], [[0.1], [0.5]], 0.6)
+    assert probs.shape == (2, 2)
+    for (i, j), p in np.ndenumerate(probs):
+        t, k = (0.1, 0.5)[i], (90000.0, 110000.0)[j]
+        assert BlackScholesModels.one_touch_probability(SPOT, k, t, 0.6) == p
+    assert isinstance(BlackScholesModels.one_touch_probability(SPOT, 110000.0, 0.5, 0.6), float)
+
+def test_norm_cdf_matches_scipy():
+    x = np.linspace(-12, 12, 2001)
+    np.testing.assert_allclose(norm_cdf(x), norm.cdf(x), rtol=1e-12, atol=1e-300)
+    assert norm_cdf(0.3) == pytest.approx(norm.cdf(0.3), rel=1e-14)
+
+def scalar_digital(S, K, T, sigma, r=0.04, up=True):
+    """N(d2) / N(-d2) with scipy"""
+    if T <= 0 or sigma <= 0:
+        return float(S > K if up else S < K)
+    d2 = (math.log(S / K) + (r - 0.5 * sigma**2) * T) / (sigma * math.sqrt(T))
+    return norm.cdf(d2 if up else -d2)
+
+def test_digital_matches_scalar_formula_on_grid():
+    grid = list(itertools.product(STRIKES, TIMES, VOLS, (True, False)))
+    K, T, sigma, up = (np.array(col) for col in zip(*grid))
+    batch = BlackScholesModels.digital_probability_batch(SPOT, K, T, sigma, 0.04, up)
+    expected = np.array([scalar_digital(SPOT, k, t, v, 0.04, u) for k, t, v, u in grid])
+    np.testing.assert_allclose(batch, expected, rtol=1e-12, atol=1e-14)
+
+def test_digital_is_below_the_touch():
+    # Finishing beyond K requires touching it on the way
+    K = np.array([80000.0, 99000.0, 101000.0, 120000.0])
+    up = K > SPOT
+    digital = BlackScholesModels.digital_probability_batch(SPOT, K, 0.5, 0.6, 0.04, up)
+    touch = BlackScholesModels.one_touch_probability_batch(SPOT, K, 0.5, 0.6, 0.04)
+    assert np.all(digital < touch)
@@ -0,0 +1,59 @@
+from consistency_checker import ConsistencyChecker, window_start
+
+def market(question, strike, expiry, price, kind="touch", direction="up"):
+    return {"question": question, "asset": "BTC", "strike": strike, "expiry": expiry,
+            "poly_price": price, "kind": kind, "direction": direction, "window": None}
+
+def pairs(markets):
+    """{(buy_yes question, buy_no question, rule)} of the violations"""
+    return {(v["buy_yes"]["question"], v["buy_no"]["question"], v["rule"]) for v in ConsistencyChecker().check(markets)}
+
+def test_window_start():
+    assert window_start("by March 31", "2026-03-31") == ""
+    assert window_start(None, "2026-03-31") == ""
+    assert window_start("in February", "2026-02-28") == "2026-02-01"
+    assert window_start("in January 2027", "2027-01-31") == "2027-01-01"
+    assert window_start("this week", "2026-02-06") == "this week | 2026-02-06"
+
+def test_nested_windows():
+    markets = [
+        dict(market("hit 100k by March 31", 100000.0, "2026-03-31", 0.30), window="by March 31"),
+        dict(market("hit 105k by February 28", 105000.0, "2026-02-28", 0.40), window="by February 28"),
+        dict(market("hit 110k by March 31", 110000.0, "2026-03-31", 0.20), window="by March 31"),
+    ]
+    # The later, lower-strike touch contains the other two; only the pricier one is a violation
+    assert pairs(markets) == {("hit 100k by March 31", "hit 105k by February 28", "touch>=touch")}
+
+def test_disjoint_monthly_windows_do_not_nest():
+    markets = [
+        dict(market("hit 100k in February", 100000.0, "2026-02-28", 0.20), window="in February"),
+        dict(market("hit 105k in January", 105000.0, "2026-01-31", 0.40), window="in January"),
+        # Open from listing: February may already have begun, so 'by' does not contain 'in'
+        dict(market("hit 100k by March 31", 100000.0, "2026-03-31", 0.10), window="by March 31"),
+    ]
+    assert pairs(markets) == set()
+
+    # Within one month the windows do nest
+    markets.append(dict(market("hit 105k in February", 105000.0, "2026-02-28", 0.30), window="in February"))
+    assert pairs(markets) == {("hit 100k in February", "hit 105k in February", "touch>=touch")}
+
+def test_touch_window_contains_above_markets_dated_inside_it():
+    markets = [
+        dict(market("hit 100k in February", 100000.0, "2026-02-28", 0.20), window="in February"),
+        market("above 100k on February 20", 100000.0, "2026-02-20", 0.30, kind="above"),
+        market("above 100k on January 20", 100000.0, "2026-01-20", 0.35, kind="above"),
+    ]
+    assert pairs(markets) == {("hit 100k in February", "above 100k on February 20", "touch>=above")}
+
+def test_equal_expiry():
+    markets = [
+        market("dip to 90k by March 31", 90000.0, "2026-03-31", 0.30, direction="down"),
+        market("dip to 95k by March 31", 95000.0, "2026-03-31", 0.25, direction="down"),
+        market("below 95k on March 31", 95000.0, "2026-03-31", 0.30, kind="above", direction="down"),
+        market("below 90k on March 31", 90000.0, "2026-03-31", 0.20, kind="above", direction="down"),
+    ]
+    # Downside: the higher strike is touched first; same-date ties count as contained
+    assert pairs(markets) == {
+        ("dip to 95k by March 31", "dip to 90k by March 31", "touch>=touch"),
+        ("dip to 95k by March 31", "below 95k on March 31", "touch>=above"),
+    }
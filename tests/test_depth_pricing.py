@@ -0,0 +1,121 @@
+import json
+
+import numpy as np
+import pytest
+
+from deribit_connector import DeribitConnector
+from depth_pricing import DepthPricer, vwap
+from http_cache import ResponseCache
+from polymarket_touch_scanner import PolymarketTouchScanner
+from result_sink import ScanResult
+from touch_replicator import TouchReplicator
+
+# Deribit books in BTC per contract, CLOB books in USD per share
+DERIBIT_BOOKS = {
+    "BTC-20FEB26-100000-C": {"asks": [[0.0300, 0.3], [0.0310, 1.0]], "bids": [[0.0295, 1.0]]},
+    "BTC-20FEB26-101000-C": {"asks": [[0.0295, 1.0]], "bids": [[0.0290, 1.0]]},
+    "BTC-13FEB26-100000-C": {"asks": [[0.0200, 2.0]], "bids": [[0.0195, 2.0]]},
+    "BTC-13FEB26-102000-C": {"asks": [[0.0150, 2.0]], "bids": [[0.0140, 2.0]]},
+}
+CLOB_BOOKS = {
+    "no-1": {"asks": [[0.75, 200], [0.70, 100]], "bids": [[0.68, 50]]}, # Unsorted on purpose
+    "no-2": {"asks": [[0.60, 1000]], "bids": []},
+    "no-3": {"asks": [[0.90, 10]], "bids": []},
+}
+
+@pytest.fixture
+def book_server(stub_server):
+    def deribit_book(request):
+        name = request["query"]["instrument_name"][0]
+        if name.endswith("-999999-C"):
+            return 500, {}, "not json"
+        book = DERIBIT_BOOKS.get(name)
+        result = dict(book, instrument_name=name, underlying_price=100000.0) if book else None
+        return 200, {"Content-Type": "application/json"}, json.dumps({"result": result})
+
+    def clob_books(request):
+        tokens = [item["token_id"] for item in json.loads(request["body"])]
+        books = [{"asset_id": t,
+                  "bids": [{"price": str(p), "size": str(q)} for p, q in CLOB_BOOKS[t]["bids"]],
+                  "asks": [{"price": str(p), "size": str(q)} for p, q in CLOB_BOOKS[t]["asks"]]}
+                 for t in tokens if t in CLOB_BOOKS]
+        return 200, {"Content-Type": "application/json"}, json.dumps(books)
+
+    return stub_server({"/api/v2/public/get_order_book": deribit_book, "/books": clob_books})
+
+@pytest.fixture
+def replicator(book_server):
+    deribit = DeribitConnector("BTC", http=ResponseCache(None))
+    deribit.BASE_URL = book_server.url + "/api/v2"
+    scanner = PolymarketTouchScanner(clob_url=book_server.url, http=ResponseCache(None))
+    return TouchReplicator(deribit=deribit, poly_scanner=scanner)
+
+def result(token, hedge=None, bs_prob=0.3):
+    return ScanResult(id=token, asset="BTC", market=token, poly_prob=0.3, bs_prob=bs_prob, edge=0.0,
+                      hedge=hedge, token_ids=["yes-" + token, token])
+
+FAR = {"legs": ("BTC-20FEB26-100000-C", "BTC-20FEB26-101000-C"), "width": 1000.0, "spot": 100000.0}
+NEAR = {"legs": ("BTC-13FEB26-100000-C", "BTC-13FEB26-102000-C"), "width": 2000.0, "spot": 99000.0, "weight": 0.25}
+
+def test_vwap_walks_the_book():
+    levels = [[0.70, 100], [0.75, 200]]
+    assert vwap(levels, 0.0) == 0.70
+    assert vwap(levels, 200.0) == pytest.approx((0.70 * 100 + 0.75 * 100) / 200)
+    assert np.isnan(vwap(levels, 301.0))
+
+def test_executable_edge_against_the_fake_books(replicator, book_server):
+    results = [result("no-1", FAR), result("no-2", dict(FAR, near=NEAR)), result("no-3", bs_prob=0.05)]
+    DepthPricer(notional=200.0, edge_threshold=0.0, batch_size=2).enrich(replicator, results)
+    single, calendar, unhedged = results
+
+    # No: 100 @ 0.70 + 100 @ 0.75. Far hedge: 0.4 spreads, lower leg 0.3 @ 0.0300 + 0.1 @ 0.0310, upper @ 0.0290
+    assert single["exec_poly_prob"] == pytest.approx(1 - 0.725)
+    debit = ((0.3 * 0.0300 + 0.1 * 0.0310) / 0.4 - 0.0290) * 100000.0
+    assert single["exec_ref_prob"] == pytest.approx(2 * debit / 1000.0)
+    assert single["exec_edge"] == pytest.approx(single["exec_poly_prob"] - single["exec_ref_prob"])
+
+    # Calendar: 75% on 0.3 far spreads, 25% on 0.05 near spreads, each at its own spot and width
+    far_debit = (0.0300 - 0.0290) * 100000.0
+    near_debit = (0.0200 - 0.0140) * 99000.0
+    assert calendar["exec_ref_prob"] == pytest.approx(0.75 * 2 * far_debit / 1000.0 + 0.25 * 2 * near_debit / 2000.0)
+
+    # Too thin for the notional: no executable quote at that size, bs_prob is the reference
+    assert unhedged["exec_poly_prob"] is None and unhedged["exec_edge"] is None
+    assert unhedged["max_size"] == pytest.approx(10.0)
+
+    # Books are batched: 3 tokens in 2 CLOB requests, one Deribit request per leg
+    paths = [r["path"] for r in book_server.requests]
+    assert paths.count("/books") == 2
+    assert paths.count("/api/v2/public/get_order_book") == 4
+
+def test_max_size_is_the_largest_size_above_the_threshold(replicator):
+    pricer = DepthPricer(notional=10.0, edge_threshold=0.03)
+    results = [result("no-1", FAR), result("no-2", dict(FAR, near=NEAR))]
+    pricer.enrich(replicator, results)
+    leg_books, token_books = pricer.fetch_books(replicator, results)
+
+    for r, token in zip(results, ("no-1", "no-2")):
+        size = r["max_size"]
+        no_book = token_books[token]
+        assert 0 < size
+        assert pricer.edge_at(r, no_book, leg_books, size)[2] >= pricer.edge_threshold
+        above = pricer.edge_at(r, no_book, leg_books, size * 1.001 + 1e-6)[2]
+        assert not above >= pricer.edge_threshold # Below the threshold, or past the books' depth (NaN)
+
+def test_empty_and_failed_leg_books(replicator):
+    empty = dict(FAR, near=dict(NEAR, legs=("BTC-13FEB26-100000-C", "BTC-13FEB26-105000-C")))
+    failed = dict(FAR, near=dict(NEAR, legs=("BTC-13FEB26-100000-C", "BTC-13FEB26-999999-C")))
+    results = [result("no-1", empty), result("no-1", failed)]
+    DepthPricer(notional=10.0, edge_threshold=-1.0).enrich(replicator, results)
+
+    # An empty near leg can't be filled at any size; a failed fetch leaves the result unpriced
+    assert results[0]["exec_edge"] is None and results[0]["max_size"] == 0.0
+    assert results[1]["exec_edge"] is None and results[1]["max_size"] is None
+
+def test_digital_hedges_use_their_scale(replicator):
+    # An above/below market: debit / width per spread, N / width spreads for N No shares
+    digital = dict(FAR, scale=1.0)
+    r = result("no-1", digital)
+    DepthPricer(notional=200.0, edge_threshold=0.0).enrich(replicator, [r])
+    debit = (0.0300 - 0.0290) * 100000.0 # 0.2 spreads: within the best levels
+    assert r["exec_ref_prob"] == pytest.approx(debit / 1000.0)
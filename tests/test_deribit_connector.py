@@ -0,0 +1,69 @@
+import json
+
+import numpy as np
+import pandas as pd
+
+from deribit_connector import DeribitConnector
+from http_cache import ResponseCache
+
+def summary(name, mark, bid, ask, spot, iv=60.0):
+    return {"instrument_name": name, "mark_price": mark, "bid_price": bid, "ask_price": ask, "mark_iv": iv,
+            "underlying_price": spot, "open_interest": 12.0, "volume_usd_24h": 3400.0}
+
+# get_book_summary_by_currency(USDC, option): prices in USDC, several underlyings on one book
+USDC_SUMMARIES = [
+    summary("SOL_USDC-30JAN26-150-C", 7.5, 7.0, 8.0, 150.0, iv=80.0),
+    summary("XRP_USDC-30JAN26-2-C", 0.1, 0.09, 0.11, 2.0),
+]
+BTC_SUMMARIES = [
+    summary("BTC-27FEB26-100000-C", 0.05, 0.049, 0.051, 100000.0),
+    summary("BTC-30JAN26-95000-P", 0.02, None, 0.021, 99500.0), # No bid
+    summary("BTC-27FEB26-90000-P", 0.01, 0.009, 0.011, 100000.0),
+    summary("BTC-PERPETUAL", 100000.0, 99999.0, 100001.0, 100000.0), # Not an option name
+]
+
+def connector(currency, server=None):
+    deribit = DeribitConnector(currency, http=ResponseCache(None))
+    if server is not None:
+        deribit.BASE_URL = server.url + "/api/v2"
+    return deribit
+
+def test_parse_summaries_columns():
+    df = connector("BTC").parse_summaries(BTC_SUMMARIES)
+    assert list(df.columns) == ["instrument", "expiry", "strike", "type", "mark_price", "bid", "ask", "mark_iv",
+                                "underlying_price", "open_interest", "volume_usd", "expiry_dt"]
+    assert df["instrument"].tolist() == ["BTC-27FEB26-100000-C", "BTC-30JAN26-95000-P", "BTC-27FEB26-90000-P"]
+    assert isinstance(df["expiry"].dtype, pd.CategoricalDtype)
+    assert isinstance(df["type"].dtype, pd.CategoricalDtype)
+    assert df["expiry"].tolist() == ["2026-02-27", "2026-01-30", "2026-02-27"]
+    assert df["type"].tolist() == ["call", "put", "put"]
+    assert df["strike"].dtype == float and df["strike"].tolist() == [100000.0, 95000.0, 90000.0]
+    assert pd.api.types.is_datetime64_dtype(df["expiry_dt"])
+    assert df["expiry_dt"].tolist() == [pd.Timestamp("2026-02-27"), pd.Timestamp("2026-01-30"), pd.Timestamp("2026-02-27")]
+    assert df["bid"].isna().tolist() == [False, True, False]
+    assert df["ask"].tolist() == [0.051, 0.021, 0.011]
+    assert df["volume_usd"].tolist() == [3400.0] * 3
+
+def test_parse_summaries_empty():
+    assert connector("BTC").parse_summaries([]).empty
+    assert connector("BTC").parse_summaries([summary("BTC-PERPETUAL", 1.0, 1.0, 1.0, 1.0)]).empty
+
+def test_linear_book_is_filtered_and_scaled(stub_server):
+    server = stub_server({"/api/v2/public/get_book_summary_by_currency":
+                          lambda request: (200, {"Content-Type": "application/json"}, json.dumps({"result": USDC_SUMMARIES}))})
+    df = connector("SOL", server).get_option_chain_summary()
+
+    assert server.requests[0]["query"] == {"currency": ["USDC"], "kind": ["option"]}
+    assert df["instrument"].tolist() == ["SOL_USDC-30JAN26-150-C"]
+    assert df["expiry"].tolist() == ["2026-01-30"] and df["strike"].tolist() == [150.0]
+    assert df["expiry_dt"].tolist() == [pd.Timestamp("2026-01-30")]
+    # USDC prices in SOL, like the inverse books' prices in BTC
+    np.testing.assert_allclose(df[["mark_price", "bid", "ask"]].to_numpy()[0], [7.5 / 150, 7.0 / 150, 8.0 / 150])
+    assert df["underlying_price"].tolist() == [150.0] and df["mark_iv"].tolist() == [80.0]
+
+def test_inverse_books_are_not_scaled(stub_server):
+    server = stub_server({"/api/v2/public/get_book_summary_by_currency":
+                          lambda request: (200, {"Content-Type": "application/json"}, json.dumps({"result": BTC_SUMMARIES}))})
+    df = connector("BTC", server).get_option_chain_summary()
+    assert server.requests[0]["query"]["currency"] == ["BTC"]
+    assert df["mark_price"].tolist() == [0.05, 0.02, 0.01]
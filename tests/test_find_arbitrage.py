@@ -0,0 +1,90 @@
+import json
+
+import pandas as pd
+import pytest
+
+from benchmark import FakePolymarketScanner
+
+SPOT = 100000.0
+# (strike, call mark, put mark) in BTC, one expiry settling after every market
+MARKS = [
+    (90000.0, 0.1110, 0.0105),
+    (95000.0, 0.0760, 0.02375),
+    (100000.0, 0.04875, 0.04475),
+    (105000.0, 0.0286, 0.0730),
+    (110000.0, 0.0155, 0.1090),
+]
+MARK = {(k, t): p for k, c, p_ in MARKS for t, p in (("C", c), ("P", p_))}
+
+class Chain:
+    """MARKS with strikes and spot scaled by `scale` (prices in underlying units are unchanged)"""
+
+    def __init__(self, currency="BTC", scale=1.0):
+        self.currency = currency
+        self.scale = scale
+
+    def get_option_chain_summary(self):
+        return pd.DataFrame({
+            "instrument": [f"{self.currency}-20FEB26-{int(k * self.scale)}-{t}" for k, t in MARK],
+            "expiry": ["2026-02-20"] * len(MARK),
+            "strike": [k * self.scale for k, _ in MARK],
+            "type": ["call" if t == "C" else "put" for _, t in MARK],
+            "mark_price": list(MARK.values()),
+            "bid": list(MARK.values()),
+            "ask": list(MARK.values()),
+            "mark_iv": [60.0] * len(MARK),
+            "underlying_price": [SPOT * self.scale] * len(MARK),
+        })
+
+def scan(questions, chains=None):
+    """find_arbitrage over {id: (question, yes price)} against stub chains ({asset: Chain}): {id: Opportunity}"""
+    chains = chains or {"BTC": Chain()}
+    markets = [{"id": key, "question": q, "slug": key, "endDate": "2026-02-19T23:59:00Z",
+                "outcomePrices": json.dumps([str(p), str(1 - p)])} for key, (q, p) in questions.items()]
+    scanner = FakePolymarketScanner(markets, assets=tuple(chains))
+    scanner.deribit_connectors.update(chains)
+    by_question = {q: key for key, (q, _) in questions.items()}
+    return {by_question[op["question"]]: op for op in scanner.find_arbitrage()}
+
+def spread(lower, upper, t):
+    value = MARK[(lower, t)] - MARK[(upper, t)] if t == "C" else MARK[(upper, t)] - MARK[(lower, t)]
+    return value * SPOT / (upper - lower)
+
+def test_dip_market_is_priced_off_put_spreads():
+    # P(S_T < 93k) from the 90k/95k puts is 0.265: a 0.30 dip touch is fairly priced.
+    # Bracketed with calls it would read as P(S_T > 93k) = 0.70 and a false "Buy Poly".
+    ops = scan({"dip": ("Will Bitcoin dip to $93,000 by February 19?", 0.30)})
+    assert ops == {}
+
+    ops = scan({"dip": ("Will Bitcoin dip to $93,000 by February 19?", 0.20)})
+    op = ops["dip"]
+    assert (op["type"], op["kind"], op["direction"]) == ("Buy Poly (Undervalued)", "touch", "down")
+    assert op["deribit_euro_price"] == pytest.approx(spread(90000.0, 95000.0, "P"))
+    assert op["spread"] == "90000.0-95000.0 puts"
+
+def test_above_and_below_markets_are_compared_with_the_digital():
+    ops = scan({
+        "above": ("Will the price of Bitcoin be above $102,000 on February 19?", 0.80),
+        "below": ("Will the price of Bitcoin be below $97,000 on February 19?", 0.10),
+        "fair": ("Will the price of Bitcoin be above $97,000 on February 19?", 0.55),
+    })
+    assert set(ops) == {"above", "below"}
+    # A digital has no touch premium: priced over the spread it is simply rich
+    assert ops["above"]["type"] == "Sell Poly (Overpriced)"
+    assert ops["above"]["deribit_euro_price"] == pytest.approx(spread(100000.0, 105000.0, "C"))
+    assert ops["below"]["type"] == "Buy Poly (Undervalued)"
+    assert ops["below"]["deribit_euro_price"] == pytest.approx(spread(95000.0, 100000.0, "P"))
+
+def test_up_touch_keeps_call_spreads():
+    ops = scan({"hit": ("Will Bitcoin hit $107,000 by February 19?", 0.05)})
+    assert ops["hit"]["spread"] == "105000.0-110000.0 calls"
+    assert ops["hit"]["deribit_euro_price"] == pytest.approx(spread(105000.0, 110000.0, "C"))
+
+def test_each_asset_is_priced_off_its_own_chain():
+    ops = scan({
+        "btc": ("Will Bitcoin dip to $93,000 by February 19?", 0.20),
+        "eth": ("Will Ethereum dip to $2,790 by February 19?", 0.20),
+    }, chains={"BTC": Chain(), "ETH": Chain("ETH", scale=0.03)})
+    assert (ops["btc"]["asset"], ops["eth"]["asset"]) == ("BTC", "ETH")
+    assert ops["eth"]["spread"] == "2700.0-2850.0 puts"
+    assert ops["eth"]["deribit_euro_price"] == pytest.approx(ops["btc"]["deribit_euro_price"])
@@ -0,0 +1,111 @@
+import os
+import json
+import stat
+
+import pytest
+
+import http_cache
+from http_cache import ResponseCache
+
+class Clock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(http_cache.time, "time", clock.time)
+    return clock
+
+@pytest.fixture
+def markets_server(stub_server):
+    """Gamma-like /markets endpoint with an ETag; honours If-None-Match"""
+    state = {"etag": '"v1"', "body": [{"id": "1", "question": "Will Bitcoin hit $100k?"}]}
+
+    def markets(request):
+        if request["headers"].get("If-None-Match") == state["etag"]:
+            return 304, {"ETag": state["etag"]}, ""
+        return 200, {"ETag": state["etag"], "Content-Type": "application/json"}, json.dumps(state["body"])
+
+    server = stub_server({"/markets": markets})
+    server.state = state
+    return server
+
+def test_fresh_entries_are_served_without_a_request(tmp_path, clock, markets_server):
+    cache = ResponseCache(str(tmp_path), ttls={"markets": 10.0})
+    url = markets_server.url + "/markets"
+
+    first = cache.get(url, params={"limit": 5})
+    clock.now += 9.0
+    second = cache.get(url, params={"limit": 5})
+
+    assert first.json() == second.json() == markets_server.state["body"]
+    assert getattr(second, "from_cache", False)
+    assert len(markets_server.requests) == 1
+    assert cache.stats() == {"hits": 1, "revalidated": 0, "misses": 1}
+
+def test_params_are_part_of_the_key(tmp_path, clock, markets_server):
+    cache = ResponseCache(str(tmp_path), ttls={"markets": 10.0})
+    url = markets_server.url + "/markets"
+    cache.get(url, params={"offset": 0})
+    cache.get(url, params={"offset": 500})
+    assert len(markets_server.requests) == 2
+
+def test_stale_entries_are_revalidated_with_the_etag(tmp_path, clock, markets_server):
+    cache = ResponseCache(str(tmp_path), ttls={"markets": 10.0})
+    url = markets_server.url + "/markets"
+    cache.get(url)
+
+    clock.now += 10.5 # Past the TTL
+    resp = cache.get(url)
+    assert markets_server.requests[-1]["headers"].get("If-None-Match") == '"v1"'
+    assert resp.json() == markets_server.state["body"] # Served from the entry after the 304
+    assert cache.stats() == {"hits": 0, "revalidated": 1, "misses": 1}
+
+    # The 304 renewed the entry: fresh again for a full TTL
+    clock.now += 9.0
+    cache.get(url)
+    assert len(markets_server.requests) == 2
+    assert cache.hits == 1
+
+def test_changed_resources_are_downloaded_again(tmp_path, clock, markets_server):
+    cache = ResponseCache(str(tmp_path), ttls={"markets": 10.0})
+    url = markets_server.url + "/markets"
+    cache.get(url)
+
+    markets_server.state.update(etag='"v2"', body=[{"id": "2"}])
+    clock.now += 11.0
+    resp = cache.get(url)
+    assert resp.status_code == 200
+    assert resp.json() == [{"id": "2"}]
+
+    clock.now += 1.0
+    assert cache.get(url).json() == [{"id": "2"}]
+    assert len(markets_server.requests) == 2
+
+def test_zero_ttl_and_pass_through(tmp_path, clock, markets_server):
+    url = markets_server.url + "/markets"
+    ResponseCache(str(tmp_path), ttls={}).get(url)
+    ResponseCache(str(tmp_path), ttls={}).get(url) # TTL 0: always revalidated
+    assert markets_server.requests[-1]["headers"].get("If-None-Match") == '"v1"'
+
+    n = len(markets_server.requests)
+    ResponseCache(None).get(url)
+    ResponseCache(None).get(url)
+    assert len(markets_server.requests) == n + 2
+    assert "If-None-Match" not in markets_server.requests[-1]["headers"]
+
+def test_markets_ttl_is_below_the_polling_feed_interval():
+    from touch_streamer import PolymarketPollingFeed
+    assert ResponseCache.DEFAULT_TTLS["markets"] < PolymarketPollingFeed(None).interval
+
+@pytest.mark.skipif(not hasattr(os, "getuid"), reason="POSIX ownership")
+def test_default_cache_dir_is_private_to_the_user(tmp_path, monkeypatch):
+    monkeypatch.setattr(http_cache.tempfile, "gettempdir", lambda: str(tmp_path))
+    root = http_cache.default_cache_dir()
+    assert os.path.dirname(root) == str(tmp_path)
+    assert os.path.basename(root).startswith("touch_replicator_http-")
+    assert stat.S_IMODE(os.stat(root).st_mode) & 0o077 == 0
@@ -0,0 +1,22 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def loaded_after(statement, modules):
+    """Which of `modules` a fresh interpreter has loaded after running `statement`"""
+    code = f"import sys\n{statement}\nprint(' '.join(m for m in {modules!r} if m in sys.modules))"
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, check=True, capture_output=True, text=True)
+    return set(out.stdout.split())
+
+@pytest.mark.parametrize("module", ["polymarket_touch_scanner", "bs_models", "cli", "touch_replicator", "deribit_connector",
+                                    "option_chain_index"])
+def test_heavy_dependencies_stay_off_the_import_path(module):
+    assert loaded_after(f"import {module}", ["pandas", "scipy"]) == set()
+
+def test_scipy_loads_on_the_first_array_call():
+    statement = "import bs_models\nbs_models.norm_cdf(0.5)\nassert 'scipy' not in sys.modules\nbs_models.norm_cdf([0.5])"
+    assert loaded_after(statement, ["scipy"]) == {"scipy"}
@@ -0,0 +1,34 @@
+import pytest
+
+from benchmark import BENCH_NOW, FakeDeribitConnector, FakePolymarketScanner, synthetic_markets, synthetic_summaries
+from instrumentation import Instrumentation
+from touch_replicator import TouchReplicator
+
+def test_batch_samples_count_every_item():
+    metrics = Instrumentation(buckets=(1e-3, 1e-2))
+    metrics.observe("op", 0.004, n=5)
+    metrics.observe("op", 0.02)
+    hist = metrics.as_dict()["latency"]["op"]
+    assert hist["buckets"] == {1e-3: 0, 1e-2: 5, float("inf"): 6}
+    assert hist["count"] == 6
+    assert hist["sum"] == pytest.approx(0.04)
+
+def test_batch_pricing_records_per_market_latency():
+    metrics = Instrumentation()
+    rep = TouchReplicator(
+        deribit=FakeDeribitConnector(synthetic_summaries(2000)),
+        poly_scanner=FakePolymarketScanner(synthetic_markets(120)),
+        clock=lambda: BENCH_NOW,
+        instrumentation=metrics,
+    )
+    rep.fetch_option_chains()
+    details = rep.fetch_market_details()
+    rep.price_markets(details)
+
+    data = metrics.as_dict()
+    live = [d for d in details if d["expiry"] >= BENCH_NOW.strftime("%Y-%m-%d")]
+    hist = data["latency"]["market_inputs"]
+    assert hist["count"] == len(live)
+    # The samples add up to the batch's wall time
+    assert hist["sum"] == pytest.approx(data["stages"]["market_inputs"]["seconds"], rel=0.05)
+    assert 'touch_latency_seconds_count{op="market_inputs"} %d' % len(live) in metrics.prometheus_text()
@@ -0,0 +1,79 @@
+import pytest
+
+from market_classifier import MarketClassifier, corpus_errors
+from polymarket_touch_scanner import PolymarketTouchScanner
+
+# Labelled questions: question -> (asset, kind, direction, strike, strike_high, window), None if not a scanned asset
+LABELLED_QUESTIONS = [
+    ("Will Bitcoin reach $120,000 in February 2026?", ("BTC", "touch", "up", 120000.0, None, "in February 2026")),
+    ("Will Bitcoin dip to $80,000 in February 2026?", ("BTC", "touch", "down", 80000.0, None, "in February 2026")),
+    ("Will Bitcoin hit $100k by December 31?", ("BTC", "touch", "up", 100000.0, None, "by December 31")),
+    ("Will BTC hit $150K before 2027?", ("BTC", "touch", "up", 150000.0, None, "before 2027")),
+    ("Will Bitcoin hit $1M by the end of 2030?", ("BTC", "touch", "up", 1000000.0, None, "by the end of 2030")),
+    ("Will Bitcoin reach $1.5 million before 2035?", ("BTC", "touch", "up", 1500000.0, None, "before 2035")),
+    ("Will Bitcoin drop to $90k this week?", ("BTC", "touch", "down", 90000.0, None, "this week")),
+    ("Will Bitcoin fall below $75,000 by March 31, 2026?", ("BTC", "touch", "down", 75000.0, None, "by March 31, 2026")),
+    ("Will Bitcoin crash to $50k in 2026?", ("BTC", "touch", "down", 50000.0, None, "in 2026")),
+    ("Will the price of Bitcoin be above $105,000 on March 1?", ("BTC", "above", "up", 105000.0, None, "on March 1")),
+    ("Will the price of Bitcoin be below $95,000 on March 1?", ("BTC", "above", "down", 95000.0, None, "on March 1")),
+    ("Bitcoin above $110,000 on February 28?", ("BTC", "above", "up", 110000.0, None, "on February 28")),
+    ("Will Bitcoin close higher than $100,000 today?", ("BTC", "above", "up", 100000.0, None, "today")),
+    ("Will Bitcoin close lower than $98k tomorrow?", ("BTC", "above", "down", 98000.0, None, "tomorrow")),
+    ("Will Bitcoin be less than $90,000 at the end of Q1?", ("BTC", "above", "down", 90000.0, None, "at the end of Q1")),
+    ("Will the price of Bitcoin be between $90,000 and $95,000 on March 1?", ("BTC", "range", None, 90000.0, 95000.0, "on March 1")),
+    ("Bitcoin price on March 1: $95,000-$100,000?", ("BTC", "range", None, 95000.0, 100000.0, "on March 1")),
+    ("Will Bitcoin close between $100k and $105k this week?", ("BTC", "range", None, 100000.0, 105000.0, "this week")),
+    ("Bitcoin $90-95k on Friday?", ("BTC", "range", None, 90000.0, 95000.0, "on Friday")),
+    ("Will Bitcoin hit $100k or $80k first?", ("BTC", "touch", "up", None, None, None)),
+    ("What price will Bitcoin hit in February 2026?", ("BTC", "touch", "up", None, None, "in February 2026")),
+    ("Bitcoin Up or Down on March 1?", ("BTC", None, "up", None, None, "on March 1")),
+    ("Will Bitcoin reach a new all-time high in 2026?", ("BTC", "touch", "up", None, None, "in 2026")),
+    ("Will Ethereum reach $5,000 by June 30?", ("ETH", "touch", "up", 5000.0, None, "by June 30")),
+    ("Will ETH dip to $2,500 in March?", ("ETH", "touch", "down", 2500.0, None, "in March")),
+    ("Will Ether be above $4,200 on Dec 31?", ("ETH", "above", "up", 4200.0, None, "on Dec 31")),
+    ("Will the price of Ethereum be between $3,000 and $3,200 on April 4?", ("ETH", "range", None, 3000.0, 3200.0, "on April 4")),
+    ("Will Solana hit $300 in 2026?", ("SOL", "touch", "up", 300.0, None, "in 2026")),
+    ("Will SOL sink to $120 by May?", ("SOL", "touch", "down", 120.0, None, "by May")),
+    ("Will Solana be above $250.50 on January 15?", ("SOL", "above", "up", 250.5, None, "on January 15")),
+    ("Will Bitcoin surge to $130,000 next month?", ("BTC", "touch", "up", 130000.0, None, "next month")),
+    ("Will Bitcoin exceed $200k by 2027?", ("BTC", "touch", "up", 200000.0, None, "by 2027")),
+    ("Will Bitcoin trade over $99,999.99 on 12/31?", ("BTC", "above", "up", 99999.99, None, "on 12/31")),
+    ("Will BTC be under $60K by end of year?", ("BTC", "above", "down", 60000.0, None, "by end of year")),
+    ("Will MicroStrategy buy more Bitcoin in March?", ("BTC", None, "up", None, None, "in March")),
+    ("Will Bitcoin ETF inflows top $1B this week?", ("BTC", None, "up", None, None, "this week")), # A flow, not a price level
+    ("Will the Fed cut rates in March?", None),
+    ("Will Dogecoin hit $1 in 2026?", None),
+    ("Will Nvidia reach $200 by June?", None),
+    ("BTCUSD above $100k?", None),
+]
+
+
+def test_labelled_corpus():
+    errors = corpus_errors(LABELLED_QUESTIONS)
+    assert errors == [], "\n".join(f"{q}\n  expected {e}\n  got      {g}" for q, e, g in errors)
+
+@pytest.mark.parametrize("question, expected", [
+    ("Will Bitcoin reach $120,000 in February 2026?", True),
+    ("Will Bitcoin fall below $75,000 by March 31, 2026?", True),
+    ("Will the price of Bitcoin be below $95,000 on March 1?", True),
+    ("Will the price of Bitcoin be between $90,000 and $95,000 on March 1?", False), # Ranges are not priced
+    ("Will Bitcoin hit $100k or $80k first?", False), # No single strike
+    ("Bitcoin Up or Down on March 1?", False),
+    ("Will Ethereum reach $5,000 by June 30?", False), # Not a scanned asset
+])
+def test_scanner_filter_takes_priced_kinds_with_one_strike(question, expected):
+    assert PolymarketTouchScanner(assets=("BTC",)).is_touch_market({"question": question}) is expected
+
+def test_assets_limit_the_scan():
+    classifier = MarketClassifier(assets=("ETH",))
+    assert classifier.classify("Will Bitcoin hit $100k by December 31?") is None
+    assert classifier.classify("Will Ether be above $4,200 on Dec 31?").asset == "ETH"
+
+def test_scanner_classifies_each_question_once():
+    scanner = PolymarketTouchScanner(assets=("BTC",))
+    markets = [{"id": str(i), "question": q, "endDate": "2026-12-31T00:00:00Z"} for i, (q, _) in enumerate(LABELLED_QUESTIONS)]
+    kept = [m for m in markets if scanner.is_touch_market(m)]
+    parsed = [scanner.parse_market_details(m) for m in kept]
+    assert all(parsed) and len(parsed) > 10
+    # The filter's classification is reused by the parser
+    assert scanner.classify.cache_info().misses == len(markets)
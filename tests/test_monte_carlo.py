@@ -0,0 +1,42 @@
+import numpy as np
+
+from bs_models import BlackScholesModels
+from monte_carlo import MonteCarloTouchPricer
+
+# Two up touches and one down touch, 30 days out; r = sigma^2 / 2 zeroes the log drift
+S, K, T, SIGMA = 100.0, np.array([105.0, 110.0, 95.0]), 30 / 365, 0.6
+R = 0.5 * SIGMA**2
+
+def test_matches_closed_form_within_three_standard_errors():
+    prob, se = MonteCarloTouchPricer(seed=1, steps_per_day=4).price(S, K, T, SIGMA, R)
+    exact = BlackScholesModels.one_touch_probability_batch(S, K, T, SIGMA, R)
+    assert np.all(np.abs(prob - exact) <= 3 * se)
+
+def test_seed_is_reproducible():
+    first = MonteCarloTouchPricer(seed=7).price(S, K, T, SIGMA, R)
+    second = MonteCarloTouchPricer(seed=7).price(S, K, T, SIGMA, R)
+    np.testing.assert_array_equal(first[0], second[0])
+    np.testing.assert_array_equal(first[1], second[1])
+
+def test_antithetic_paths_lower_the_standard_error():
+    kwargs = dict(seed=1, target_se=None, max_paths=20000)
+    _, paired = MonteCarloTouchPricer(antithetic=True, **kwargs).price(S, K, T, SIGMA, R)
+    _, plain = MonteCarloTouchPricer(antithetic=False, **kwargs).price(S, K, T, SIGMA, R)
+    assert np.all(paired < plain)
+
+def test_stops_at_target_standard_error():
+    target = 0.01
+    pricer = MonteCarloTouchPricer(seed=1, chunk_paths=1000, min_paths=1000, max_paths=1_000_000, target_se=target)
+    _, se = pricer.price(S, K, T, SIGMA, R)
+    # Stopped by the tolerance, within a chunk of it, long before max_paths
+    assert np.all(se <= target)
+    assert np.all(se > target / 2)
+
+def test_bgk_shift_tracks_discrete_monitoring():
+    # Daily fixings: the exact grid check is the reference
+    discrete, _ = MonteCarloTouchPricer(seed=1, monitoring=86400, bridge=False, target_se=0.002,
+                                        max_paths=400000).price(S, K, T, SIGMA, R)
+    shifted, _ = MonteCarloTouchPricer(seed=2, monitoring=86400).price(S, K, T, SIGMA, R)
+    unshifted, _ = MonteCarloTouchPricer(seed=2).price(S, K, T, SIGMA, R)
+    assert np.all(np.abs(shifted - discrete) < np.abs(unshifted - discrete))
+    assert np.all(np.abs(shifted - discrete) < 0.01)
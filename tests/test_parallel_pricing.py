@@ -0,0 +1,23 @@
+from benchmark import make_replicator, synthetic_markets, synthetic_summaries
+from instrumentation import Instrumentation
+from parallel_pricing import ParallelPricer
+
+def test_matches_in_process_pricing():
+    replicator = make_replicator(synthetic_summaries(400), synthetic_markets(120))
+    replicator.metrics = Instrumentation()
+    replicator.fetch_option_chains()
+    details = replicator.fetch_market_details()
+    replicator.metrics.reset()
+
+    serial = replicator.price_markets(details)
+    serial_stages = dict(replicator.metrics.stages)
+    replicator.metrics.reset()
+
+    parallel = ParallelPricer(workers=2, chunk_size=25, min_markets=0).price(replicator, details)
+    assert len(parallel) == len(serial) > 0
+    assert [repr(r) for r in parallel] == [repr(r) for r in serial] # Same results, same order
+
+    # Worker stage timings are merged into the caller's metrics, one call per chunk
+    stages = replicator.metrics.stages
+    assert set(stages) == set(serial_stages)
+    assert stages["bs_batch"][1] == 5
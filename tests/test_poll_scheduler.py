@@ -0,0 +1,125 @@
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmark import BENCH_NOW, FakeDeribitConnector, SimulatedPolymarketScanner, synthetic_markets, synthetic_summaries
+from poll_scheduler import CHAIN_ENDPOINT, MARKETS_ENDPOINT, EndpointLimiter, PollScheduler, SimulatedClock
+from touch_replicator import TouchReplicator
+
+@pytest.fixture
+def clock():
+    return SimulatedClock(start=1000.0)
+
+def drain(limiter):
+    n = 0
+    while limiter.acquire():
+        n += 1
+    return n
+
+def test_token_bucket_bursts_then_refills_at_the_rate(clock):
+    limiter = EndpointLimiter(rate=2.0, burst=5, clock=clock.time)
+    assert drain(limiter) == 5
+    assert limiter.ready_at() == pytest.approx(clock.time() + 0.5)
+
+    clock.sleep(0.49)
+    assert not limiter.acquire()
+    clock.sleep(0.01)
+    assert limiter.acquire()
+
+    clock.sleep(3600.0) # Idle time never banks more than a burst
+    assert drain(limiter) == 5
+    assert limiter.requests == 11
+
+def test_costs_above_the_burst_are_clipped(clock):
+    limiter = EndpointLimiter(rate=1.0, burst=4, clock=clock.time)
+    assert limiter.ready_at(10) == clock.time()
+    assert limiter.acquire(10)
+    assert limiter.ready_at(10) == pytest.approx(clock.time() + 4.0)
+    assert limiter.requests == 4
+
+def test_backoff_doubles_up_to_the_cap_and_resets_on_success(clock):
+    limiter = EndpointLimiter(rate=100.0, burst=100, backoff=2.0, max_backoff=30.0, clock=clock.time)
+    waits = []
+    for _ in range(6):
+        limiter.failure()
+        start = clock.time()
+        waits.append(limiter.ready_at() - start)
+        clock.sleep(waits[-1] - 1e-6)
+        assert not limiter.acquire()
+        clock.sleep(1e-6)
+        assert limiter.acquire()
+    assert waits == pytest.approx([2.0, 4.0, 8.0, 16.0, 30.0, 30.0])
+
+    limiter.success()
+    limiter.failure()
+    assert limiter.ready_at() - clock.time() == pytest.approx(2.0)
+    assert limiter.errors == 7
+
+class CountingChain(FakeDeribitConnector):
+    """Fake chain recording fetch times; `fail_until` makes fetches return an empty chain"""
+
+    def __init__(self, summaries, clock, fail_until=-1.0):
+        super().__init__(summaries)
+        self.clock = clock
+        self.fail_until = fail_until
+        self.calls = []
+
+    def get_option_chain_summary(self):
+        self.calls.append(self.clock.time())
+        if self.clock.time() < self.fail_until:
+            return pd.DataFrame()
+        return super().get_option_chain_summary()
+
+def build_scheduler(clock, chain, rate_limits=None, n_markets=150):
+    universe = synthetic_markets(n_markets)
+    scanner = SimulatedPolymarketScanner(universe, lambda i, t: 0.3 + 0.2 * np.sin(i + t / 60.0), clock)
+    calls = []
+    fetch, iterate = scanner.fetch_markets_by_id, scanner.iter_polymarket_touch_markets
+    scanner.fetch_markets_by_id = lambda ids: calls.append((clock.time(), 1)) or fetch(ids)
+    scanner.iter_polymarket_touch_markets = lambda: calls.append((clock.time(), None)) or iterate()
+    replicator = TouchReplicator(
+        deribit=chain, poly_scanner=scanner,
+        clock=lambda: BENCH_NOW + timedelta(seconds=clock.time()),
+    )
+    # Intervals of a few seconds: more due batches than the limits allow
+    scheduler = PollScheduler(replicator, min_interval=1.0, max_interval=5.0, batch_size=10, rate_limits=rate_limits,
+                              clock=clock.time, sleep=clock.sleep)
+    return scheduler, calls
+
+def max_in_window(times, costs, window):
+    """Most requests sent within any `window` seconds"""
+    times, costs = np.asarray(times, dtype=float), np.asarray(costs, dtype=float)
+    return max((costs[(times >= t) & (times < t + window)].sum() for t in times), default=0.0)
+
+def test_scheduler_stays_within_the_rate_limits(clock):
+    chain = CountingChain(synthetic_summaries(1000), clock)
+    limits = {CHAIN_ENDPOINT: (0.1, 2), MARKETS_ENDPOINT: (1.0, 8)}
+    scheduler, calls = build_scheduler(clock, chain, rate_limits=limits, n_markets=80)
+    start = clock.time()
+    scheduler.run(duration=300.0)
+
+    assert clock.time() == pytest.approx(start + 300.0)
+    markets_costs = [cost or scheduler.discovery_cost() for _, cost in calls]
+    markets_times = [t for t, _ in calls]
+    # Busy enough to spend (nearly) the whole budget of both endpoints
+    assert sum(markets_costs) > 0.9 * (8 + 1.0 * 300.0)
+    assert len(chain.calls) > 0.9 * (2 + 0.1 * 300.0)
+    for times, costs, (rate, burst) in ((chain.calls, [1] * len(chain.calls), limits[CHAIN_ENDPOINT]),
+                                        (markets_times, markets_costs, limits[MARKETS_ENDPOINT])):
+        for window in (1.0, 10.0, 60.0, 600.0):
+            assert max_in_window(times, costs, window) <= burst + rate * window + 1e-9
+    assert scheduler.limiters[MARKETS_ENDPOINT].requests == sum(markets_costs)
+
+def test_failed_chain_fetches_back_off(clock):
+    chain = CountingChain(synthetic_summaries(1000), clock, fail_until=clock.time() + 100.0)
+    scheduler, _ = build_scheduler(clock, chain, n_markets=20)
+    scheduler.run(duration=300.0)
+
+    gaps = np.diff(chain.calls)
+    failed = [t for t in chain.calls if t < chain.fail_until]
+    # Attempts 2 s, 4 s, 8 s, ... apart while the chain is down, then priced normally
+    assert gaps[:len(failed) - 1] == pytest.approx([2.0 * 2 ** k for k in range(len(failed) - 1)])
+    assert scheduler.limiters[CHAIN_ENDPOINT].errors == len(failed)
+    assert scheduler.results
@@ -0,0 +1,83 @@
+import json
+import threading
+import time
+
+from http_cache import ResponseCache
+from polymarket_touch_scanner import PolymarketTouchScanner
+
+def canned_markets(n):
+    """n Gamma rows; every third is a BTC touch question"""
+    markets = []
+    for i in range(n):
+        question = f"Will Bitcoin hit ${100 + i}k by March 31?" if i % 3 == 0 else f"Will team {i} win the final?"
+        markets.append({"id": str(i), "question": question, "endDate": "2026-03-31T12:00:00Z",
+                        "outcomePrices": json.dumps(["0.2", "0.8"])})
+    return markets
+
+def gamma_stub(stub_server, markets, delay=0.0):
+    """Serves `markets` in offset/limit pages; tracks the most pages in flight at once"""
+    lock = threading.Lock()
+    state = {"in_flight": 0, "max_in_flight": 0}
+
+    def pages(request):
+        offset, limit = int(request["query"]["offset"][0]), int(request["query"]["limit"][0])
+        with lock:
+            state["in_flight"] += 1
+            state["max_in_flight"] = max(state["max_in_flight"], state["in_flight"])
+        time.sleep(delay)
+        with lock:
+            state["in_flight"] -= 1
+        return 200, {"Content-Type": "application/json"}, json.dumps(markets[offset:offset + limit])
+
+    server = stub_server({"/markets": pages})
+    server.state = state
+    return server
+
+def scanner_for(server, **kwargs):
+    return PolymarketTouchScanner(gamma_url=server.url + "/markets", http=ResponseCache(None), **kwargs)
+
+def test_pages_until_a_short_page_and_filters_as_they_arrive(stub_server):
+    markets = canned_markets(1050)
+    server = gamma_stub(stub_server, markets)
+    scanner = scanner_for(server, max_markets=None, page_size=100, fetch_workers=4)
+
+    found = list(scanner.iter_polymarket_touch_markets())
+    assert sorted(int(m["id"]) for m in found) == list(range(0, 1050, 3))
+
+    offsets = sorted(int(r["query"]["offset"][0]) for r in server.requests)
+    # Pages past the short one may already be in flight, never more than the pool
+    assert offsets[:11] == list(range(0, 1100, 100))
+    assert len(offsets) <= 11 + scanner.fetch_workers
+
+def test_cap_is_a_setting(stub_server):
+    server = gamma_stub(stub_server, canned_markets(5000))
+    found = scanner_for(server, max_markets=250, page_size=100).fetch_polymarket_touch_markets()
+
+    assert max(int(m["id"]) for m in found) < 250
+    limits = {int(r["query"]["offset"][0]): int(r["query"]["limit"][0]) for r in server.requests}
+    assert limits == {0: 100, 100: 100, 200: 50}
+
+def test_pages_are_fetched_concurrently_over_pooled_connections(stub_server):
+    server = gamma_stub(stub_server, canned_markets(800), delay=0.05)
+    scanner = scanner_for(server, max_markets=None, page_size=100, fetch_workers=4)
+
+    assert len(scanner.fetch_polymarket_touch_markets()) == len(range(0, 800, 3))
+    assert 1 < server.state["max_in_flight"] <= 4
+    # Keep-alive: at most one connection per worker for 9 pages
+    assert len(server.requests) >= 9
+    assert len({r["client"] for r in server.requests}) <= 4
+
+def test_failed_page_ends_the_listing(stub_server):
+    calls = []
+
+    def flaky(request):
+        offset = int(request["query"]["offset"][0])
+        calls.append(offset)
+        if offset >= 200:
+            return 500, {}, "not json"
+        return 200, {}, json.dumps(canned_markets(300)[offset:offset + 100])
+
+    server = stub_server({"/markets": flaky})
+    found = scanner_for(server, max_markets=None, page_size=100, fetch_workers=1).fetch_polymarket_touch_markets()
+    assert max(int(m["id"]) for m in found) < 200
+    assert sorted(calls) == [0, 100, 200]
@@ -0,0 +1,58 @@
+import os
+from datetime import datetime
+
+import pytest
+
+from result_sink import COLUMNS, JsonlSink, ParquetSink, ScanResult, load_history
+
+FIRST, SECOND = datetime(2026, 1, 5, 23, 59, 30), datetime(2026, 1, 6, 0, 0, 30)
+
+def result(market_id, edge, spread_prob=0.25):
+    return ScanResult(
+        id=market_id, asset="BTC", market=f"Will Bitcoin hit ${market_id}?", expiry="2026-02-20", strike=float(market_id),
+        poly_prob=0.30, bs_prob=0.28, spread_prob=spread_prob, iv=0.6, edge=edge, url=f"https://polymarket.com/event/{market_id}",
+        spread_details="105000.0-110000.0", hedge={"legs": ("BTC-20FEB26-105000-C", "BTC-20FEB26-110000-C")},
+    )
+
+def write_scans(sink):
+    assert sink.write([result("105000", 0.05), result("110000", 0.10, spread_prob=float("nan"))], FIRST) == 2
+    assert sink.write([result("105000", 0.07)], SECOND) == 1
+    sink.close()
+
+def check_history(path):
+    history = load_history(path)
+    assert list(history.columns) == COLUMNS
+    # Scan time first, then edge descending
+    assert list(history["id"]) == ["110000", "105000", "105000"]
+    assert list(history["scan_time"]) == [FIRST, FIRST, SECOND]
+    assert history["edge"].tolist() == [0.10, 0.05, 0.07]
+    assert history["strike"].tolist() == [110000.0, 105000.0, 105000.0]
+    assert history["spread_prob"].isna().tolist() == [True, False, False] # NaN written as null
+    assert history["long_leg"].tolist() == ["BTC-20FEB26-105000-C"] * 3
+    assert history["short_leg"].tolist() == ["BTC-20FEB26-110000-C"] * 3
+
+    one = load_history(path, market_id="105000")
+    assert one["edge"].tolist() == [0.05, 0.07]
+    later = load_history(path, since=SECOND)
+    assert later["edge"].tolist() == [0.07]
+
+def test_jsonl_round_trip(tmp_path):
+    path = str(tmp_path / "edges.jsonl")
+    write_scans(JsonlSink(path))
+    with open(path) as f:
+        assert len(f.readlines()) == 3
+    check_history(path)
+
+def test_parquet_partitions_by_scan_date(tmp_path):
+    pytest.importorskip("pyarrow")
+    root = str(tmp_path / "history")
+    write_scans(ParquetSink(root))
+    assert sorted(os.listdir(root)) == ["scan_date=2026-01-05", "scan_date=2026-01-06"]
+    assert all(name.endswith(".parquet") and not name.startswith(".")
+               for name in os.listdir(os.path.join(root, "scan_date=2026-01-05")))
+    check_history(root)
+
+def test_empty_history(tmp_path):
+    path = tmp_path / "edges.jsonl"
+    path.write_text("")
+    assert list(load_history(str(path)).columns) == COLUMNS
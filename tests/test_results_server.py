@@ -0,0 +1,74 @@
+import json
+import urllib.error
+import urllib.request
+
+import pytest
+
+from results_server import FIELDS, ResultsBoard, ResultsServer
+
+def result(market_id, asset, strike, edge, expiry="2026-02-20"):
+    return {"id": market_id, "asset": asset, "market": f"market {market_id}", "expiry": expiry,
+            "strike": strike, "edge": edge, "url": f"https://example.com/{market_id}"}
+
+RESULTS = [
+    result("a", "BTC", 100000.0, 0.05),
+    result("b", "BTC", 105000.0, None), # Unpriced edge
+    result("c", "BTC", 110000.0, 0.12),
+    result("d", "ETH", 3000.0, 0.20),
+    result("e", "BTC", 95000.0, float("nan")),
+]
+
+@pytest.fixture
+def server():
+    server = ResultsServer(ResultsBoard(), port=0).start()
+    server.board.publish(RESULTS)
+    yield server
+    server.stop()
+
+def get_json(server, path):
+    with urllib.request.urlopen(server.url + path, timeout=5) as response:
+        return json.loads(response.read())
+
+def read_event(response):
+    """data of the next SSE event"""
+    data = None
+    while True:
+        line = response.readline().decode().rstrip("\n")
+        if line.startswith("data: "):
+            data = json.loads(line[len("data: "):])
+        elif line == "" and data is not None:
+            return data
+
+def test_results_sort_puts_missing_edges_last(server):
+    body = get_json(server, "/results?asset=BTC")
+    assert [r["id"] for r in body["results"]][:2] == ["c", "a"]
+    assert {r["id"] for r in body["results"][2:]} == {"b", "e"}
+
+    body = get_json(server, "/results?asset=BTC&order=asc")
+    assert [r["id"] for r in body["results"]][:2] == ["a", "c"]
+    assert {r["id"] for r in body["results"][2:]} == {"b", "e"}
+
+def test_results_filters(server):
+    body = get_json(server, "/results?min_edge=0.1")
+    assert [r["id"] for r in body["results"]] == ["d", "c"]
+
+    body = get_json(server, "/results?asset=BTC&min_strike=100000&max_strike=105000&sort=strike&order=asc")
+    assert [r["id"] for r in body["results"]] == ["a", "b"]
+    assert body["count"] == 2
+
+    with pytest.raises(urllib.error.HTTPError) as error:
+        get_json(server, "/results?sort=market")
+    assert error.value.code == 400
+
+def test_events_stream_snapshot_then_upserts(server):
+    with urllib.request.urlopen(server.url + "/events", timeout=5) as response:
+        snapshot = read_event(response)
+        assert snapshot["snapshot"] and snapshot["fields"] == FIELDS
+        assert len(snapshot["upserts"]) == len(RESULTS)
+
+        server.board.upsert([result("a", "BTC", 100000.0, 0.07)])
+        update = read_event(response)
+        assert update["version"] == snapshot["version"] + 1
+        assert update["removed"] == []
+        (row,) = update["upserts"]
+        assert dict(zip(FIELDS, row))["edge"] == 0.07
@@ -0,0 +1,73 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from benchmark import BENCH_NOW, FakeDeribitConnector, FakePolymarketScanner, synthetic_markets, synthetic_summaries
+from snapshot_store import (ColumnarTable, ColumnarTableReader, SnapshotRecorder, record_connectors,
+                            replay_replicator)
+from touch_replicator import TouchReplicator
+
+NUMERIC, STRINGS = ["price", "size"], ["name"]
+
+def test_columnar_round_trip(tmp_path):
+    path = str(tmp_path / "table")
+    table = ColumnarTable(path, NUMERIC, STRINGS)
+    table.append({"price": [1.5, 2.5], "size": [10, None], "name": ["a", "b"]}, 2, timestamp_ns=100)
+    table.append({"price": [3.5], "name": [None]}, 1, timestamp_ns=200)
+
+    reader = ColumnarTableReader(path, NUMERIC, STRINGS)
+    assert len(reader) == 2
+    assert list(reader.timestamps) == [100, 200]
+    first = reader.numeric_columns(0)
+    assert isinstance(first["price"], np.memmap) # Zero-copy view of the file
+    assert first["price"].tolist() == [1.5, 2.5]
+    assert np.isnan(first["size"][1])
+    assert reader.decode("name", reader.string_codes(0)["name"]).tolist() == ["a", "b"]
+
+    second = reader.numeric_columns(1)
+    assert second["price"].tolist() == [3.5]
+    assert np.isnan(second["size"][0]) # Column left out of the append
+    assert reader.decode("name", reader.string_codes(1)["name"]).tolist() == [None]
+    assert (reader.latest_at(99), reader.latest_at(150), reader.latest_at(200)) == (None, 0, 1)
+
+def test_torn_write_is_dropped_on_reopen(tmp_path):
+    path = str(tmp_path / "table")
+    ColumnarTable(path, NUMERIC, STRINGS).append({"price": [1.0, 2.0], "size": [1, 2], "name": ["a", "b"]}, 2)
+    # A writer killed after its data files but before the snapshot index
+    os.remove(os.path.join(path, "snapshots.i8"))
+    assert os.path.getsize(os.path.join(path, "price.f8")) == 16
+    assert len(ColumnarTableReader(path, NUMERIC, STRINGS)) == 0
+
+    table = ColumnarTable(path, NUMERIC, STRINGS)
+    assert table.row_count == 0
+    assert os.path.getsize(os.path.join(path, "price.f8")) == 0
+    table.append({"price": [3.0], "size": [3], "name": ["b"]}, 1, timestamp_ns=300)
+
+    reader = ColumnarTableReader(path, NUMERIC, STRINGS)
+    assert len(reader) == 1
+    assert reader.numeric_columns(0)["price"].tolist() == [3.0]
+    assert reader.decode("name", reader.string_codes(0)["name"]).tolist() == ["b"]
+
+def test_records_every_currency_with_expiry_dt(tmp_path):
+    root = str(tmp_path / "snapshots")
+    chains = {"BTC": FakeDeribitConnector(synthetic_summaries(200)),
+              "ETH": FakeDeribitConnector(synthetic_summaries(200, currency="ETH", spot=3000.0, seed=1), "ETH")}
+    markets = synthetic_markets(20) + synthetic_markets(20, spot=3000.0, asset_name="Ethereum", seed=1)
+    live = TouchReplicator(deribit=chains["BTC"], poly_scanner=FakePolymarketScanner(markets, assets=("BTC", "ETH")),
+                           currencies=("BTC", "ETH"), clock=lambda: BENCH_NOW)
+    live.deribit_connectors["ETH"] = chains["ETH"]
+    record_connectors(live, SnapshotRecorder(root))
+    live.fetch_option_chains()
+    live.fetch_market_details()
+
+    replicator, replay = replay_replicator(root)
+    assert replicator.currencies == ("BTC", "ETH")
+    replay.seek(replay.timestamps()[-1])
+    for currency, connector in chains.items():
+        recorded = replicator.deribit_connectors[currency].get_option_chain_summary()
+        expected = connector.get_option_chain_summary()
+        assert recorded["instrument"].tolist() == expected["instrument"].tolist()
+        assert recorded["expiry_dt"].tolist() == expected["expiry_dt"].tolist()
+        assert pd.api.types.is_datetime64_dtype(recorded["expiry_dt"])
+    assert len(replicator.poly_scanner.fetch_polymarket_touch_markets()) == len(markets)
@@ -0,0 +1,105 @@
+import itertools
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmark import BENCH_NOW, FakeDeribitConnector, FakePolymarketScanner, synthetic_markets, synthetic_summaries
+from option_chain_index import OptionChainIndex
+from spread_optimizer import SpreadOptimizer
+from touch_replicator import TouchReplicator
+
+@pytest.fixture(scope="module")
+def index():
+    return OptionChainIndex(FakeDeribitConnector(synthetic_summaries(3000)).get_option_chain_summary())
+
+def brute_force(index, expiry, K, max_width):
+    """Cheapest (prob, k_long, k_short) over centred, quoted call pairs, one pair at a time"""
+    calls = index.columns(expiry, "call")
+    s, bid, ask, spot = calls["strike"], calls["bid"], calls["ask"], index.spot(expiry)
+    a = np.searchsorted(s, K, side="right")
+    max_offset = abs(0.5 * (s[a - 1] + s[a]) - K)
+    best = None
+    for i, j in itertools.combinations(range(len(s)), 2):
+        width = s[j] - s[i]
+        if not (s[i] <= K < s[j]) or width > max_width or abs(0.5 * (s[i] + s[j]) - K) > max_offset * (1 + 1e-12):
+            continue
+        if not (np.isfinite(ask[i]) and np.isfinite(bid[j])):
+            continue
+        debit = (ask[i] - bid[j]) * spot
+        prob = 2 * debit / width if debit > 0 else 0.0
+        if best is None or prob < best[0]:
+            best = (prob, s[i], s[j])
+    return best
+
+def test_matches_brute_force_on_the_first_covering_expiry(index):
+    strikes = np.array([88000.0, 99000.0, 100000.0, 101000.0, 104500.0, 117000.0, 131000.0])
+    poly_dates = ["2026-01-10", "2026-01-20", "2026-01-23", "2026-02-01", "2026-02-15", "2026-03-01", "2026-03-20"]
+    best = SpreadOptimizer(max_width_pct=0.10).optimize(index, strikes, poly_dates)
+
+    for i, (K, date) in enumerate(zip(strikes, poly_dates)):
+        expiry = index.next_expiry(date)
+        expected = brute_force(index, expiry, K, 0.10 * K)
+        if expected is None:
+            assert np.isnan(best["spread_prob"][i]) and best["expiry"][i] is None
+            continue
+        assert best["expiry"][i] == expiry
+        assert best["spread_prob"][i] == pytest.approx(expected[0], rel=1e-12)
+        assert best["k_long"][i] <= K < best["k_short"][i]
+        assert best["width"][i] <= 0.10 * K
+
+def chain_frame(rows):
+    """get_option_chain_summary-style frame from (expiry, strike, bid, ask) call quotes, spot 100k"""
+    return pd.DataFrame({
+        "instrument": [f"BTC-{e}-{int(k)}-C" for e, k, _, _ in rows],
+        "expiry": [e for e, _, _, _ in rows],
+        "strike": [k for _, k, _, _ in rows],
+        "type": ["call"] * len(rows),
+        "mark_price": [(b + a) / 2 for _, _, b, a in rows],
+        "bid": [b for _, _, b, _ in rows],
+        "ask": [a for _, _, _, a in rows],
+        "mark_iv": [60.0] * len(rows),
+        "underlying_price": [100000.0] * len(rows),
+    })
+
+def test_deep_in_the_money_and_later_expiries_are_not_picked():
+    # Prices in BTC. The 92k-101k pair covers 100k but is deep in the money: its debit per width
+    # overstates the touch probability. The later expiry quotes the same spreads.
+    quotes = {92000: 0.0900, 99000: 0.0300, 100000: 0.0250, 101000: 0.0210, 102000: 0.0170}
+    rows = [("2026-02-20", float(k), p, p + 0.0005) for k, p in quotes.items()]
+    rows += [("2026-02-27", float(k), p + 0.01, p + 0.0105) for k, p in quotes.items()]
+    index = OptionChainIndex(chain_frame(rows))
+
+    best = SpreadOptimizer(max_width_pct=0.10).optimize(index, [100000.0], ["2026-02-20"])
+    assert best["expiry"][0] == "2026-02-20"
+    assert (best["k_long"][0], best["k_short"][0]) in {(100000.0, 101000.0), (99000.0, 101000.0), (99000.0, 102000.0)}
+    assert best["spread_prob"][0] < 2 * (0.0905 - 0.0210) * 100000 / 9000 # The deep in-the-money pair's score
+
+@pytest.fixture(scope="module")
+def replicators():
+    priced = []
+    for optimizer in (None, SpreadOptimizer()):
+        rep = TouchReplicator(
+            deribit=FakeDeribitConnector(synthetic_summaries(3000)),
+            poly_scanner=FakePolymarketScanner(synthetic_markets(300)),
+            clock=lambda: BENCH_NOW,
+            spread_optimizer=optimizer,
+        )
+        rep.fetch_option_chains()
+        priced.append({r["id"]: r for r in rep.price_markets(rep.fetch_market_details())})
+    return priced
+
+def test_optimizer_replaces_only_the_far_leg(replicators):
+    adjacent, optimized = replicators
+    assert adjacent.keys() == optimized.keys()
+    checked = 0
+    for market_id, base in adjacent.items():
+        r = optimized[market_id]
+        if not (base["spread_prob"] and r["spread_prob"] and " + " in base["spread_details"]):
+            continue
+        # Calendar blends keep the near spread and weight, and the far expiry
+        near, far = base["spread_details"].split(" + ")
+        assert r["spread_details"].startswith(near + " + ")
+        assert r["spread_details"].endswith(far[far.index("("):])
+        checked += 1
+    assert checked > 10
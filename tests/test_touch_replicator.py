@@ -0,0 +1,104 @@
+import json
+from datetime import datetime, timezone
+
+import pandas as pd
+import pytest
+
+from benchmark import BENCH_NOW, FakePolymarketScanner
+from bs_models import BlackScholesModels
+from depth_pricing import DepthPricer
+from touch_replicator import TouchReplicator
+
+SPOT = 100000.0
+# (strike, call bid, call ask, put bid, put ask) in BTC, one expiry settling after every market
+QUOTES = [
+    (90000.0, 0.1100, 0.1120, 0.0100, 0.0110),
+    (95000.0, 0.0750, 0.0770, 0.0230, 0.0245),
+    (100000.0, 0.0480, 0.0495, 0.0440, 0.0455),
+    (105000.0, 0.0280, 0.0292, 0.0720, 0.0740),
+    (110000.0, 0.0150, 0.0160, 0.1080, 0.1100),
+]
+QUOTE = {(k, t): (b, a) for k, cb, ca, pb, pa in QUOTES for t, b, a in (("C", cb, ca), ("P", pb, pa))}
+
+class Chain:
+    def get_option_chain_summary(self):
+        rows = [(k, t, b, a) for (k, t), (b, a) in QUOTE.items()]
+        return pd.DataFrame({
+            "instrument": [f"BTC-20FEB26-{int(k)}-{t}" for k, t, _, _ in rows],
+            "expiry": ["2026-02-20"] * len(rows),
+            "strike": [k for k, _, _, _ in rows],
+            "type": ["call" if t == "C" else "put" for _, t, _, _ in rows],
+            "mark_price": [(b + a) / 2 for _, _, b, a in rows],
+            "bid": [b for _, _, b, _ in rows],
+            "ask": [a for _, _, _, a in rows],
+            "mark_iv": [60.0] * len(rows),
+            "underlying_price": [SPOT] * len(rows),
+        })
+
+QUESTIONS = {
+    "touch-up": "Will Bitcoin hit $107,000 by February 19?",
+    "touch-down": "Will Bitcoin dip to $93,000 by February 19?",
+    "touch-at-listed": "Will Bitcoin reach $95,000 by February 19?", # Reach wording, strike below spot
+    "above": "Will the price of Bitcoin be above $102,000 on February 19?",
+    "below": "Will the price of Bitcoin be below $97,000 on February 19?",
+}
+
+@pytest.fixture(scope="module")
+def priced():
+    markets = [{"id": key, "question": q, "slug": key, "endDate": "2026-02-19T23:59:00Z",
+                "outcomePrices": json.dumps(["0.300", "0.700"])} for key, q in QUESTIONS.items()]
+    rep = TouchReplicator(deribit=Chain(), poly_scanner=FakePolymarketScanner(markets), clock=lambda: BENCH_NOW)
+    rep.fetch_option_chains()
+    return rep, {r["id"]: r for r in rep.price_markets(rep.fetch_market_details())}
+
+def spread_prob(bought, sold, opt_type, scale):
+    t = "C" if opt_type == "call" else "P"
+    debit = (QUOTE[(bought, t)][1] - QUOTE[(sold, t)][0]) * SPOT
+    return scale * debit / abs(sold - bought)
+
+@pytest.mark.parametrize("market, kind, direction, opt_type, bought, sold, scale", [
+    ("touch-up", "touch", "up", "call", 105000.0, 110000.0, 2.0),
+    ("touch-down", "touch", "down", "put", 95000.0, 90000.0, 2.0),
+    ("touch-at-listed", "touch", "down", "put", 95000.0, 90000.0, 2.0),
+    ("above", "above", "up", "call", 100000.0, 105000.0, 1.0),
+    ("below", "above", "down", "put", 100000.0, 95000.0, 1.0),
+])
+def test_spread_by_kind_and_direction(priced, market, kind, direction, opt_type, bought, sold, scale):
+    _, results = priced
+    r = results[market]
+    assert (r["kind"], r["direction"]) == (kind, direction)
+    assert r["spread_prob"] == pytest.approx(spread_prob(bought, sold, opt_type, scale))
+    t = "C" if opt_type == "call" else "P"
+    assert r["hedge"]["legs"] == (f"BTC-20FEB26-{int(bought)}-{t}", f"BTC-20FEB26-{int(sold)}-{t}")
+    assert (r["hedge"]["opt_type"], r["hedge"]["scale"]) == (opt_type, scale)
+    assert r["spread_details"] == f"{bought}-{sold}"
+
+def test_model_probability_by_kind(priced):
+    rep, results = priced
+    T = rep.years_until(datetime(2026, 2, 19, 23, 59, tzinfo=timezone.utc).timestamp()) # The markets' endDate
+    for market, up in (("above", True), ("below", False)):
+        r = results[market]
+        expected = BlackScholesModels.digital_probability_batch(SPOT, r["strike"], T, r["iv"], rep.risk_free_rate, up)
+        assert r["bs_prob"] == pytest.approx(float(expected), rel=1e-12)
+    for market in ("touch-up", "touch-down"):
+        r = results[market]
+        expected = BlackScholesModels.one_touch_probability(SPOT, r["strike"], T, r["iv"], rep.risk_free_rate)
+        assert r["bs_prob"] == pytest.approx(expected, rel=1e-12)
+
+def test_depth_priced_side_matches_displayed_trade(priced, tmp_path, monkeypatch):
+    rep, results = priced
+    monkeypatch.chdir(tmp_path) # generate_html writes index.html
+    for market, r in results.items():
+        bought, sold = r["hedge"]["legs"]
+        k_bought, k_sold = (float(name.split("-")[2]) for name in (bought, sold))
+        t = bought[-1]
+        # The displayed trade buys legs[0]
+        rep.generate_html([dict(r, edge=0.2)])
+        html = (tmp_path / "index.html").read_text()
+        assert ("Buy lower strike" if t == "C" else "Buy upper strike") in html
+        assert (k_bought < k_sold) == (t == "C")
+        # The depth pricer buys the same leg; at the top of the book it reproduces spread_prob
+        leg_books = {bought: {"asks": [[QUOTE[(k_bought, t)][1], 10.0]], "bids": []},
+                     sold: {"asks": [], "bids": [[QUOTE[(k_sold, t)][0], 10.0]]}}
+        _, ref_prob, _ = DepthPricer().edge_at(r, {"asks": [[0.7, 1000.0]]}, leg_books, 1e-6)
+        assert float(ref_prob) == pytest.approx(r["spread_prob"], rel=1e-12)
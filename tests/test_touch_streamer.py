@@ -0,0 +1,149 @@
+import json
+
+import numpy as np
+import pytest
+
+from benchmark import BENCH_NOW, FakeDeribitConnector, FakePolymarketScanner, synthetic_markets, synthetic_summaries
+from touch_replicator import TouchReplicator
+from touch_streamer import StreamFeed, TouchStreamer
+
+class FakeFeed(StreamFeed):
+    """
+    Random ticker and Poly price events. `after_event` runs once the
+    streamer has handled an event, before the next one is produced.
+    """
+
+    def __init__(self, n_events, after_event, seed=0):
+        self.n_events = n_events
+        self.after_event = after_event
+        self.rng = np.random.default_rng(seed)
+        self.instruments = []
+        self.market_ids = []
+
+    def subscribe(self, instruments, market_ids):
+        self.instruments = sorted(instruments)
+        self.market_ids = sorted(market_ids)
+
+    def events(self):
+        for _ in range(self.n_events):
+            yield self.random_event()
+            self.after_event()
+
+    def random_event(self):
+        rng = self.rng
+        if rng.random() < 0.2:
+            return ("poly_price", self.market_ids[rng.integers(len(self.market_ids))], round(float(rng.uniform(0.01, 0.99)), 3))
+        name = self.instruments[rng.integers(len(self.instruments))]
+        if rng.random() < 0.1:
+            name = name.replace("-C", "-P") if name.endswith("-C") else name # Not necessarily a dependency
+        quote = self.streamer.replicator.get_chain_index().quote(name) or {}
+        field = ("bid", "ask", "mark_iv", "underlying_price")[rng.integers(4)]
+        value = quote.get(field)
+        if value is None or not np.isfinite(value):
+            value = 0.01
+        return ("ticker", name, {field: float(value * rng.uniform(0.95, 1.05))})
+
+def build_streamer(feed):
+    replicator = TouchReplicator(
+        deribit=FakeDeribitConnector(synthetic_summaries(2000)),
+        poly_scanner=FakePolymarketScanner(synthetic_markets(80)),
+        clock=lambda: BENCH_NOW,
+    )
+    streamer = TouchStreamer(feed, replicator=replicator)
+    feed.streamer = streamer
+    return streamer
+
+FIELDS = ("poly_prob", "bs_prob", "spread_prob", "iv", "edge")
+
+def assert_matches_full_reprice(streamer):
+    full = {r["id"]: r for r in streamer.replicator.price_markets(list(streamer.markets.values()))}
+    assert set(full) == set(streamer.results)
+    for market_id, expected in full.items():
+        got = streamer.results[market_id]
+        for field in FIELDS:
+            assert got[field] == pytest.approx(expected[field], rel=1e-12, abs=1e-12, nan_ok=True), (market_id, field)
+        assert got["spread_details"] == expected["spread_details"]
+
+def test_incremental_repricing_matches_full_reprice():
+    checks = []
+
+    def check():
+        assert_matches_full_reprice(streamer)
+        checks.append(streamer.reprice_count)
+
+    feed = FakeFeed(300, check)
+    streamer = build_streamer(feed)
+    streamer.run()
+
+    assert len(checks) == 300
+    n_markets = len(streamer.markets)
+    assert n_markets > 50
+    # Only affected markets are re-priced: far fewer than a full reprice per event
+    assert streamer.reprice_count < 300 * n_markets / 4
+
+def test_unknown_and_unchanged_events_reprice_nothing():
+    streamer = build_streamer(FakeFeed(0, lambda: None))
+    streamer.load_snapshot()
+    count = streamer.reprice_count
+
+    assert streamer.apply(("ticker", "BTC-1JAN30-1-C", {"bid": 1.0})) == set()
+    market_id = next(iter(streamer.markets))
+    price = streamer.markets[market_id]["poly_price"]
+    assert streamer.apply(("poly_price", market_id, price)) == set()
+    assert streamer.apply(("poly_price", market_id, price + 0.01)) == {market_id}
+
+    index = streamer.replicator.get_chain_index()
+    instrument = next(name for name in sorted(streamer.dependents) if np.isfinite(index.quote(name)["bid"]))
+    quote = index.quote(instrument)
+    assert streamer.apply(("ticker", instrument, {"bid": quote["bid"]})) == set()
+    assert streamer.reprice_count == count
+
+SOL_SPOT = 150.0
+# (strike, call mark, put mark) in USDC on the linear book
+SOL_MARKS = [(130.0, 21.5, 1.2), (140.0, 13.2, 2.9), (150.0, 7.1, 6.8), (160.0, 3.3, 13.0), (170.0, 1.3, 21.0)]
+
+def sol_summaries(bumps=None):
+    """get_book_summary_by_currency(USDC) rows, prices in USDC; bumps: {instrument: bid change}"""
+    rows = [{"instrument_name": "XRP_USDC-30JAN26-2-C", "mark_price": 0.1, "bid_price": 0.09, "ask_price": 0.11,
+             "mark_iv": 70.0, "underlying_price": 2.0}] # Another underlying on the same book
+    for k, call, put in SOL_MARKS:
+        for t, mark in (("C", call), ("P", put)):
+            name = f"SOL_USDC-30JAN26-{int(k)}-{t}"
+            rows.append({"instrument_name": name, "mark_price": mark, "bid_price": mark - 0.2 + (bumps or {}).get(name, 0.0),
+                         "ask_price": mark + 0.2, "mark_iv": 80.0, "underlying_price": SOL_SPOT})
+    return rows
+
+def sol_replicator(server):
+    from deribit_connector import DeribitConnector
+    from http_cache import ResponseCache
+    deribit = DeribitConnector("SOL", http=ResponseCache(None))
+    deribit.BASE_URL = server.url + "/api/v2"
+    markets = [{"id": key, "question": q, "slug": key, "endDate": "2026-01-20T23:59:00Z", "outcomePrices": json.dumps(["0.3", "0.7"])}
+               for key, q in (("up", "Will Solana hit $165 by January 20?"), ("down", "Will Solana dip to $135 by January 20?"))]
+    return TouchReplicator(deribit=deribit, poly_scanner=FakePolymarketScanner(markets, assets=("SOL",)),
+                           currencies=("SOL",), clock=lambda: BENCH_NOW)
+
+def test_linear_ticker_prices_are_scaled_to_underlying_units(stub_server):
+    served = {"rows": sol_summaries()}
+    server = stub_server({"/api/v2/public/get_book_summary_by_currency":
+                          lambda request: (200, {"Content-Type": "application/json"}, json.dumps({"result": served["rows"]}))})
+    streamer = TouchStreamer(FakeFeed(0, lambda: None), replicator=sol_replicator(server))
+    streamer.load_snapshot()
+    assert {r["id"] for r in streamer.results.values()} == {"up", "down"}
+
+    # Deribit tickers quote the linear book in USDC: the snapshot's own prices change nothing
+    leg = "SOL_USDC-30JAN26-160-C"
+    assert leg in streamer.dependents
+    usdc = {"bid": 3.3 - 0.2, "ask": 3.3 + 0.2, "mark_price": 3.3, "underlying_price": SOL_SPOT}
+    assert streamer.apply(("ticker", leg, usdc)) == set()
+
+    # A new bid lands in SOL units and re-prices as a fresh snapshot with that bid would
+    ids = streamer.apply(("ticker", leg, dict(usdc, bid=3.3 - 0.2 + 0.15)))
+    assert ids and streamer.replicator.get_chain_index("SOL").quote(leg)["bid"] == pytest.approx(3.25 / SOL_SPOT)
+    streamer.reprice(ids)
+    served["rows"] = sol_summaries({leg: 0.15})
+    fresh = TouchStreamer(FakeFeed(0, lambda: None), replicator=sol_replicator(server))
+    fresh.load_snapshot()
+    for market_id, expected in fresh.results.items():
+        for field in FIELDS:
+            assert streamer.results[market_id][field] == pytest.approx(expected[field], rel=1e-12, nan_ok=True), (market_id, field)
@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from option_chain_index import OptionChainIndex
+from vol_surface import VolSurface
+
+FORWARD = 100000.0
+TIMES = {"2026-02-20": 0.1, "2026-03-27": 0.3}
+# Out-of-the-money mark IVs (%): puts below the forward, calls from it up
+SMILES = {
+    "2026-02-20": {90000.0: 70.0, 95000.0: 62.0, 100000.0: 58.0, 105000.0: 60.0, 110000.0: 66.0},
+    "2026-03-27": {90000.0: 64.0, 95000.0: 59.0, 100000.0: 56.0, 105000.0: 57.0, 110000.0: 61.0},
+}
+
+@pytest.fixture(scope="module")
+def surface():
+    rows = []
+    for expiry, smile in SMILES.items():
+        for k, iv in smile.items():
+            otm = "call" if k >= FORWARD else "put"
+            rows.append((expiry, k, otm, iv))
+            rows.append((expiry, k, "put" if otm == "call" else "call", iv + 15.0)) # In-the-money mark, ignored
+    chain = pd.DataFrame({
+        "instrument": [f"BTC-{e}-{int(k)}-{t[0].upper()}" for e, k, t, _ in rows],
+        "expiry": [e for e, _, _, _ in rows],
+        "strike": [k for _, k, _, _ in rows],
+        "type": [t for _, _, t, _ in rows],
+        "mark_price": [0.01] * len(rows),
+        "mark_iv": [iv for _, _, _, iv in rows],
+        "underlying_price": [FORWARD] * len(rows),
+    })
+    return VolSurface(OptionChainIndex(chain), TIMES.get)
+
+def test_reproduces_listed_marks(surface):
+    for expiry, smile in SMILES.items():
+        strikes = np.array(list(smile))
+        sigma = surface.sigma(strikes, TIMES[expiry])
+        np.testing.assert_allclose(sigma, np.array(list(smile.values())) / 100.0, rtol=1e-12)
+
+def test_total_variance_is_linear_in_time_between_expiries(surface):
+    K = np.array([92000.0, 100000.0, 107500.0])
+    (t1, t2) = TIMES.values()
+    w1, w2 = surface.total_variance(K, t1), surface.total_variance(K, t2)
+    for t in (0.12, 0.2, 0.29):
+        expected = w1 + (t - t1) / (t2 - t1) * (w2 - w1)
+        np.testing.assert_allclose(surface.total_variance(K, t), expected, rtol=1e-12)
+
+def test_flat_extrapolation(surface):
+    first, last = SMILES["2026-02-20"], SMILES["2026-03-27"]
+    # Beyond the wings: the outermost strike's vol
+    np.testing.assert_allclose(surface.sigma([50000.0, 200000.0], 0.1), [first[90000.0] / 100, first[110000.0] / 100])
+    # Before the first / after the last expiry: that expiry's vol
+    np.testing.assert_allclose(surface.sigma(95000.0, [0.01, 0.05]), [first[95000.0] / 100] * 2)
+    np.testing.assert_allclose(surface.sigma(105000.0, [0.5, 2.0]), [last[105000.0] / 100] * 2)
+
+def test_queries_at_another_pricing_time(surface):
+    # A day later every expiry is a day closer: same vols at the listed points
+    day = 1 / 365
+    times = np.array(list(TIMES.values())) - day
+    sigma = surface.sigma(100000.0, times, times=times[:, None])
+    np.testing.assert_allclose(sigma, [0.58, 0.56], rtol=1e-12)
@@ -1,9 +1,42 @@
-import pandas as pd
+import time
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
-from datetime import datetime
+from datetime import datetime, timezone
 from deribit_connector import DeribitConnector
 from polymarket_touch_scanner import PolymarketTouchScanner
 from bs_models import BlackScholesModels
+from option_chain_index import OptionChainIndex
+from vol_surface import VolSurface
+from instrumentation import Instrumentation
+from result_sink import ScanResult
+
+SECONDS_PER_YEAR = 365 * 86400
+MIN_T = 60 / SECONDS_PER_YEAR # One minute
+DERIBIT_EXPIRY_HOUR = 8 # Deribit options settle at 08:00 UTC
+
+def deribit_expiry_time(expiry):
+    """POSIX settlement time of a Deribit expiry date (YYYY-MM-DD)"""
+    return datetime.strptime(expiry, "%Y-%m-%d").replace(hour=DERIBIT_EXPIRY_HOUR, tzinfo=timezone.utc).timestamp()
+
+def deribit_expiry_times(expiries):
+    """deribit_expiry_time for an array of expiry dates"""
+    days = np.asarray(expiries, dtype="datetime64[D]").astype("int64")
+    return days * 86400.0 + DERIBIT_EXPIRY_HOUR * 3600.0
+
+def poly_expiry_time(details):
+    """POSIX end time of a Poly market: its endDate when parsed, else the end of the expiry date (UTC)"""
+    if details.get("expiry_time") is not None:
+        return details["expiry_time"]
+    return datetime.strptime(details["expiry"], "%Y-%m-%d").replace(tzinfo=timezone.utc).timestamp() + 86400
+
+def no_spreads(n):
+    """adjacent_spreads output for n strikes without a spread"""
+    return {
+        "prob": np.full(n, np.nan), "debit": np.full(n, np.nan), "k_short": np.full(n, np.nan),
+        "k_long": np.full(n, np.nan), "width": np.full(n, np.nan),
+        "short_instrument": np.full(n, None, dtype=object), "long_instrument": np.full(n, None, dtype=object),
+    }
 
 class TouchReplicator:
     """
@@ -12,153 +45,623 @@ class TouchReplicator:
     and Black-Scholes (Analytical).
     """
     
-    def __init__(self):
-        self.poly_scanner = PolymarketTouchScanner()
-        self.deribit = DeribitConnector("BTC")
-        self.option_chain = pd.DataFrame()
+    def __init__(self, deribit=None, poly_scanner=None, clock=None, currencies=("BTC",), spread_optimizer=None,
+                 instrumentation=None, parallel_pricer=None, depth_pricer=None, touch_pricer=None, sink=None):
+        # Connectors can be swapped for replay/fake ones with the same interface
+        self.currencies = tuple(currencies)
+        self.poly_scanner = poly_scanner or PolymarketTouchScanner(assets=self.currencies)
+        self.deribit = deribit or DeribitConnector(self.currencies[0])
+        self.deribit_connectors = {self.currencies[0]: self.deribit}
+        for currency in self.currencies[1:]:
+            self.deribit_connectors[currency] = DeribitConnector(currency)
+        self.clock = clock or datetime.now # Pricing time; replay sets it to the snapshot time
+        self.option_chain = None # Chain DataFrame of the first (primary) currency, None until fetched
+        self.option_chains = {} # Chains of the other currencies
+        self.chain_indexes = {}
+        self.vol_surfaces = {}
         self.risk_free_rate = 0.04 # Estimating 4% risk free rate
+        self.spread_optimizer = spread_optimizer # Searches all strike pairs when set; else adjacent strikes only
+        self.stage_timings = {}
+        self.parallel_pricer = parallel_pricer # Process-pool pricing for large market lists when set
+        self.depth_pricer = depth_pricer # Order-book (size-aware) edge when set
+        self.touch_pricer = touch_pricer or BlackScholesModels # Model touch probability (bs_prob); e.g. MonteCarloTouchPricer
+        self.sink = sink # ResultSink each scan's results are streamed to (JSONL / Parquet history)
+        self.metrics = instrumentation or Instrumentation(enabled=False)
+        if self.metrics.enabled:
+            for connector in [self.poly_scanner, *self.deribit_connectors.values()]:
+                http = getattr(connector, "http", None)
+                if http is not None:
+                    http.instrumentation = self.metrics
 
     def get_time_to_expiry(self, expiry_str):
-        """Calculate years to expiry"""
+        """Years (to the second) until a Deribit expiry settles (08:00 UTC on the expiry date)"""
         try:
-            exp_date = datetime.strptime(expiry_str, "%Y-%m-%d")
-            delta = exp_date - datetime.now()
-            return max(0.001, delta.days / 365.0)
+            return self.years_until(deribit_expiry_time(expiry_str))
         except:
             return 0.0
 
-    def calculate_deribit_metrics(self, strike, expiry, poly_type="Up"):
+    def years_until(self, timestamps, now=None):
+        """
+        Years from the pricing clock (or `now`, POSIX seconds) to POSIX timestamps, floored at MIN_T.
+        Scalars or arrays; timestamps and now broadcast.
+        """
+        now = self.clock().timestamp() if now is None else np.asarray(now, dtype=float)
+        years = (np.asarray(timestamps, dtype=float) - now) / SECONDS_PER_YEAR
+        return np.maximum(MIN_T, years) if np.ndim(years) else max(MIN_T, float(years))
+
+    def get_chain(self, asset=None):
+        if asset is None or asset == self.currencies[0]:
+            return self.option_chain
+        return self.option_chains.get(asset)
+
+    def set_chain(self, asset, chain):
+        if asset == self.currencies[0]:
+            self.option_chain = chain
+        else:
+            self.option_chains[asset] = chain
+
+    def fetch_option_chains(self):
+        """Fetch every currency's chain concurrently"""
+        with ThreadPoolExecutor(max_workers=len(self.currencies)) as pool:
+            chains = dict(zip(self.currencies, pool.map(
+                lambda currency: self.deribit_connectors[currency].get_option_chain_summary(), self.currencies
+            )))
+        for asset, chain in chains.items():
+            self.set_chain(asset, chain)
+        return chains
+
+    def use_chain_index(self, asset, index):
+        """Price against a prebuilt index (e.g. one shared by a parallel pricing worker)"""
+        self.set_chain(asset, index.chain)
+        self.chain_indexes[asset] = index
+
+    def get_chain_index(self, asset=None):
+        """Index over an asset's option chain, rebuilt only when the chain changes"""
+        asset = asset or self.currencies[0]
+        chain = self.get_chain(asset)
+        index = self.chain_indexes.get(asset)
+        if index is None or index.chain is not chain:
+            index = self.chain_indexes[asset] = OptionChainIndex(chain)
+        return index
+
+    def get_vol_surface(self, asset=None):
+        """Vol surface of an asset's chain, refitted only when the chain (or its quotes) change"""
+        asset = asset or self.currencies[0]
+        index = self.get_chain_index(asset)
+        surface = self.vol_surfaces.get(asset)
+        if surface is None or surface.index is not index or surface.version != index.version:
+            surface = self.vol_surfaces[asset] = VolSurface(index, self.get_time_to_expiry)
+        return surface
+
+    def surface_ivs(self, asset, strikes, times, fallback, listed_T=None):
+        """
+        Surface vols for many (K, T); `fallback` (nearest-strike mark_iv) where the surface has none.
+        listed_T: years to each listed expiry per query (bracketing_expiries), for a clock other than the fit's.
+        """
+        surface = self.get_vol_surface(asset)
+        expiry_times = None if listed_T is None else listed_T[:, surface.positions].T
+        ivs = surface.sigma(strikes, times, expiry_times)
+        return np.where(np.isfinite(ivs), ivs, fallback)
+
+    def skipped(self, reason):
+        self.metrics.skip(reason)
+        return None
+
+    def adjacent_spreads(self, index, expiry, strikes, opt_type="call", scale=2.0):
+        """
+        Debit spread on the listed strikes bracketing each K for one expiry, the hedge of a No
+        position: calls buy <= K and sell > K (up side), puts buy >= K and sell < K (down side).
+        Arrays per strike: prob (scale * debit / width: 2 for a touch, 1 for a finish beyond K;
+        0 without positive debit; NaN when a leg or quote is missing), debit (USD, long leg at
+        its ask, short leg at its bid), k_long, k_short, width, long/short instrument.
+        """
+        columns = index.columns(expiry, opt_type)
+        out = no_spreads(len(strikes))
+        spot = index.spot(expiry)
+        if not columns or len(columns["strike"]) == 0 or not spot:
+            return out
+
+        if opt_type == "call":
+            i = np.searchsorted(columns["strike"], strikes, side="right")
+            long, short = i - 1, i
+        else:
+            i = np.searchsorted(columns["strike"], strikes, side="left")
+            long, short = i, i - 1
+        ok = (i > 0) & (i < len(columns["strike"]))
+        short, long = np.clip(short, 0, len(columns["strike"]) - 1), np.clip(long, 0, len(columns["strike"]) - 1)
+        debit = (columns["ask"][long] - columns["bid"][short]) * spot
+        ok &= np.isfinite(debit)
+        width = np.abs(columns["strike"][long] - columns["strike"][short])
+        with np.errstate(divide="ignore", invalid="ignore"):
+            prob = np.where((width > 0) & (debit > 0), scale * debit / width, 0.0)
+
+        out["prob"] = np.where(ok, prob, np.nan)
+        out["debit"] = np.where(ok, debit, np.nan)
+        out["k_short"] = np.where(ok, columns["strike"][short], np.nan)
+        out["k_long"] = np.where(ok, columns["strike"][long], np.nan)
+        out["width"] = np.where(ok, width, np.nan)
+        out["short_instrument"] = np.where(ok, columns["instrument"][short], None)
+        out["long_instrument"] = np.where(ok, columns["instrument"][long], None)
+        return out
+
+    def typed_spreads(self, index, expiry, strikes, opt_types, scales):
+        """adjacent_spreads with a spread type (call/put) and scale per strike"""
+        out = no_spreads(len(strikes))
+        for opt_type in ("call", "put"):
+            rows = np.flatnonzero(opt_types == opt_type)
+            if len(rows) == 0: continue
+            for key, values in self.adjacent_spreads(index, expiry, strikes[rows], opt_type, 1.0).items():
+                out[key][rows] = values
+            out["prob"][rows] *= scales[rows]
+        return out
+
+    def bracketing_expiries(self, index, expiries, expiry_times=None, now=None):
+        """
+        (T, listed_T, near, far) for Poly expiries against an index's listed expiries:
+        years to each Poly expiry, years to each listed expiry (markets x listed), and
+        positions of the live listed expiry settling before the Poly expiry (near, -1 if none)
+        and the first settling on or after it (far, len(index.expiries) if none). A listing on
+        the Poly date itself (settling a few hours early) is the far expiry when nothing later
+        is listed. now: pricing time per market (POSIX seconds); the clock when None.
+        """
+        expiries = np.asarray(expiries, dtype=object)
+        n = len(expiries)
+        if expiry_times is None:
+            expiry_times = [poly_expiry_time({"expiry": e}) for e in expiries]
+        if now is not None:
+            now = np.broadcast_to(np.asarray(now, dtype=float), (n,))
+        T = np.asarray(self.years_until(expiry_times, now), dtype=float).reshape(n)
+
+        listed = index.expiries
+        settle = deribit_expiry_times(listed)
+        listed_T = np.broadcast_to(self.years_until(settle, None if now is None else now[:, None]), (n, len(listed)))
+        far = (listed_T < T[:, None]).sum(axis=1) # searchsorted(listed_T, T, side="left") per market
+        far = np.where(far == len(listed), np.searchsorted(listed, expiries, side="left"), far)
+        near = far - 1
+        live = (far < len(listed)) & (near >= 0)
+        rows = np.flatnonzero(live)
+        live[rows] &= (listed_T[rows, near[rows]] > MIN_T) & (listed_T[rows, far[rows]] > T[rows])
+        return T, listed_T, np.where(live, near, -1), far
+
+    def market_input_arrays(self, strikes, expiries, asset=None, expiry_times=None, kinds=None, directions=None, now=None):
+        """
+        Array form of market_inputs_batch (see there): one entry per market in each array,
+        'ok' False where the market could not be priced. now: pricing time per market
+        (POSIX seconds; the clock when None), so markets seen at different times can share
+        one call against one chain. Keys: ok, T, iv, spot, up, opt_type, scale, far, far_spot,
+        spread_prob (NaN without a far spread), weight, calendar, near_expiry, near_spot,
+        far_spread / near_spread (adjacent_spreads arrays).
+        """
+        n = len(strikes)
+        strikes = np.asarray(strikes, dtype=float)
+        out = {
+            "ok": np.zeros(n, dtype=bool), "T": np.full(n, np.nan), "iv": np.full(n, np.nan), "spot": np.full(n, np.nan),
+            "up": np.zeros(n, dtype=bool), "opt_type": np.full(n, None, dtype=object), "scale": np.full(n, np.nan),
+            "far": np.full(n, -1), "far_spot": np.full(n, np.nan), "spread_prob": np.full(n, np.nan),
+            "weight": np.zeros(n), "calendar": np.zeros(n, dtype=bool),
+            "near_expiry": np.full(n, None, dtype=object), "near_spot": np.full(n, np.nan),
+            "far_spread": no_spreads(n), "near_spread": no_spreads(n),
+        }
+        index = self.get_chain_index(asset)
+        if index.empty:
+            for _ in range(n): self.skipped("no_chain")
+            return out
+
+        kinds = np.asarray(["touch"] * n if kinds is None else kinds, dtype=object)
+        directions = np.asarray(["up"] * n if directions is None else directions, dtype=object)
+        T, listed_T, near, far = self.bracketing_expiries(index, expiries, expiry_times, now)
+        out["T"] = T
+        listed = index.expiries
+
+        # Spot quoted on each listed expiry (NaN past the last, or where unquoted)
+        spots = np.array([index.spot(e) or np.nan for e in listed] + [np.nan], dtype=float)
+        has_strikes = np.array([len(index.strikes(e)) > 0 for e in listed] + [False])
+        far_spot = spots[far]
+        live = far < len(listed)
+        for reason, dropped in (("no_expiry", ~live), ("no_spot", live & np.isnan(far_spot)),
+                                ("no_strike", live & ~np.isnan(far_spot) & ~has_strikes[far])):
+            if dropped.any(): self.metrics.skip(reason, n=int(dropped.sum()))
+        rows = np.flatnonzero(~np.isnan(far_spot) & has_strikes[far])
+        if len(rows) == 0:
+            return out
+        K, f = strikes[rows], far[rows]
+
+        # Nearest listed strike of the far expiry (ties to the lower) for the mark_iv fallback
+        fallback_iv = np.empty(len(rows))
+        for e in np.unique(f):
+            sub = np.flatnonzero(f == e)
+            chain_strikes = index.strikes(listed[e])
+            j = np.clip(np.searchsorted(chain_strikes, K[sub], side="left"), 1, max(1, len(chain_strikes) - 1))
+            if len(chain_strikes) > 1:
+                j -= (K[sub] - chain_strikes[j - 1]) <= (chain_strikes[j] - K[sub])
+            else:
+                j[:] = 0
+            fallback_iv[sub] = index.columns(listed[e])["mark_iv"][j] / 100.0
+        ivs = self.surface_ivs(asset, K, T[rows], fallback_iv, listed_T[rows])
+
+        # Near expiry: weight linear in total variance at K (in time where the surface has none),
+        # spot linear in time between the near and far forwards
+        weight = np.zeros(len(rows)) # Weight of the near expiry
+        spot = far_spot[rows].copy()
+        sub = np.flatnonzero(near[rows] >= 0)
+        if len(sub):
+            surface = self.get_vol_surface(asset)
+            r, e = rows[sub], near[rows[sub]]
+            t1, t2, t = listed_T[r, e], listed_T[r, f[sub]], T[r]
+            time_w = (t2 - t) / (t2 - t1)
+            w1, w2, wp = surface.total_variance(K[sub], np.stack([t1, t2, t]), listed_T[r][:, surface.positions].T[:, None, :])
+            with np.errstate(divide="ignore", invalid="ignore"):
+                var_w = (w2 - wp) / (w2 - w1)
+            weight[sub] = np.clip(np.where(np.isfinite(var_w), var_w, time_w), 0.0, 1.0)
+            near_spot = spots[e]
+            quoted = ~np.isnan(near_spot) & (near_spot != 0)
+            spot[sub] = np.where(quoted, near_spot + (far_spot[r] - near_spot) * (1 - time_w), spot[sub])
+            out["near_expiry"][r] = listed[e]
+            out["near_spot"][r] = np.where(quoted, near_spot, np.nan)
+
+        # Touch direction from K vs spot; above/below from the wording
+        touch = kinds[rows] == "touch"
+        up = np.where(touch, K > spot, directions[rows] == "up")
+        opt_types = np.where(up, "call", "put").astype(object)
+        scales = np.where(touch, 2.0, 1.0)
+
+        # Adjacent spreads, one pass per listed expiry over the markets using it as far or near
+        far_spread, near_spread = no_spreads(len(rows)), no_spreads(len(rows))
+        near_of = np.where(near[rows] >= 0, near[rows], -1)
+        for e in np.unique(np.concatenate([f, near_of[near_of >= 0]])):
+            as_far, as_near = np.flatnonzero(f == e), np.flatnonzero(near_of == e)
+            both = np.concatenate([as_far, as_near])
+            spreads = self.typed_spreads(index, listed[e], K[both], opt_types[both], scales[both])
+            for key, values in spreads.items():
+                far_spread[key][as_far] = values[:len(as_far)]
+                near_spread[key][as_near] = values[len(as_far):]
+
+        calendar = np.isfinite(near_spread["prob"]) & np.isfinite(far_spread["prob"]) & (weight > 0)
+        spread_prob = np.where(calendar, weight * near_spread["prob"] + (1 - weight) * far_spread["prob"], far_spread["prob"])
+
+        out["ok"][rows] = True
+        out["iv"][rows], out["spot"][rows], out["up"][rows] = ivs, spot, up
+        out["opt_type"][rows], out["scale"][rows] = opt_types, scales
+        out["far"][rows], out["far_spot"][rows] = f, far_spot[rows]
+        out["spread_prob"][rows], out["weight"][rows], out["calendar"][rows] = spread_prob, weight, calendar
+        for key in far_spread:
+            out["far_spread"][key][rows] = far_spread[key]
+            out["near_spread"][key][rows] = near_spread[key]
+        return out
+
+    def market_inputs_batch(self, strikes, expiries, asset=None, expiry_times=None, kinds=None, directions=None):
+        """
+        Deribit inputs for many markets of one asset, vectorized per listed expiry.
+
+        The Poly expiry (expiry_times: POSIX seconds, end of the expiry date when
+        None) is bracketed by the listed Deribit expiries settling before it
+        (near) and on or after it (far):
+          T            exact years to the Poly expiry
+          iv           surface vol at (K, T), total variance interpolated across expiries
+                       (nearest-strike mark_iv of the far expiry where the surface has none)
+          spot         forward interpolated linearly in T between near and far
+          spread_prob  w * P_near + (1 - w) * P_far, the adjacent spreads of both
+                       expiries, with w linear in total variance at K
+        Without a live near expiry (or a near spread) the far spread is used alone.
+
+        kinds/directions (market_classifier kind and direction per market; all 'touch'
+        when None) pick the spread: a touch of K above spot is replicated with call
+        spreads and one below spot with put spreads, both at 2 * debit / width;
+        'above' markets (finishing above/below K on the date) with call/put spreads
+        by their wording's direction, at debit / width.
+        Returns a list of { 'spot', 'iv', 'T', 'spread_prob', 'expiry' (far), 'kind', 'direction', 'details' }
+        or None per market.
+        """
+        n = len(strikes)
+        a = self.market_input_arrays(strikes, expiries, asset, expiry_times, kinds, directions)
+        kinds = ["touch"] * n if kinds is None else kinds
+        listed = self.get_chain_index(asset).expiries
+        far_spread, near_spread = a["far_spread"], a["near_spread"]
+
+        results = [None] * n
+        for k in np.flatnonzero(a["ok"]):
+            far_expiry = listed[a["far"][k]]
+            iv, t = float(a["iv"][k]), float(a["T"][k])
+            inputs = {"spot": float(a["spot"][k]), "iv": iv, "T": t, "spread_prob": None, "expiry": far_expiry,
+                      "kind": kinds[k], "direction": "up" if a["up"][k] else "down", "details": {"iv": iv, "T": t}}
+            results[k] = inputs
+            if not np.isfinite(far_spread["prob"][k]):
+                continue
+            k_long, k_short = far_spread["k_long"][k], far_spread["k_short"][k]
+            inputs["spread_prob"] = float(a["spread_prob"][k])
+            inputs["details"] = {
+                "iv": iv,
+                "T": t,
+                "spread": f"{k_long}-{k_short}",
+                "k_long": float(k_long),
+                "k_short": float(k_short),
+                "debit": float(far_spread["debit"][k]),
+                "spot": a["far_spot"][k],
+                "legs": (far_spread["long_instrument"][k], far_spread["short_instrument"][k]), # (bought, sold)
+                "width": float(far_spread["width"][k]),
+                "spread_expiry": far_expiry,
+                "opt_type": a["opt_type"][k],
+                "scale": float(a["scale"][k]),
+            }
+            if a["calendar"][k]:
+                w = float(a["weight"][k])
+                near_expiry = a["near_expiry"][k]
+                inputs["details"]["spread"] = (
+                    f"{w:.0%} {near_spread['k_long'][k]}-{near_spread['k_short'][k]} ({near_expiry}) + "
+                    f"{1 - w:.0%} {k_long}-{k_short} ({far_expiry})"
+                )
+                inputs["details"]["calendar"] = {
+                    "near_expiry": near_expiry,
+                    "near_weight": w,
+                    "near_prob": float(near_spread["prob"][k]),
+                    "near_spread": f"{near_spread['k_long'][k]}-{near_spread['k_short'][k]}",
+                    "near_legs": (near_spread["long_instrument"][k], near_spread["short_instrument"][k]),
+                    "near_width": float(near_spread["width"][k]),
+                    "near_debit": float(near_spread["debit"][k]),
+                    "near_spot": float(a["near_spot"][k]),
+                }
+        return results
+
+    def market_inputs(self, strike, expiry, asset=None, expiry_time=None):
+        """Deribit inputs for one market (see market_inputs_batch)"""
+        return self.market_inputs_batch([strike], [expiry], asset, None if expiry_time is None else [expiry_time])[0]
+
+    def apply_best_spreads(self, asset, strikes, inputs):
+        """
+        Hedge with the optimizer's best centred pair on the far (first covering) expiry instead of the
+        adjacent strikes. The calendar blend keeps its near spread and weight. The optimizer searches
+        call spreads scored as touches, so only up touches are re-hedged.
+        """
+        if self.spread_optimizer is None: return
+        eligible = [i for i, item in enumerate(inputs) if item["kind"] == "touch" and item["direction"] == "up"]
+        if not eligible: return
+        index = self.get_chain_index(asset)
+        best = self.spread_optimizer.optimize(index, [strikes[i] for i in eligible], [inputs[i]["expiry"] for i in eligible])
+        for b in np.flatnonzero(np.isfinite(best["spread_prob"])):
+            i = eligible[b]
+            item = inputs[i]
+            details = item["details"]
+            prob = float(best["spread_prob"][b])
+            spread = f"{best['k_long'][b]}-{best['k_short'][b]} ({best['expiry'][b]})"
+            calendar = details.get("calendar")
+            if calendar:
+                w = calendar["near_weight"]
+                prob = w * calendar["near_prob"] + (1 - w) * prob
+                spread = f"{w:.0%} {calendar['near_spread']} ({calendar['near_expiry']}) + {1 - w:.0%} {spread}"
+            item["spread_prob"] = prob
+            details.update({
+                "spread": spread,
+                "spread_expiry": best["expiry"][b],
+                "k_long": float(best["k_long"][b]),
+                "k_short": float(best["k_short"][b]),
+                "debit": float(best["debit"][b]),
+                "spot": index.spot(best["expiry"][b]),
+                "legs": (best["long_instrument"][b], best["short_instrument"][b]),
+                "width": float(best["width"][b]),
+                "opt_type": "call",
+                "scale": 2.0,
+            })
+
+    @staticmethod
+    def hedge(details):
+        """Spread legs a result is hedged with: the far spread, plus the near one of a calendar blend"""
+        hedge = {key: details[key] for key in ("legs", "width", "spot", "opt_type", "scale")}
+        calendar = details.get("calendar")
+        if calendar:
+            hedge["near"] = {
+                "legs": calendar["near_legs"],
+                "width": calendar["near_width"],
+                "spot": calendar["near_spot"],
+                "weight": calendar["near_weight"],
+                "scale": details["scale"],
+            }
+        return hedge
+
+    def calculate_deribit_metrics(self, strike, expiry, poly_type="Up", asset=None, expiry_time=None):
         """
         Calculate implied probabilities using Deribit data.
         Returns: { 'bs_prob': float, 'spread_prob': float, 'details': dict }
         """
-        if self.option_chain.empty: return None
-
-        # Filter for relevant expiry
-        relevant_opts = self.option_chain[self.option_chain["expiry"] >= expiry].sort_values("expiry")
-        if relevant_opts.empty: return None
-        
-        target_expiry = relevant_opts.iloc[0]["expiry"]
-        chain = relevant_opts[relevant_opts["expiry"] == target_expiry]
-        
-        # Get Spot Price (Index)
-        spot = chain.iloc[0]["underlying_price"]
-        if not spot: return None
-        
-        # 1. Analytical Black-Scholes Probability
-        # If Target > Spot (Call side)
-        target_opt = chain.iloc[(chain['strike'] - strike).abs().argsort()[:1]]
-        if target_opt.empty: return None
-        
-        iv = target_opt.iloc[0]["mark_iv"] / 100.0 # Convert to decimal
-        T = self.get_time_to_expiry(target_expiry)
-        
-        bs_prob = BlackScholesModels.one_touch_probability(
-            S=spot, K=strike, T=T, sigma=iv, r=self.risk_free_rate
-        )
-        
-        # 2. Spread Replication (Andreou Method)
-        calls = chain[chain["type"] == "call"].sort_values("strike")
-        
-        # Find strike just below and just above K
-        lower_candidates = calls[calls["strike"] <= strike]
-        upper_candidates = calls[calls["strike"] > strike]
-        
-        if lower_candidates.empty or upper_candidates.empty:
-            return {"bs_prob": bs_prob, "spread_prob": None, "details": {"iv": iv, "T": T}}
-            
-        short_leg = lower_candidates.iloc[-1] # Sell (Bid)
-        long_leg = upper_candidates.iloc[0]   # Buy (Ask)
-        
-        k_short = short_leg["strike"]
-        k_long = long_leg["strike"]
-        
-        if pd.isna(short_leg["bid"]) or pd.isna(long_leg["ask"]):
-             return {"bs_prob": bs_prob, "spread_prob": None, "details": {"iv": iv, "T": T}}
-
-        credit_btc = short_leg["bid"] - long_leg["ask"]
-        credit_usd = credit_btc * spot
-        width = k_long - k_short
-        
-        spread_prob = 0.0
-        if width > 0 and credit_usd > 0:
-            spread_prob = (2 * credit_usd) / width
-            
-        return {
-            "bs_prob": bs_prob,
-            "spread_prob": spread_prob,
-            "details": {
-                "iv": iv, 
-                "T": T, 
-                "spread": f"{k_short}-{k_long}",
-                "credit": credit_usd,
-                "spot": spot
-            }
-        }
+        start = time.perf_counter()
+        inputs = self.market_inputs(strike, expiry, asset, expiry_time)
+        if not inputs: return None
+        self.apply_best_spreads(asset, [strike], [inputs])
+
+        bs_prob = float(self.touch_pricer.one_touch_probability_batch(
+            S=inputs["spot"], K=strike, T=inputs["T"], sigma=inputs["iv"], r=self.risk_free_rate
+        ))
+        self.metrics.observe("calculate_deribit_metrics", time.perf_counter() - start)
+        return {"bs_prob": bs_prob, "spread_prob": inputs["spread_prob"], "details": inputs["details"]}
+
+    def fetch_market_details(self):
+        """Fetch Polymarket touch markets and parse them as pages arrive"""
+        market_details = []
+        for m in self.poly_scanner.iter_polymarket_touch_markets():
+            with self.metrics.stage("parse_market_details"):
+                details = self.poly_scanner.parse_market_details(m)
+            if details: market_details.append(details)
+            else: self.metrics.skip("unparsed")
+        return market_details
+
+    def model_probabilities(self, strikes, inputs):
+        """
+        Model probability (bs_prob) per market_inputs_batch item: touch_pricer for touches,
+        the Black-Scholes digital for markets finishing above/below K
+        """
+        S, K = np.array([item["spot"] for item in inputs]), np.asarray(strikes, dtype=float)
+        T, sigma = np.array([item["T"] for item in inputs]), np.array([item["iv"] for item in inputs])
+        touch = np.array([item["kind"] == "touch" for item in inputs])
+        prob = np.full(len(inputs), np.nan)
+        if touch.any():
+            prob[touch] = self.touch_pricer.one_touch_probability_batch(
+                S=S[touch], K=K[touch], T=T[touch], sigma=sigma[touch], r=self.risk_free_rate
+            )
+        if not touch.all():
+            up = np.array([item["direction"] == "up" for item in inputs])[~touch]
+            prob[~touch] = BlackScholesModels.digital_probability_batch(
+                S[~touch], K[~touch], T[~touch], sigma[~touch], self.risk_free_rate, up
+            )
+        return prob
+
+    def price_markets(self, market_details):
+        """
+        Price parsed markets against the loaded option chains. Markets of every
+        currency share one Black-Scholes batch. Returns results sorted by edge.
+        """
+        today = self.clock().strftime("%Y-%m-%d")
+
+        live = []
+        for details in market_details:
+            if details["expiry"] < today:
+                self.metrics.skip("expired")
+                continue
+            live.append(details)
+
+        # Deribit inputs and best spreads, one vectorized pass per asset
+        priced = []
+        assets = np.array([details.get("asset") or self.currencies[0] for details in live], dtype=object)
+        for asset in np.unique(assets):
+            rows = [live[i] for i in np.flatnonzero(assets == asset)]
+            start = time.perf_counter()
+            with self.metrics.stage("market_inputs"):
+                inputs = self.market_inputs_batch(
+                    [details["strike"] for details in rows],
+                    [details["expiry"] for details in rows],
+                    asset,
+                    [poly_expiry_time(details) for details in rows],
+                    [details.get("kind") or "touch" for details in rows],
+                    [details.get("direction") or "up" for details in rows],
+                )
+            # Per-market latency: each market's share of the batch
+            self.metrics.observe("market_inputs", (time.perf_counter() - start) / len(rows), n=len(rows))
+            rows = [(details, item) for details, item in zip(rows, inputs) if item]
+            priced += rows
+            with self.metrics.stage("spread_optimizer"):
+                self.apply_best_spreads(
+                    asset,
+                    [details["strike"] for details, _ in rows],
+                    [item for _, item in rows],
+                )
+
+        if not priced:
+            return []
+
+        with self.metrics.stage("bs_batch"):
+            bs_probs = self.model_probabilities([details["strike"] for details, _ in priced], [inputs for _, inputs in priced])
 
-    def scan(self, html_output=False):
-        print("=== Touch Bet Replicator (v2.0) ===")
-        print("Fetching Deribit Data...")
-        self.option_chain = self.deribit.get_option_chain_summary()
-        
-        print("Fetching Polymarket Data...")
-        poly_markets = self.poly_scanner.fetch_polymarket_touch_markets()
-        
         scan_results = []
-        
-        print(f"\nScanning {len(poly_markets)} Markets...\n")
-        
-        for m in poly_markets:
-            details = self.poly_scanner.parse_market_details(m)
-            if not details: continue
-            
+        for (details, inputs), bs_prob in zip(priced, bs_probs):
             strike = details["strike"]
             poly_prob = details["poly_price"]
-            
-            if details["expiry"] < datetime.now().strftime("%Y-%m-%d"): continue
-
-            metrics = self.calculate_deribit_metrics(strike, details["expiry"])
-            if not metrics: continue
-            
-            bs_prob = metrics["bs_prob"]
-            spread_prob = metrics["spread_prob"]
+            bs_prob = float(bs_prob)
+            spread_prob = inputs["spread_prob"]
             
             ref_prob = spread_prob if spread_prob else bs_prob
             diff = poly_prob - ref_prob
             
-            result_item = {
-                "market": details["question"],
-                "expiry": details["expiry"],
-                "strike": strike,
-                "poly_prob": poly_prob,
-                "bs_prob": bs_prob,
-                "spread_prob": spread_prob,
-                "iv": metrics['details']['iv'],
-                "edge": diff,
-                "url": details["url"],
-                "spread_details": metrics['details']['spread'] if spread_prob else "N/A"
-            }
+            result_item = ScanResult(
+                id=details["id"],
+                asset=details.get("asset", self.currencies[0]),
+                market=details["question"],
+                expiry=details["expiry"],
+                strike=strike,
+                kind=inputs["kind"],
+                direction=inputs["direction"],
+                poly_prob=poly_prob,
+                bs_prob=bs_prob,
+                spread_prob=spread_prob,
+                iv=inputs['details']['iv'],
+                edge=diff,
+                url=details["url"],
+                spread_details=inputs['details']['spread'] if spread_prob else "N/A",
+                hedge=self.hedge(inputs["details"]) if spread_prob else None,
+                token_ids=details.get("token_ids", [])
+            )
             scan_results.append(result_item)
 
         # --- SORTING BY EDGE DESCENDING ---
         scan_results.sort(key=lambda x: x["edge"], reverse=True)
+        return scan_results
 
+    def print_results(self, scan_results):
         # Print sorted results to terminal
         for r in scan_results:
-            print(f"Market: {r['market']}")
+            print(f"Market: {r['market']} [{r['asset']}]")
             print(f"  Expiry: {r['expiry']} | Strike: {r['strike']}")
             print(f"  Polymarket: {r['poly_prob']:.1%}")
             print(f"  Deribit BS: {r['bs_prob']:.1%} (IV: {r['iv']:.1%})")
             if r['spread_prob']:
                 print(f"  Deribit Spread: {r['spread_prob']:.1%} (Spread: {r['spread_details']})")
             print(f"  Edge: {r['edge']*100:.1f}%")
+            if r.get('exec_edge') is not None:
+                print(f"  Executable Edge ({self.depth_pricer.notional:,.0f} NO): {r['exec_edge']*100:.1f}% | Max Size: {r['max_size']:,.0f} NO")
             
             if r['edge'] > 0.10:
                 print("  >>> SIGNAL: BUY NO (Overpriced)")
             print("-" * 30)
-            
+
+    async def scan_async(self, html_output=False):
+        """
+        Scan with the Deribit and Polymarket fetches running concurrently.
+        Wall-clock time per stage is stored in self.stage_timings (seconds).
+        """
+        print("=== Touch Bet Replicator (v2.0) ===")
+        timings = {}
+        scan_start = time.perf_counter()
+
+        async def timed(stage, fn):
+            start = time.perf_counter()
+            result = await asyncio.to_thread(fn)
+            timings[stage] = time.perf_counter() - start
+            return result
+
+        print(f"Fetching Deribit Data ({', '.join(self.currencies)})...")
+        print("Fetching Polymarket Data...")
+        *chains, market_details = await asyncio.gather(
+            *(timed(f"deribit_fetch_{currency}", self.deribit_connectors[currency].get_option_chain_summary)
+              for currency in self.currencies),
+            timed("polymarket_fetch", self.fetch_market_details),
+        )
+        for currency, chain in zip(self.currencies, chains):
+            self.set_chain(currency, chain)
+        timings["fetch_wall"] = time.perf_counter() - scan_start
+
+        print(f"\nScanning {len(market_details)} Markets...\n")
+
+        start = time.perf_counter()
+        if self.parallel_pricer:
+            scan_results = self.parallel_pricer.price(self, market_details)
+        else:
+            scan_results = self.price_markets(market_details)
+        timings["pricing"] = time.perf_counter() - start
+
+        if self.depth_pricer:
+            start = time.perf_counter()
+            self.depth_pricer.enrich(self, scan_results)
+            timings["depth"] = time.perf_counter() - start
+
+        if self.sink:
+            start = time.perf_counter()
+            with self.metrics.stage("sink"):
+                self.sink.write(scan_results, self.clock())
+            timings["sink"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        self.print_results(scan_results)
         if html_output:
-            self.generate_html(scan_results)
+            with self.metrics.stage("generate_html"):
+                self.generate_html(scan_results)
+        timings["output"] = time.perf_counter() - start
+        timings["total"] = time.perf_counter() - scan_start
+
+        self.stage_timings = timings
+        for stage, seconds in timings.items():
+            self.metrics.add_stage(stage, seconds)
+        print("Stage timings: " + " | ".join(f"{k} {v:.2f}s" for k, v in timings.items()))
+        return scan_results
+
+    def scan(self, html_output=False):
+        return asyncio.run(self.scan_async(html_output))
 
     def generate_html(self, results):
         """Generate a simple dashboard HTML file"""
@@ -177,4 +680,57 @@ class TouchReplicator:
                 .btn { display: inline-block; padding: 8px 16px; background: #007bff; color: white; text-decoration: none; border-radius: 4px; margin-top: 10px; }
                 .instructions { margin-top: 15px; padding: 10px; background-color: #f9f9f9; border-left: 3px solid #ccc; }
                 .instructions h4 { margin-top: 0; color: #444; }
-                .risk-warning
+                .risk-warning { color: #c0392b; font-size: 0.9em; }
+            </style>
+        </head>
+        <body>
+            <h1>Touch Bet Arbitrage Scanner</h1>
+            <div class="disclaimer">
+                <strong>Disclaimer:</strong> For research purposes only. Not financial advice.
+                Deribit fair values are approximations (spread replication / Black-Scholes) and the hedge is imperfect.
+            </div>
+        """
+        html += f"<p>Last updated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} | Markets scanned: {len(results)}</p>"
+
+        for r in results:
+            html += '<div class="card">'
+            html += f"<h3>{r['market']}</h3>"
+            html += f'<div class="metric">Expiry: {r["expiry"]} | Strike: {r["strike"]:,.0f}</div>'
+            html += f'<div class="metric">Polymarket: {r["poly_prob"]:.1%}</div>'
+            html += f'<div class="metric">Deribit BS: {r["bs_prob"]:.1%} (IV: {r["iv"]:.1%})</div>'
+            if r['spread_prob']:
+                html += f'<div class="metric">Deribit Spread: {r["spread_prob"]:.1%} (Spread: {r["spread_details"]})</div>'
+            html += f'<div class="metric">Edge: {r["edge"]*100:.1f}%</div>'
+            if r.get('exec_edge') is not None:
+                html += f'<div class="metric">Executable Edge ({self.depth_pricer.notional:,.0f} NO): {r["exec_edge"]*100:.1f}% | Max Size: {r["max_size"]:,.0f} NO</div>'
+
+            if r['edge'] > 0.10:
+                html += '<div class="signal">SIGNAL: BUY NO (Overpriced)</div>'
+                html += '<div class="instructions"><h4>How to trade</h4>'
+                html += '<p>1. Buy "NO" on Polymarket.</p>'
+                if r['spread_prob'] and r['hedge']['opt_type'] == "put":
+                    html += f"<p>2. Hedge on Deribit: Bear Put Spread {r['spread_details']} (Buy upper strike / Sell lower strike).</p>"
+                elif r['spread_prob']:
+                    html += f"<p>2. Hedge on Deribit: Bull Call Spread {r['spread_details']} (Buy lower strike / Sell upper strike).</p>"
+                if r['kind'] == "above":
+                    html += '<p class="risk-warning">Hold the spread to expiry: it settles like the market on where spot finishes. Losses are possible on both legs.</p>'
+                else:
+                    html += '<p class="risk-warning">Sell the spread back if spot touches the strike (worth about half its width). Losses are possible on both legs.</p>'
+                html += '</div>'
+
+            html += f'<a class="btn" href="{r["url"]}" target="_blank">View on Polymarket</a>'
+            html += '</div>'
+
+        html += """
+        </body>
+        </html>
+        """
+
+        with open("index.html", "w") as f:
+            f.write(html)
+        print("Dashboard written to index.html")
+
+if __name__ == "__main__":
+    import sys
+    from cli import main
+    main(["replicate", *sys.argv[1:]])
@@ -0,0 +1,274 @@
+import json
+import queue
+import threading
+import time
+import numpy as np
+from deribit_connector import underlying_units
+from touch_replicator import TouchReplicator
+
+class StreamFeed:
+    """
+    Source of live updates for TouchStreamer.
+
+    events() yields tuples:
+        ("ticker", instrument_name, {"bid": ..., "ask": ..., "mark_price": ..., "mark_iv": ..., "underlying_price": ...})
+        ("poly_price", market_id, yes_price)
+    Field names follow the get_option_chain_summary columns; prices are as Deribit
+    quotes them (USDC on linear books; the streamer converts to underlying units). Any object with
+    these two methods can drive the streamer (e.g. a local fake feed in tests).
+    """
+
+    def subscribe(self, instruments, market_ids):
+        """Called after each snapshot with the instruments/markets the streamer prices off"""
+        pass
+
+    def events(self):
+        raise NotImplementedError
+
+class DeribitTickerFeed(StreamFeed):
+    """Deribit `ticker.<instrument>` websocket channels (needs the websocket-client package)"""
+    WS_URL = "wss://www.deribit.com/ws/api/v2"
+
+    # Deribit ticker field -> option chain column
+    FIELDS = {
+        "best_bid_price": "bid",
+        "best_ask_price": "ask",
+        "mark_price": "mark_price",
+        "mark_iv": "mark_iv",
+        "underlying_price": "underlying_price",
+    }
+
+    def __init__(self, interval="100ms", ws_url=None):
+        self.interval = interval
+        self.ws_url = ws_url or self.WS_URL
+        self.instruments = []
+
+    def subscribe(self, instruments, market_ids):
+        self.instruments = sorted(instruments)
+
+    def events(self):
+        try:
+            import websocket
+        except ImportError:
+            raise ImportError("DeribitTickerFeed needs websocket-client: pip install websocket-client")
+
+        ws = websocket.create_connection(self.ws_url)
+        try:
+            channels = [f"ticker.{name}.{self.interval}" for name in self.instruments]
+            ws.send(json.dumps({
+                "jsonrpc": "2.0", "id": 1, "method": "public/subscribe",
+                "params": {"channels": channels}
+            }))
+            while True:
+                msg = json.loads(ws.recv())
+                if msg.get("method") != "subscription": continue
+                data = msg["params"]["data"]
+                values = {col: data.get(field) for field, col in self.FIELDS.items() if field in data}
+                yield ("ticker", data["instrument_name"], values)
+        finally:
+            ws.close()
+
+class PolymarketPollingFeed(StreamFeed):
+    """Re-polls the Gamma markets endpoint and emits Yes-price changes"""
+
+    def __init__(self, scanner, interval=5.0):
+        self.scanner = scanner
+        self.interval = interval
+        self.market_ids = set()
+        self.last_prices = {}
+
+    def subscribe(self, instruments, market_ids):
+        self.market_ids = set(market_ids)
+
+    def events(self):
+        while True:
+            for m in self.scanner.iter_polymarket_touch_markets():
+                if m.get("id") not in self.market_ids: continue
+                details = self.scanner.parse_market_details(m)
+                if not details: continue
+                price = details["poly_price"]
+                if self.last_prices.get(details["id"]) != price:
+                    self.last_prices[details["id"]] = price
+                    yield ("poly_price", details["id"], price)
+            time.sleep(self.interval)
+
+class MergedFeed(StreamFeed):
+    """Runs several feeds on background threads and interleaves their events"""
+
+    def __init__(self, *feeds):
+        self.feeds = feeds
+        self._queue = queue.Queue()
+        self._threads = []
+
+    def subscribe(self, instruments, market_ids):
+        for feed in self.feeds:
+            feed.subscribe(instruments, market_ids)
+
+    def _pump(self, feed):
+        try:
+            for event in feed.events():
+                self._queue.put(event)
+        except Exception as e:
+            print(f"Feed {type(feed).__name__} stopped: {e}")
+
+    def events(self):
+        if not self._threads:
+            for feed in self.feeds:
+                t = threading.Thread(target=self._pump, args=(feed,), daemon=True)
+                t.start()
+                self._threads.append(t)
+        while True:
+            yield self._queue.get()
+
+class TouchStreamer:
+    """
+    Long-running streaming mode for TouchReplicator.
+
+    Loads one full snapshot (option chain + touch markets), then applies
+    feed updates in place and re-prices only the markets whose inputs
+    changed: the expiries' spot sources, the spread legs, the Polymarket
+    price, or an IV/forward on the expiries its vol-surface query spans.
+    """
+
+    # Ticker fields that feed the vol surface
+    SURFACE_FIELDS = ("mark_iv", "underlying_price")
+
+    def __init__(self, feed, replicator=None, on_update=None, resync_interval=None):
+        self.feed = feed
+        self.replicator = replicator or TouchReplicator()
+        self.on_update = on_update # callback(list of re-priced results)
+        self.resync_interval = resync_interval # seconds between full snapshots (None = never)
+        self.markets = {} # market id -> parsed details
+        self.results = {} # market id -> latest result
+        self.dependents = {} # instrument -> set of market ids priced off its quotes
+        self.surface_dependents = {} # instrument -> set of market ids whose surface IV reads its mark_iv
+        self.last_sync = 0.0
+        self.reprice_count = 0
+
+    def market_dependencies(self, strike, expiry, asset=None, expiry_time=None, kind="touch", direction="up"):
+        """
+        Instruments a market's price reads.
+        Returns (quote deps: spot source + fallback IV + both spread legs, on the near and far expiries,
+                 surface deps: every option on the expiries bracketing the market)
+        A touch is hedged with calls above spot and puts below it, so both brackets are
+        tracked (spot may cross K); above/below markets use the bracket of their direction.
+        """
+        index = self.replicator.get_chain_index(asset)
+        if index.empty: return set(), set()
+        _, _, near, far = self.replicator.bracketing_expiries(index, [expiry], None if expiry_time is None else [expiry_time])
+        near, far = int(near[0]), int(far[0])
+        if far >= len(index.expiries): return set(), set()
+
+        deps = set()
+        surface_deps = set()
+        opt_types = ("call", "put") if kind == "touch" else ("call",) if direction == "up" else ("put",)
+        for pos in ([near, far] if near >= 0 else [far]):
+            target_expiry = index.expiries[pos]
+            spot_row = index.row(target_expiry, None, 0) # first row of the expiry supplies the spot
+            nearest = index.nearest(target_expiry, strike) if pos == far else None
+            legs = []
+            for opt_type in opt_types:
+                # Calls bracket as (<= K, > K), puts as (< K, >= K)
+                legs += index.bracket(target_expiry, strike if opt_type == "call" else np.nextafter(strike, -np.inf), opt_type)
+            for row in (spot_row, nearest, *legs):
+                if row is not None:
+                    deps.add(row["instrument"])
+
+        for bracket_expiry in index.expiries[max(0, far - 1):far + 1]:
+            surface_deps.update(index.columns(bracket_expiry).get("instrument", []))
+        return deps, surface_deps
+
+    def load_snapshot(self):
+        """Full refresh: chain, markets, dependency map and every price"""
+        rep = self.replicator
+        rep.fetch_option_chains()
+        self.markets = {d["id"]: d for d in rep.fetch_market_details()}
+
+        self.dependents = {}
+        self.surface_dependents = {}
+        for market_id, details in self.markets.items():
+            deps, surface_deps = self.market_dependencies(
+                details["strike"], details["expiry"], details.get("asset"), details.get("expiry_time"),
+                details.get("kind") or "touch", details.get("direction") or "up",
+            )
+            for name in deps:
+                self.dependents.setdefault(name, set()).add(market_id)
+            for name in surface_deps:
+                self.surface_dependents.setdefault(name, set()).add(market_id)
+
+        self.results = {}
+        self.reprice(self.markets.keys())
+        self.feed.subscribe(set(self.dependents) | set(self.surface_dependents), self.markets.keys())
+        self.last_sync = time.monotonic()
+
+    def apply(self, event):
+        """Apply one feed event to the in-memory state. Returns the ids of markets to re-price."""
+        kind, key, value = event
+
+        if kind == "ticker":
+            if key not in self.dependents and key not in self.surface_dependents: return set()
+            index = self.replicator.get_chain_index(instrument_asset(key))
+            current = index.quote(key)
+            if current is None: return set()
+            value = underlying_units(key, value, current.get("underlying_price"))
+            changed = {col: v for col, v in value.items() if col in current and not _same(current[col], v)}
+            if not changed: return set()
+            index.update_quote(key, changed)
+
+            affected = set(self.dependents.get(key, ()))
+            if any(col in changed for col in self.SURFACE_FIELDS):
+                affected |= self.surface_dependents.get(key, set())
+            return affected
+
+        if kind == "poly_price":
+            details = self.markets.get(key)
+            if details is None or details["poly_price"] == value: return set()
+            details["poly_price"] = value
+            return {key}
+
+        return set()
+
+    def reprice(self, market_ids):
+        priced = self.replicator.price_markets([self.markets[i] for i in market_ids])
+        for r in priced:
+            self.results[r["id"]] = r
+        self.reprice_count += len(priced)
+        if priced and self.on_update:
+            self.on_update(priced)
+        return priced
+
+    def ranked_results(self):
+        """Latest results, sorted by edge as in scan()"""
+        return sorted(self.results.values(), key=lambda x: x["edge"], reverse=True)
+
+    def run(self, max_events=None):
+        """Consume the feed until it ends (or max_events have been processed)"""
+        self.load_snapshot()
+        for n, event in enumerate(self.feed.events(), 1):
+            ids = self.apply(event)
+            if ids:
+                self.reprice(ids)
+            if max_events is not None and n >= max_events:
+                break
+            if self.resync_interval and time.monotonic() - self.last_sync > self.resync_interval:
+                self.load_snapshot()
+
+def instrument_asset(name):
+    """BTC-28MAR25-100000-C -> BTC, SOL_USDC-28MAR25-150-C -> SOL"""
+    return name.split("-")[0].split("_")[0]
+
+def _same(old, new):
+    if new is None:
+        return old != old # NaN
+    return old == new
+
+def print_update(results):
+    for r in results:
+        signal = " >>> SIGNAL: BUY NO (Overpriced)" if r["edge"] > 0.10 else ""
+        print(f"[{time.strftime('%H:%M:%S')}] {r['market']} | Poly {r['poly_prob']:.1%} | Edge {r['edge']*100:.1f}%{signal}")
+
+if __name__ == "__main__":
+    replicator = TouchReplicator()
+    feed = MergedFeed(DeribitTickerFeed(), PolymarketPollingFeed(replicator.poly_scanner))
+    streamer = TouchStreamer(feed, replicator=replicator, on_update=print_update, resync_interval=3600)
+    streamer.run()
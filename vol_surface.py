@@ -0,0 +1,111 @@
+import numpy as np
+
+class VolSurface:
+    """
+    Implied-vol surface fitted once per option chain snapshot.
+
+    Per expiry, a smile in implied variance iv^2(k) over log-moneyness
+    k = ln(K / F), taken from out-of-the-money marks (puts below the forward,
+    calls above), linear between strikes and flat beyond the wings; total
+    variance is w(k) = iv^2(k) * T. Across expiries, total variance is
+    interpolated linearly in T at fixed moneyness (flat vol before the
+    first / after the last expiry).
+
+    The smiles do not depend on the clock: queries may pass each expiry's
+    time to expiry (e.g. at another pricing time) instead of the fit-time T.
+    """
+
+    def __init__(self, index, time_to_expiry):
+        """
+        index: OptionChainIndex of the chain
+        time_to_expiry: callable expiry (YYYY-MM-DD) -> years
+        """
+        self.index = index
+        self.version = index.version
+
+        positions, times, forwards, smiles = [], [], [], []
+        for pos, expiry in enumerate(index.expiries):
+            forward = index.spot(expiry)
+            T = time_to_expiry(expiry)
+            if not forward or T <= 0:
+                continue
+            smile = self._fit_smile(index.columns(expiry), forward)
+            if smile is None:
+                continue
+            positions.append(pos)
+            times.append(T)
+            forwards.append(forward)
+            smiles.append(smile)
+
+        order = np.argsort(times, kind="mergesort")
+        self.positions = np.array(positions, dtype=int)[order] # Position of each smile's expiry in index.expiries
+        self.expiries = [index.expiries[self.positions[i]] for i in range(len(order))]
+        self.times = np.array(times, dtype=float)[order]
+        self.forwards = np.array(forwards, dtype=float)[order]
+        self.smiles = [smiles[i] for i in order]
+
+    @staticmethod
+    def _fit_smile(columns, forward):
+        if not columns:
+            return None
+        strikes, iv, types = columns["strike"], columns["mark_iv"], columns["type"]
+        quoted = np.isfinite(iv) & (iv > 0)
+        otm = quoted & (((types == "call") & (strikes >= forward)) | ((types == "put") & (strikes < forward)))
+        use = otm if otm.sum() >= 2 else quoted
+        if not use.any():
+            return None
+
+        # One vol per strike (mean when both wings quote it)
+        unique_strikes, inverse = np.unique(strikes[use], return_inverse=True)
+        vols = np.bincount(inverse, weights=iv[use]) / np.bincount(inverse) / 100.0
+
+        k = np.log(unique_strikes / forward)
+        return k, vols**2
+
+    @property
+    def empty(self):
+        return len(self.times) == 0
+
+    def total_variance(self, K, T, times=None):
+        """
+        Total implied variance at strikes K and times T (years); arrays broadcast.
+        times: each expiry's time to expiry per query, shape (expiries,) + K's shape
+        (broadcast); None uses the fit-time self.times.
+        """
+        K, T = np.broadcast_arrays(np.asarray(K, dtype=float), np.asarray(T, dtype=float))
+        if self.empty:
+            return np.full(K.shape, np.nan)
+
+        # Each expiry's smile at every query's moneyness: shape (expiries, queries)
+        n, flat_K = len(self.times), K.ravel()
+        if times is None:
+            times = np.broadcast_to(self.times[:, None], (n, flat_K.size))
+        else:
+            times = np.broadcast_to(np.asarray(times, dtype=float), (n,) + K.shape).reshape(n, flat_K.size)
+        W = np.empty((n, flat_K.size))
+        for i, (k_nodes, v_nodes) in enumerate(self.smiles):
+            W[i] = np.interp(np.log(flat_K / self.forwards[i]), k_nodes, v_nodes)
+        W *= times
+
+        t = T.ravel()
+        cols = np.arange(flat_K.size)
+        j = (times < t).sum(axis=0) # searchsorted(times, t, side="left") per query
+        lo = np.clip(j - 1, 0, n - 1)
+        hi = np.clip(j, 0, n - 1)
+
+        t_lo, t_hi = times[lo, cols], times[hi, cols]
+        w_lo, w_hi = W[lo, cols], W[hi, cols]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            frac = np.where(t_hi > t_lo, (t - t_lo) / (t_hi - t_lo), 0.0)
+            w = w_lo + frac * (w_hi - w_lo)
+            # Outside the listed expiries: hold the nearest expiry's vol constant
+            w = np.where(j == 0, w_hi * t / t_hi, w)
+            w = np.where(j >= n, w_lo * t / t_lo, w)
+        return w.reshape(K.shape)
+
+    def sigma(self, K, T, times=None):
+        """Implied vol (decimal) at strikes K and times T (years); arrays broadcast (times: see total_variance)"""
+        T_arr = np.asarray(T, dtype=float)
+        w = self.total_variance(K, T_arr, times)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(T_arr > 0, np.sqrt(np.maximum(w, 0.0) / T_arr), np.nan)